@@ -0,0 +1,180 @@
+# pip install -qU langchain-chroma langchain-community chromadb
+
+# Import necessary libraries and modules
+from dataclasses import dataclass
+
+import chromadb
+from langchain_chroma import Chroma
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_core.documents import Document
+
+# Chroma 1.x takes a "configuration" dict; older releases read "hnsw:*" keys from the collection metadata.
+CHROMA_1X = int(chromadb.__version__.split(".")[0]) >= 1
+
+
+@dataclass
+class HNSWConfig:
+    """
+    HNSW settings of a Chroma collection.
+
+    space, construction_ef and M are fixed when the collection is created;
+    search_ef, batch_size and sync_threshold can be changed later.
+    """
+    space: str = "cosine"          # "l2", "ip" or "cosine"
+    construction_ef: int = 200     # candidate list size while building the graph (Chroma default: 100)
+    search_ef: int = 100           # candidate list size while searching (Chroma default: 100)
+    M: int = 32                    # neighbors per node (Chroma default: 16)
+    batch_size: int = 100          # vectors buffered in memory before they are added to the graph
+    sync_threshold: int = 1000     # vectors added before the graph is written to disk
+
+    def to_metadata(self):
+        """Collection metadata for Chroma before 1.0."""
+        return {
+            "hnsw:space": self.space,
+            "hnsw:construction_ef": self.construction_ef,
+            "hnsw:search_ef": self.search_ef,
+            "hnsw:M": self.M,
+            "hnsw:batch_size": self.batch_size,
+            "hnsw:sync_threshold": self.sync_threshold,
+        }
+
+    def to_configuration(self):
+        """Collection configuration for Chroma 1.x."""
+        return {
+            "hnsw": {
+                "space": self.space,
+                "ef_construction": self.construction_ef,
+                "ef_search": self.search_ef,
+                "max_neighbors": self.M,
+                "batch_size": self.batch_size,
+                "sync_threshold": self.sync_threshold,
+            }
+        }
+
+
+def create_tuned_store(collection_name, embeddings, hnsw=None, persist_directory="./chroma_langchain_db"):
+    """
+    Create (or open) a Chroma store whose collection uses the given HNSW settings.
+
+    Args:
+        collection_name (str): Name of the collection.
+        embeddings (HuggingFaceEmbeddings): The embeddings used for documents and queries.
+        hnsw (HNSWConfig): HNSW settings; defaults to HNSWConfig().
+        persist_directory (str): Where Chroma stores its data.
+
+    Returns:
+        Chroma: The vector store.
+    """
+    hnsw = hnsw or HNSWConfig()
+    settings = (
+        {"collection_configuration": hnsw.to_configuration()} if CHROMA_1X
+        else {"collection_metadata": hnsw.to_metadata()}
+    )
+    return Chroma(
+        collection_name=collection_name,
+        embedding_function=embeddings,
+        persist_directory=persist_directory,
+        **settings,
+    )
+
+
+def update_search_ef(vector_store, search_ef):
+    """
+    Change search_ef of an existing collection without rebuilding it.
+
+    Args:
+        vector_store (Chroma): The vector store.
+        search_ef (int): New candidate list size for searches.
+    """
+    collection = vector_store._collection
+    if CHROMA_1X:
+        collection.modify(configuration={"hnsw": {"ef_search": search_ef}})
+    else:
+        collection.modify(metadata={**(collection.metadata or {}), "hnsw:search_ef": search_ef})
+
+
+def _exists(client, name):
+    try:
+        client.get_collection(name)
+    except Exception:  # missing collection: ValueError before Chroma 0.6, NotFoundError after
+        return False
+    return True
+
+
+def rebuild_collection(vector_store, hnsw, embeddings, page_size=1000):
+    """
+    Rebuild a collection with new HNSW settings from its stored embeddings.
+
+    Records (ids, embeddings, documents, metadatas) are copied page by page into
+    a new collection, so nothing is embedded again. The names are then swapped
+    (old -> `{name}_old`, new -> `{name}`) and the old collection is deleted last,
+    so a crash at any step leaves a complete copy of the data. A `{name}_rebuild`
+    left by an interrupted copy is dropped first.
+
+    Args:
+        vector_store (Chroma): Store whose collection is rebuilt.
+        hnsw (HNSWConfig): The new HNSW settings.
+        embeddings (HuggingFaceEmbeddings): Embeddings for the returned store (used for queries only).
+        page_size (int): Records read and written per page.
+
+    Returns:
+        Chroma: A store on the rebuilt collection.
+
+    Raises:
+        RuntimeError: If `{name}_old` exists, i.e. an earlier rebuild stopped during the swap.
+    """
+    client = vector_store._client
+    source = vector_store._collection
+    name = source.name
+    if _exists(client, f"{name}_old"):
+        raise RuntimeError(f"An earlier rebuild stopped during the swap; {name}_old still holds the original data")
+    if _exists(client, f"{name}_rebuild"):
+        client.delete_collection(f"{name}_rebuild")  # partial copy from an interrupted run
+    if CHROMA_1X:
+        metadata = {k: v for k, v in (source.metadata or {}).items() if not k.startswith("hnsw:")}
+        settings = {"configuration": hnsw.to_configuration(), "metadata": metadata or None}
+    else:
+        # Before 1.0 the HNSW settings live in the metadata; keep the other keys
+        settings = {"metadata": {**(source.metadata or {}), **hnsw.to_metadata()}}
+    target = client.create_collection(f"{name}_rebuild", embedding_function=None, **settings)
+    page_size = min(page_size, client.get_max_batch_size())
+
+    offset = 0
+    while True:
+        page = source.get(limit=page_size, offset=offset, include=["embeddings", "documents", "metadatas"])
+        if not page["ids"]:
+            break
+        target.add(
+            ids=page["ids"],
+            embeddings=page["embeddings"],
+            documents=page["documents"],
+            metadatas=page["metadatas"],
+        )
+        offset += len(page["ids"])
+
+    source.modify(name=f"{name}_old")
+    target.modify(name=name)
+    client.delete_collection(f"{name}_old")
+    return Chroma(client=client, collection_name=name, embedding_function=embeddings)
+
+
+# Step 1: Initialize embeddings
+embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2")
+
+# Step 2: Create a store with explicit HNSW settings
+vector_store = create_tuned_store("tuned", embeddings, HNSWConfig(space="cosine", construction_ef=200, M=32))
+vector_store.add_documents([
+    Document(page_content="I had chocolate chip pancakes and scrambled eggs for breakfast this morning.", metadata={"source": "tweet"}),
+    Document(page_content="The weather forecast for tomorrow is cloudy and overcast, with a high of 62 degrees.", metadata={"source": "news"}),
+    Document(page_content="Building an exciting new project with LangChain - come check it out!", metadata={"source": "tweet"}),
+])
+
+# Step 3: Raise search_ef for better recall; this takes effect without a rebuild
+update_search_ef(vector_store, 200)
+
+# Step 4: Change build-time settings (M, construction_ef, space) by rebuilding from the stored embeddings
+vector_store = rebuild_collection(vector_store, HNSWConfig(space="cosine", construction_ef=400, M=48, search_ef=200), embeddings)
+
+results = vector_store.similarity_search("LangChain provides abstractions to make working with LLMs easy", k=2)
+for res in results:
+    print(f"* {res.page_content} [{res.metadata}]")
@@ -0,0 +1,151 @@
+# Cross-encoder re-ranking that works after any vector store's similarity search
+# pip install -qU langchain-community langchain-huggingface sentence-transformers faiss-cpu
+
+import hashlib
+import time
+from collections import OrderedDict
+
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_community.vectorstores import FAISS
+from sentence_transformers import CrossEncoder
+
+
+class CrossEncoderReranker:
+    """
+    Re-scores ANN candidates with a CPU cross-encoder under a latency budget.
+
+    Candidates are scored in batches in their original ANN order. Before each
+    batch the reranker estimates its cost from the batches already run and stops
+    if it would overrun the budget. Candidates that were not scored keep their
+    ANN order behind the scored ones, so the result is always a usable ranking.
+    """
+
+    def __init__(self, model_name="cross-encoder/ms-marco-MiniLM-L-6-v2", batch_size=16,
+                 budget_ms=50.0, cache_size=50_000):
+        """
+        Args:
+            model_name (str): Hugging Face cross-encoder model.
+            batch_size (int): (query, passage) pairs scored per model call.
+            budget_ms (float): Time allowed for re-ranking one query, in milliseconds.
+            cache_size (int): Number of (query, passage) scores kept in memory.
+        """
+        self.model = CrossEncoder(model_name, device="cpu")
+        self.batch_size = batch_size
+        self.budget_ms = budget_ms
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.last_stats = {}
+
+    @staticmethod
+    def _pair_key(query, passage):
+        digest = hashlib.blake2b(passage.encode("utf-8"), digest_size=16).digest()
+        return query, digest
+
+    def _cache_get(self, key):
+        score = self._cache.get(key)
+        if score is not None:
+            self._cache.move_to_end(key)
+        return score
+
+    def _cache_put(self, key, score):
+        self._cache[key] = score
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def rerank(self, query, candidates, k=4, budget_ms=None):
+        """
+        Re-rank (Document, score) candidates for a query.
+
+        Args:
+            query (str): The query text.
+            candidates (list): (Document, ANN score) pairs in ANN order.
+            k (int): Number of results to return.
+            budget_ms (float): Per-call override of the latency budget.
+
+        Returns:
+            list: (Document, cross-encoder score or None) pairs, best first.
+                  None marks a candidate that was not scored within the budget.
+        """
+        budget = (self.budget_ms if budget_ms is None else budget_ms) / 1000.0
+        start = time.perf_counter()
+        scores = [None] * len(candidates)
+        pending = []
+        for i, (doc, _) in enumerate(candidates):
+            cached = self._cache_get(self._pair_key(query, doc.page_content))
+            if cached is None:
+                pending.append(i)
+            else:
+                scores[i] = cached
+        cache_hits = len(candidates) - len(pending)
+
+        per_pair = None
+        scored = 0
+        for offset in range(0, len(pending), self.batch_size):
+            batch = pending[offset:offset + self.batch_size]
+            elapsed = time.perf_counter() - start
+            if per_pair is not None and elapsed + per_pair * len(batch) > budget:
+                break
+            batch_start = time.perf_counter()
+            predictions = self.model.predict(
+                [(query, candidates[i][0].page_content) for i in batch],
+                batch_size=self.batch_size,
+                show_progress_bar=False,
+            )
+            per_pair = (time.perf_counter() - batch_start) / len(batch)
+            for i, score in zip(batch, predictions):
+                scores[i] = float(score)
+                self._cache_put(self._pair_key(query, candidates[i][0].page_content), scores[i])
+            scored += len(batch)
+
+        done = sorted((i for i, s in enumerate(scores) if s is not None), key=lambda i: scores[i], reverse=True)
+        rest = [i for i, s in enumerate(scores) if s is None]
+        self.last_stats = {
+            "candidates": len(candidates),
+            "cache_hits": cache_hits,
+            "scored": scored,
+            "skipped": len(rest),
+            "elapsed_ms": (time.perf_counter() - start) * 1000.0,
+        }
+        return [(candidates[i][0], scores[i]) for i in (done + rest)[:k]]
+
+    def search(self, vector_store, query, k=4, candidate_k=50, budget_ms=None, **search_kwargs):
+        """
+        Fetch a candidate pool from a vector store and re-rank it.
+
+        Args:
+            vector_store: Any LangChain vector store (FAISS, Chroma, Milvus, Qdrant, ...).
+            query (str): The query text.
+            k (int): Number of results to return.
+            candidate_k (int): Size of the candidate pool fetched from the store.
+            budget_ms (float): Per-call override of the latency budget.
+            **search_kwargs: Passed to similarity_search_with_score (e.g. filter).
+
+        Returns:
+            list: (Document, cross-encoder score or None) pairs, best first.
+        """
+        candidates = vector_store.similarity_search_with_score(query, k=candidate_k, **search_kwargs)
+        return self.rerank(query, candidates, k=k, budget_ms=budget_ms)
+
+
+# Example usage
+if __name__ == "__main__":
+    embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2")
+    db = FAISS.from_texts(
+        [
+            "The weather forecast for tomorrow is cloudy and overcast, with a high of 62 degrees.",
+            "Robbers broke into the city bank and stole $1 million in cash.",
+            "The stock market is down 500 points today due to fears of a recession.",
+            "Is the new iPhone worth the price? Read this review to find out.",
+        ],
+        embeddings,
+    )
+
+    reranker = CrossEncoderReranker(budget_ms=30)
+    query = "Will it be hot tomorrow?"
+    for doc, score in reranker.search(db, query, k=2, candidate_k=4):
+        print(f"* [CE={score}] {doc.page_content}")
+    print(reranker.last_stats)
+
+    # The same query again is answered from the pair-score cache.
+    reranker.search(db, query, k=2, candidate_k=4)
+    print(reranker.last_stats)
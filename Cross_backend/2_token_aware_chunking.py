@@ -0,0 +1,201 @@
+# Token-aware chunking sized by the embedding model's own tokenizer
+# pip install -qU langchain-community transformers numpy
+
+import json
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from langchain_community.document_loaders import TextLoader
+from langchain_core.documents import Document
+from transformers import AutoTokenizer
+
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+SENTENCE_END = re.compile(r"(?<=[.!?])[\"')\]]*\s+")
+
+_worker_chunker = None
+
+# Tokenizers without a configured limit report a huge sentinel instead
+UNSET_MAX_LENGTH = 1_000_000
+
+
+def model_token_limit(model_name, tokenizer, model=None, default=384):
+    """
+    Find the number of tokens the embedding model reads before truncating.
+
+    Sentence-transformers models can truncate below the tokenizer limit
+    (all-mpnet-base-v2 reads 384 of the tokenizer's 512), so their own
+    max_seq_length wins when it is known.
+
+    Args:
+        model_name (str): Hugging Face model name.
+        tokenizer: The model's tokenizer.
+        model: Optional loaded SentenceTransformer.
+        default (int): Used when neither the model nor the tokenizer states a limit.
+
+    Returns:
+        int: The limit, including special tokens.
+    """
+    if model is not None and getattr(model, "max_seq_length", None):
+        return model.max_seq_length
+    try:
+        from huggingface_hub import hf_hub_download
+
+        with open(hf_hub_download(model_name, "sentence_bert_config.json")) as f:
+            return json.load(f)["max_seq_length"]
+    except Exception:  # not a sentence-transformers model, or offline without a cached copy
+        pass
+    if tokenizer.model_max_length < UNSET_MAX_LENGTH:
+        return tokenizer.model_max_length
+    return default
+
+
+class TokenAwareChunker:
+    """
+    Splits documents into chunks measured in model tokens, not characters.
+
+    Each batch of documents is tokenized once with the model's fast tokenizer.
+    Chunks are then cut on token offsets, preferring paragraph breaks, then
+    sentence ends, and only cutting mid-sentence when neither fits. No chunk is
+    longer than the model's input limit, so nothing is silently truncated
+    at embedding time.
+    """
+
+    def __init__(self, model_name="sentence-transformers/all-mpnet-base-v2", max_tokens=None,
+                 overlap_tokens=0, min_tokens=None, batch_size=64, model=None):
+        """
+        Args:
+            model_name (str): Hugging Face model whose tokenizer defines the chunk size.
+            max_tokens (int): Maximum tokens per chunk. Defaults to the model limit minus special tokens.
+            overlap_tokens (int): Tokens repeated between consecutive chunks.
+            min_tokens (int): Smallest chunk accepted when looking for a boundary (default: half of max_tokens).
+            batch_size (int): Documents tokenized per tokenizer call.
+            model: Optional loaded SentenceTransformer whose max_seq_length sets the default max_tokens.
+        """
+        self.model_name = model_name
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+        if max_tokens is None:
+            model_limit = model_token_limit(model_name, self.tokenizer, model)
+            max_tokens = model_limit - self.tokenizer.num_special_tokens_to_add()
+        if overlap_tokens >= max_tokens:
+            raise ValueError("overlap_tokens must be smaller than max_tokens")
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.min_tokens = max_tokens // 2 if min_tokens is None else min_tokens
+        self.batch_size = batch_size
+
+    @staticmethod
+    def _boundaries(text, starts):
+        """Token indices where a paragraph or a sentence starts."""
+        paragraphs = [m.end() for m in PARAGRAPH_BREAK.finditer(text)]
+        sentences = [m.end() for m in SENTENCE_END.finditer(text)]
+        return (
+            np.unique(np.searchsorted(starts, paragraphs)),
+            np.unique(np.searchsorted(starts, sentences)),
+        )
+
+    def _cut(self, n_tokens, paragraph_cuts, sentence_cuts):
+        """Yields (start, end) token ranges covering the document."""
+        start = 0
+        while start < n_tokens:
+            limit = start + self.max_tokens
+            if limit >= n_tokens:
+                yield start, n_tokens
+                return
+            end = limit
+            low = start + self.min_tokens
+            for cuts in (paragraph_cuts, sentence_cuts):
+                # Last boundary in (low, limit]
+                i = np.searchsorted(cuts, limit, side="right") - 1
+                if i >= 0 and cuts[i] > low:
+                    end = int(cuts[i])
+                    break
+            yield start, end
+            start = max(end - self.overlap_tokens, start + 1)
+
+    def split_batch(self, texts):
+        """
+        Split raw texts.
+
+        Args:
+            texts (list): Texts to split.
+
+        Returns:
+            list: For each text, a list of (chunk text, start char, token count) tuples.
+        """
+        encoded = self.tokenizer(
+            texts,
+            add_special_tokens=False,
+            return_offsets_mapping=True,
+            return_attention_mask=False,
+            verbose=False,
+        )
+        results = []
+        for text, offsets in zip(texts, encoded["offset_mapping"]):
+            if not offsets:
+                results.append([])
+                continue
+            offsets = np.asarray(offsets, dtype=np.int64)
+            paragraph_cuts, sentence_cuts = self._boundaries(text, offsets[:, 0])
+            chunks = []
+            for start, end in self._cut(len(offsets), paragraph_cuts, sentence_cuts):
+                char_start, char_end = offsets[start, 0], offsets[end - 1, 1]
+                chunk = text[char_start:char_end].strip()
+                if chunk:
+                    chunks.append((chunk, int(char_start), end - start))
+            results.append(chunks)
+        return results
+
+    def split_documents(self, documents, workers=1):
+        """
+        Split LangChain documents, optionally across several processes.
+
+        Args:
+            documents (list): Documents to split.
+            workers (int): Number of worker processes. 1 runs in this process.
+
+        Returns:
+            list: Chunk documents with `start_index` and `token_count` metadata.
+        """
+        texts = [doc.page_content for doc in documents]
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if workers > 1 and len(batches) > 1:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self.model_name, self.max_tokens, self.overlap_tokens, self.min_tokens),
+            ) as pool:
+                split = [chunks for batch in pool.map(_split_in_worker, batches) for chunks in batch]
+        else:
+            split = [chunks for batch in batches for chunks in self.split_batch(batch)]
+
+        output = []
+        for doc, chunks in zip(documents, split):
+            for text, start_index, token_count in chunks:
+                metadata = {**doc.metadata, "start_index": start_index, "token_count": token_count}
+                output.append(Document(page_content=text, metadata=metadata))
+        return output
+
+
+def _init_worker(model_name, max_tokens, overlap_tokens, min_tokens):
+    global _worker_chunker
+    _worker_chunker = TokenAwareChunker(model_name, max_tokens, overlap_tokens, min_tokens)
+
+
+def _split_in_worker(texts):
+    return _worker_chunker.split_batch(texts)
+
+
+# Example usage
+if __name__ == "__main__":
+    loader = TextLoader("/content/abc.txt")  # Replace with your file path
+    documents = loader.load()
+
+    chunker = TokenAwareChunker(overlap_tokens=32)
+    docs = chunker.split_documents(documents, workers=4)
+    print(f"{len(docs)} chunks, max {chunker.max_tokens} tokens each")
+    for doc in docs[:3]:
+        print(doc.metadata["token_count"], repr(doc.page_content[:80]))
+
+    # The chunks drop into any store in this repo, e.g.
+    # db = FAISS.from_documents(docs, embeddings)
@@ -0,0 +1,168 @@
+# Exact and near-duplicate chunk removal before embedding
+# pip install -qU langchain-community langchain-text-splitters numpy
+
+import hashlib
+import re
+import zlib
+from collections import defaultdict
+
+import numpy as np
+from langchain_community.document_loaders import TextLoader
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+WORD = re.compile(r"\w+")
+
+
+def normalize(text):
+    """Lowercase and keep only word characters, so whitespace/punctuation changes do not matter."""
+    return " ".join(WORD.findall(text.lower()))
+
+
+class MinHasher:
+    """MinHash signatures over word shingles, computed with NumPy."""
+
+    def __init__(self, num_perm=128, shingle_size=5, seed=1):
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+        self.shingle_size = shingle_size
+        self.num_perm = num_perm
+
+    def signature(self, normalized_text):
+        words = normalized_text.split()
+        n = max(len(words) - self.shingle_size + 1, 1)
+        shingles = {" ".join(words[i:i + self.shingle_size]) for i in range(n)}
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+        # (a * h + b) mod p for every permutation at once; overflow wraps like any other hash mix
+        with np.errstate(over="ignore"):
+            permuted = (hashes[:, None] * self.a + self.b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0)
+
+
+class ChunkDeduplicator:
+    """
+    Removes duplicate chunks before they are embedded.
+
+    Exact duplicates are found by hashing normalized text. Near duplicates are found
+    with MinHash + LSH banding: chunks that share a band become candidates, and
+    candidates whose estimated Jaccard similarity reaches `threshold` are grouped.
+
+    With policy="drop" only the first chunk of each group is kept. With
+    policy="reference" the first chunk is kept too, but it gets a `dedup_group`
+    metadata key and `groups` maps that key to the ids of every member. That way
+    one vector can stand for all the source documents.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=128, bands=16, shingle_size=5, policy="drop", id_key="source"):
+        """
+        Args:
+            threshold (float): Minimum estimated Jaccard similarity for a near duplicate.
+            num_perm (int): MinHash signature length.
+            bands (int): LSH bands; num_perm must be divisible by it.
+            shingle_size (int): Words per shingle.
+            policy (str): "drop" or "reference".
+            id_key (str): Metadata key identifying a chunk's source document in "reference" mode.
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        if policy not in ("drop", "reference"):
+            raise ValueError(f"Unknown policy: {policy}")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.policy = policy
+        self.id_key = id_key
+        self.minhasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size)
+
+    def deduplicate(self, documents):
+        """
+        Deduplicate a list of chunks.
+
+        Args:
+            documents (list): Chunk documents, e.g. from a text splitter.
+
+        Returns:
+            tuple: (kept documents, groups dict, stats dict). `groups` is empty for policy="drop".
+        """
+        parent = list(range(len(documents)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        def union(i, j):
+            ri, rj = find(i), find(j)
+            if ri != rj:
+                parent[max(ri, rj)] = min(ri, rj)
+
+        # Exact duplicates: only the first chunk of each hash goes on to MinHash
+        normalized = [normalize(doc.page_content) for doc in documents]
+        first_by_hash = {}
+        unique = []
+        for i, text in enumerate(normalized):
+            digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+            if digest in first_by_hash:
+                union(first_by_hash[digest], i)
+            else:
+                first_by_hash[digest] = i
+                unique.append(i)
+        exact_duplicates = len(documents) - len(unique)
+
+        # Near duplicates: LSH buckets, then verify with the signature estimate
+        signatures = {i: self.minhasher.signature(normalized[i]) for i in unique}
+        buckets = defaultdict(list)
+        for i, sig in signatures.items():
+            for band in range(self.bands):
+                key = (band, sig[band * self.rows:(band + 1) * self.rows].tobytes())
+                buckets[key].append(i)
+        checked = set()
+        for members in buckets.values():
+            for pos, i in enumerate(members):
+                for j in members[pos + 1:]:
+                    if (i, j) in checked or find(i) == find(j):
+                        continue
+                    checked.add((i, j))
+                    if np.mean(signatures[i] == signatures[j]) >= self.threshold:
+                        union(i, j)
+
+        members_by_root = defaultdict(list)
+        for i in range(len(documents)):
+            members_by_root[find(i)].append(i)
+
+        kept, groups = [], {}
+        for root in sorted(members_by_root):
+            members = members_by_root[root]
+            doc = documents[root]
+            if self.policy == "reference" and len(members) > 1:
+                group_id = hashlib.blake2b(normalized[root].encode("utf-8"), digest_size=8).hexdigest()
+                groups[group_id] = [documents[m].metadata.get(self.id_key) for m in members]
+                doc = Document(page_content=doc.page_content, metadata={**doc.metadata, "dedup_group": group_id})
+            kept.append(doc)
+
+        stats = {
+            "input": len(documents),
+            "kept": len(kept),
+            "exact_duplicates": exact_duplicates,
+            "near_duplicates": len(documents) - len(kept) - exact_duplicates,
+        }
+        return kept, groups, stats
+
+
+# Example usage
+if __name__ == "__main__":
+    loader = TextLoader("/content/abc.txt")  # Replace with your file path
+    documents = loader.load()
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=0)
+    docs = text_splitter.split_documents(documents)
+
+    deduplicator = ChunkDeduplicator(threshold=0.8, policy="reference")
+    docs, groups, stats = deduplicator.deduplicate(docs)
+    print(stats)
+
+    # Only the kept chunks are embedded and stored, e.g.
+    # db = FAISS.from_documents(docs, embeddings)
@@ -0,0 +1,241 @@
+# Per-stage latency instrumentation for every vector store operation
+# pip install -qU langchain-community langchain-huggingface faiss-cpu
+# Optional, for OpenTelemetry export:
+# pip install -qU opentelemetry-sdk opentelemetry-exporter-otlp
+
+import bisect
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import Embeddings
+
+try:
+    from opentelemetry import trace
+except ImportError:  # OpenTelemetry export is optional
+    trace = None
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+INSTRUMENTED_METHODS = (
+    "add_texts", "add_documents", "delete",
+    "similarity_search", "similarity_search_with_score", "similarity_search_by_vector",
+    "similarity_search_with_relevance_scores", "max_marginal_relevance_search",
+)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class StoreMetrics:
+    """
+    Thread-safe registry of stage latencies, operation counts and payload sizes.
+
+    Every operation records its total time and a per-stage split:
+    "embedding" (time in the embedding model), "ann" (time in the FAISS index),
+    and the remainder as "docstore" for in-process stores or "network" for
+    client/server stores, where the server's own ANN time is inside the round trip.
+    """
+
+    def __init__(self, tracer_name="vector-db-handbook"):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.latency = defaultdict(Histogram)        # (backend, operation, stage) -> Histogram
+        self.operations = defaultdict(int)           # (backend, operation, filtered) -> count
+        self.payload_bytes = defaultdict(int)        # (backend, operation) -> bytes
+        self.tracer = trace.get_tracer(tracer_name) if trace is not None else None
+
+    @contextmanager
+    def operation(self, backend, name, remote, filtered=False):
+        """Times one store operation and collects the stage timings recorded inside it."""
+        outer = getattr(self._local, "stages", None)
+        stages = self._local.stages = defaultdict(float)
+        span_cm = self.tracer.start_as_current_span(f"{backend}.{name}") if self.tracer else None
+        span = span_cm.__enter__() if span_cm else None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._local.stages = outer
+            rest = max(elapsed - sum(stages.values()), 0.0)
+            stages["network" if remote else "docstore"] += rest
+            with self._lock:
+                self.latency[(backend, name, "total")].observe(elapsed)
+                for stage, seconds in stages.items():
+                    self.latency[(backend, name, stage)].observe(seconds)
+                self.operations[(backend, name, filtered)] += 1
+            if span is not None:
+                span.set_attribute("vectordb.filtered", filtered)
+                for stage, seconds in stages.items():
+                    span.set_attribute(f"vectordb.{stage}_ms", seconds * 1000.0)
+                span_cm.__exit__(None, None, None)
+
+    def record_stage(self, stage, seconds):
+        """Adds time to a stage of the operation running on this thread."""
+        stages = getattr(self._local, "stages", None)
+        if stages is not None:
+            stages[stage] += seconds
+
+    def record_payload(self, backend, name, n_bytes):
+        with self._lock:
+            self.payload_bytes[(backend, name)] += n_bytes
+
+    def to_prometheus(self):
+        """
+        Renders all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Text suitable for a /metrics endpoint or a node_exporter textfile.
+        """
+        lines = [
+            "# HELP vectordb_stage_seconds Latency of vector store operations by stage.",
+            "# TYPE vectordb_stage_seconds histogram",
+        ]
+        with self._lock:
+            for (backend, op, stage), hist in sorted(self.latency.items()):
+                labels = f'backend="{backend}",operation="{op}",stage="{stage}"'
+                cumulative = 0
+                for bound, count in zip(hist.buckets, hist.counts):
+                    cumulative += count
+                    lines.append(f'vectordb_stage_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'vectordb_stage_seconds_bucket{{{labels},le="+Inf"}} {hist.count}')
+                lines.append(f"vectordb_stage_seconds_sum{{{labels}}} {hist.total}")
+                lines.append(f"vectordb_stage_seconds_count{{{labels}}} {hist.count}")
+            lines += ["# HELP vectordb_operations_total Vector store operations.", "# TYPE vectordb_operations_total counter"]
+            for (backend, op, filtered), count in sorted(self.operations.items()):
+                lines.append(f'vectordb_operations_total{{backend="{backend}",operation="{op}",filtered="{str(filtered).lower()}"}} {count}')
+            lines += ["# HELP vectordb_payload_bytes_total Bytes of vectors sent to or returned by the embedder.", "# TYPE vectordb_payload_bytes_total counter"]
+            for (backend, op), n_bytes in sorted(self.payload_bytes.items()):
+                lines.append(f'vectordb_payload_bytes_total{{backend="{backend}",operation="{op}"}} {n_bytes}')
+        return "\n".join(lines) + "\n"
+
+
+class InstrumentedEmbeddings(Embeddings):
+    """Embeddings wrapper that charges model time to the "embedding" stage."""
+
+    def __init__(self, embeddings, metrics, backend):
+        self.embeddings = embeddings
+        self.metrics = metrics
+        self.backend = backend
+
+    def _timed(self, name, fn, arg):
+        start = time.perf_counter()
+        result = fn(arg)
+        self.metrics.record_stage("embedding", time.perf_counter() - start)
+        vectors = result if name == "embed_documents" else [result]
+        self.metrics.record_payload(self.backend, name, sum(len(v) for v in vectors) * 4)
+        return result
+
+    def embed_documents(self, texts):
+        return self._timed("embed_documents", self.embeddings.embed_documents, texts)
+
+    def embed_query(self, text):
+        return self._timed("embed_query", self.embeddings.embed_query, text)
+
+
+class InstrumentedVectorStore:
+    """
+    Proxy around any LangChain vector store that times its public operations.
+
+    Attributes that are not instrumented are passed through unchanged.
+    """
+
+    def __init__(self, store, metrics, backend, remote):
+        self._store = store
+        self._metrics = metrics
+        self._backend = backend
+        self._remote = remote
+
+    def __getattr__(self, name):
+        attr = getattr(self._store, name)
+        if name not in INSTRUMENTED_METHODS or not callable(attr):
+            return attr
+
+        def wrapper(*args, **kwargs):
+            filtered = bool(kwargs.get("filter") or kwargs.get("expr"))
+            with self._metrics.operation(self._backend, name, self._remote, filtered):
+                return attr(*args, **kwargs)
+        return wrapper
+
+
+def instrument_store(store, metrics, backend, remote=None):
+    """
+    Wraps a vector store so every operation is timed per stage.
+
+    Build the store with InstrumentedEmbeddings to separate embedding time. For
+    FAISS the index search is timed as well, so "ann" and "docstore" are split.
+
+    Args:
+        store: A LangChain vector store (FAISS, Chroma, Milvus, Qdrant, ...).
+        metrics (StoreMetrics): The registry to record into.
+        backend (str): Label for this backend, e.g. "faiss" or "qdrant".
+        remote (bool): Whether the store talks to a server. Defaults to False for FAISS and Chroma.
+
+    Returns:
+        InstrumentedVectorStore: The wrapped store.
+    """
+    if remote is None:
+        remote = backend not in ("faiss", "chroma")
+    index = getattr(store, "index", None)
+    if index is not None and hasattr(index, "search"):
+        raw_search = index.search
+
+        def timed_search(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return raw_search(*args, **kwargs)
+            finally:
+                metrics.record_stage("ann", time.perf_counter() - start)
+        index.search = timed_search
+    return InstrumentedVectorStore(store, metrics, backend, remote)
+
+
+def configure_otlp(endpoint="http://localhost:4317", service_name="vector-db-handbook"):
+    """
+    Sends spans to a local OpenTelemetry collector over OTLP/gRPC.
+
+    Call this before creating StoreMetrics so its tracer uses the exporter.
+
+    Args:
+        endpoint (str): The collector's OTLP gRPC endpoint.
+        service_name (str): The service.name resource attribute.
+    """
+    from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint, insecure=True)))
+    trace.set_tracer_provider(provider)
+
+
+# Example usage
+if __name__ == "__main__":
+    metrics = StoreMetrics()
+    embeddings = InstrumentedEmbeddings(
+        HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2"), metrics, backend="faiss"
+    )
+    db = instrument_store(FAISS.from_texts(["foo", "bar", "baz"], embeddings), metrics, backend="faiss")
+
+    db.add_texts(["Building an exciting project with LangChain!"], metadatas=[{"page": 1}])
+    db.similarity_search("LangChain project", k=2)
+    db.similarity_search("LangChain project", k=2, filter={"page": 1})
+    db.max_marginal_relevance_search("LangChain project", k=2)
+
+    print(metrics.to_prometheus())
@@ -0,0 +1,320 @@
+# Recall/latency auto-tuner for FAISS, Qdrant and Milvus search parameters
+# pip install -qU faiss-cpu numpy qdrant-client pymilvus langchain-community langchain-huggingface
+
+import json
+import os
+import time
+
+import numpy as np
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_community.vectorstores import FAISS
+
+
+def brute_force_top_k(vectors, queries, k, metric="ip", block_size=4096):
+    """
+    Exact top-k by scanning every vector, used as ground truth.
+
+    Args:
+        vectors (np.ndarray): (n, d) float32 database vectors.
+        queries (np.ndarray): (q, d) float32 query vectors.
+        k (int): Number of neighbours.
+        metric (str): "ip" (inner product / cosine on normalized vectors) or "l2".
+        block_size (int): Database rows scored at a time, to bound memory.
+
+    Returns:
+        np.ndarray: (q, k) row positions into `vectors`, best first.
+    """
+    best_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+    best_ids = np.full((len(queries), k), -1, dtype=np.int64)
+    query_norms = (queries ** 2).sum(axis=1, keepdims=True) if metric == "l2" else None
+    for start in range(0, len(vectors), block_size):
+        block = vectors[start:start + block_size]
+        scores = queries @ block.T
+        if metric == "l2":
+            scores = -(query_norms - 2 * scores + (block ** 2).sum(axis=1))
+        merged_scores = np.hstack([best_scores, scores])
+        merged_ids = np.hstack([best_ids, np.arange(start, start + len(block))[None, :].repeat(len(queries), 0)])
+        top = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(merged_scores, top, axis=1)
+        best_ids = np.take_along_axis(merged_ids, top, axis=1)
+    order = np.argsort(-best_scores, axis=1)
+    return np.take_along_axis(best_ids, order, axis=1)
+
+
+def recall_at_k(found, truth):
+    """Mean fraction of the true top-k that was returned."""
+    return float(np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found, truth)]))
+
+
+class FaissAdapter:
+    """Tunes nprobe (IVF indexes) or efSearch (HNSW indexes) on a FAISS index."""
+
+    backend = "faiss"
+
+    def __init__(self, index, folder_path, metric="l2"):
+        """
+        Args:
+            index: A faiss index, e.g. `db.index` of a LangChain FAISS store.
+            folder_path (str): Where the index is saved; the chosen setting is written next to it.
+            metric (str): "l2" or "ip", matching the index.
+        """
+        import faiss
+
+        self.faiss = faiss
+        self.index = index
+        self.folder_path = folder_path
+        self.metric = metric
+        if hasattr(index, "hnsw"):
+            self.ivf = None
+            self.param = "efSearch"
+            self.grid = [16, 24, 32, 48, 64, 96, 128, 192, 256, 384, 512]
+        else:
+            self.ivf = faiss.extract_index_ivf(index)  # raises for index types without a knob
+            self.param = "nprobe"
+            nlist = self.ivf.nlist
+            self.grid = sorted({p for p in (1, 2, 4, 8, 16, 32, 64, 128, 256, 512) if p <= nlist} | {nlist})
+
+    def _reconstruct(self, positions=None):
+        """
+        Read stored vectors back from the index.
+
+        IVF indexes need a direct map for this. If the index has none, one is
+        built for the call and dropped again, so the index keeps its memory footprint.
+
+        Args:
+            positions (np.ndarray): int64 positions to read; every vector when omitted.
+
+        Returns:
+            np.ndarray: (n, d) float32 vectors.
+        """
+        temporary = self.ivf is not None and self.ivf.direct_map.type == self.faiss.DirectMap.NoMap
+        if temporary:
+            self.ivf.make_direct_map()
+        try:
+            if positions is None:
+                return self.index.reconstruct_n(0, self.index.ntotal)
+            return self.index.reconstruct_batch(positions)
+        finally:
+            if temporary:
+                self.ivf.set_direct_map_type(self.faiss.DirectMap.NoMap)
+
+    def sample_queries(self, n=200, noise=0.1, seed=0):
+        """
+        Stored vectors with Gaussian noise added, for when no real queries are logged.
+
+        A stored vector used as-is finds itself at rank 1 and makes the
+        approximate search look better than it is, so each sample is moved off its point.
+
+        Args:
+            n (int): Number of queries.
+            noise (float): Norm of the added noise relative to the vector's norm.
+            seed (int): Random seed.
+
+        Returns:
+            np.ndarray: (n, d) float32 queries.
+        """
+        rng = np.random.RandomState(seed)
+        positions = rng.choice(self.index.ntotal, size=min(n, self.index.ntotal), replace=False).astype(np.int64)
+        vectors = self._reconstruct(positions)
+        directions = rng.standard_normal(vectors.shape).astype(np.float32)
+        directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+        return vectors + noise * np.linalg.norm(vectors, axis=1, keepdims=True) * directions
+
+    def ground_truth(self, queries, k):
+        return brute_force_top_k(self._reconstruct(), queries, k, metric=self.metric)
+
+    def search(self, queries, k, value):
+        self.faiss.ParameterSpace().set_index_parameter(self.index, self.param, value)
+        return self.index.search(queries, k)[1]
+
+    def persist(self, setting):
+        os.makedirs(self.folder_path, exist_ok=True)
+        with open(os.path.join(self.folder_path, "search_params.json"), "w") as f:
+            json.dump(setting, f, indent=2)
+
+
+class QdrantAdapter:
+    """Tunes hnsw_ef on a Qdrant collection; ground truth uses Qdrant's exact (brute-force) search."""
+
+    backend = "qdrant"
+
+    def __init__(self, client, collection_name, params_dir="./tuning", vector_name=None):
+        from qdrant_client.http import models
+
+        self.models = models
+        self.client = client
+        self.collection_name = collection_name
+        self.params_dir = params_dir
+        self.vector_name = vector_name
+        self.param = "hnsw_ef"
+        self.grid = [16, 32, 48, 64, 96, 128, 192, 256, 384, 512]
+
+    def _search(self, queries, k, search_params):
+        return [
+            [p.id for p in self.client.query_points(
+                self.collection_name, query=q.tolist(), using=self.vector_name, limit=k,
+                search_params=search_params, with_payload=False,
+            ).points]
+            for q in queries
+        ]
+
+    def ground_truth(self, queries, k):
+        return self._search(queries, k, self.models.SearchParams(exact=True))
+
+    def search(self, queries, k, value):
+        return self._search(queries, k, self.models.SearchParams(hnsw_ef=value))
+
+    def persist(self, setting):
+        os.makedirs(self.params_dir, exist_ok=True)
+        with open(os.path.join(self.params_dir, f"qdrant_{self.collection_name}.json"), "w") as f:
+            json.dump(setting, f, indent=2)
+
+
+class MilvusAdapter:
+    """Tunes `ef` (HNSW) or `nprobe` (IVF_*) on a Milvus collection."""
+
+    backend = "milvus"
+
+    def __init__(self, client, collection_name, metric_type="L2", param="ef", vector_field="vector",
+                 params_dir="./tuning"):
+        """
+        Args:
+            client (pymilvus.MilvusClient): The Milvus client.
+            collection_name (str): Collection to tune.
+            metric_type (str): Metric the index was built with.
+            param (str): "ef" for HNSW or "nprobe" for IVF indexes.
+            vector_field (str): Name of the vector field ("vector" in langchain_milvus).
+            params_dir (str): Where the chosen setting is written.
+        """
+        self.client = client
+        self.collection_name = collection_name
+        self.metric_type = metric_type
+        self.param = param
+        self.vector_field = vector_field
+        self.params_dir = params_dir
+        self.grid = [8, 16, 32, 64, 128, 256, 512] if param == "nprobe" else [16, 32, 48, 64, 96, 128, 192, 256, 512]
+
+    def _search(self, queries, k, params):
+        hits = self.client.search(
+            self.collection_name, data=queries.tolist(), limit=k, anns_field=self.vector_field,
+            search_params={"metric_type": self.metric_type, "params": params},
+        )
+        return [[hit["id"] for hit in row] for row in hits]
+
+    def ground_truth(self, queries, k):
+        ids, vectors = [], []
+        iterator = self.client.query_iterator(self.collection_name, batch_size=1000, output_fields=[self.vector_field])
+        while True:
+            rows = iterator.next()
+            if not rows:
+                iterator.close()
+                break
+            primary = next(key for key in rows[0] if key != self.vector_field)
+            ids.extend(row[primary] for row in rows)
+            vectors.extend(row[self.vector_field] for row in rows)
+        metric = "l2" if self.metric_type == "L2" else "ip"
+        positions = brute_force_top_k(np.asarray(vectors, dtype=np.float32), queries, k, metric=metric)
+        return [[ids[p] for p in row] for row in positions]
+
+    def search(self, queries, k, value):
+        if self.param == "ef":
+            value = max(value, k)  # Milvus rejects ef < limit
+        return self._search(queries, k, {self.param: value})
+
+    def persist(self, setting):
+        os.makedirs(self.params_dir, exist_ok=True)
+        with open(os.path.join(self.params_dir, f"milvus_{self.collection_name}.json"), "w") as f:
+            json.dump(setting, f, indent=2)
+
+
+def pareto_frontier(points):
+    """Points not beaten on both recall (higher) and latency (lower) by another point."""
+    frontier = []
+    for p in sorted(points, key=lambda p: (p["latency_ms"], -p["recall"])):
+        if not frontier or p["recall"] > frontier[-1]["recall"]:
+            frontier.append(p)
+    return frontier
+
+
+def tune(adapter, queries, k=10, target_recall=0.95, repeats=3, persist=True):
+    """
+    Sweeps the adapter's search parameter and picks the fastest setting that meets the target recall.
+
+    Args:
+        adapter: FaissAdapter, QdrantAdapter or MilvusAdapter.
+        queries (np.ndarray): (q, d) float32 sample queries, ideally taken from real traffic.
+        k (int): Recall is measured at this k.
+        target_recall (float): Required recall@k against exact search.
+        repeats (int): Timed runs per setting; the fastest is kept to reduce noise.
+        persist (bool): Save the chosen setting with the index.
+
+    Returns:
+        dict: The chosen setting, the Pareto frontier and every measured point.
+    """
+    queries = np.ascontiguousarray(queries, dtype=np.float32)
+    truth = adapter.ground_truth(queries, k)
+    points = []
+    for value in adapter.grid:
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            found = adapter.search(queries, k, value)
+            best = min(best, time.perf_counter() - start)
+        point = {"value": value, "recall": recall_at_k(found, truth), "latency_ms": best * 1000.0 / len(queries)}
+        points.append(point)
+        print(f"{adapter.param}={value}: recall@{k}={point['recall']:.3f}, {point['latency_ms']:.3f} ms/query")
+
+    frontier = pareto_frontier(points)
+    meeting = [p for p in frontier if p["recall"] >= target_recall]
+    chosen = meeting[0] if meeting else max(frontier, key=lambda p: p["recall"])
+    setting = {
+        "backend": adapter.backend,
+        "param": adapter.param,
+        "value": chosen["value"],
+        "k": k,
+        "target_recall": target_recall,
+        "recall": chosen["recall"],
+        "latency_ms": chosen["latency_ms"],
+        "target_met": bool(meeting),
+        "frontier": frontier,
+    }
+    if persist:
+        adapter.persist(setting)
+    return {"chosen": setting, "frontier": frontier, "points": points}
+
+
+def load_faiss_search_params(db, folder_path):
+    """
+    Applies a setting saved by `tune` to a loaded FAISS store.
+
+    Args:
+        db (FAISS): The LangChain FAISS store.
+        folder_path (str): The folder the index was saved in.
+    """
+    import faiss
+
+    path = os.path.join(folder_path, "search_params.json")
+    if os.path.exists(path):
+        with open(path) as f:
+            setting = json.load(f)
+        faiss.ParameterSpace().set_index_parameter(db.index, setting["param"], setting["value"])
+
+
+# Example usage
+if __name__ == "__main__":
+    import faiss
+
+    embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2")
+    db = FAISS.load_local("faiss_index", embeddings, allow_dangerous_deserialization=True)
+
+    if isinstance(db.index, faiss.IndexFlat):
+        print("Flat index: search is already exact, nothing to tune.")
+    else:
+        adapter = FaissAdapter(db.index, "faiss_index")
+        # Sample queries: ideally logged production queries; here, perturbed stored vectors.
+        queries = adapter.sample_queries(n=200, noise=0.1)
+        result = tune(adapter, queries, k=10, target_recall=0.95)
+        print("Chosen:", result["chosen"]["param"], result["chosen"]["value"])
+
+    # Later, after FAISS.load_local:
+    load_faiss_search_params(db, "faiss_index")
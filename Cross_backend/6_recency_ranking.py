@@ -0,0 +1,181 @@
+# Recency-aware search with time-bucketed sub-indexes (FAISS or Chroma)
+# pip install -qU langchain-community langchain-huggingface langchain-chroma faiss-cpu
+
+import math
+import time
+from uuid import uuid4
+
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+DAY = 86_400
+
+
+def faiss_bucket_factory(embeddings, dim=768):
+    """Returns a factory that creates an empty FAISS store (flat L2 index) for each new time bucket."""
+    import faiss
+
+    def factory(bucket_name):
+        return FAISS(embeddings, faiss.IndexFlatL2(dim), InMemoryDocstore(), {})
+    return factory
+
+
+def chroma_bucket_factory(embeddings, persist_directory="./chroma_langchain_db", prefix="recent"):
+    """Returns a factory that creates (or reopens) one Chroma collection per time bucket."""
+    from langchain_chroma import Chroma
+
+    def factory(bucket_name):
+        return Chroma(
+            collection_name=f"{prefix}_{bucket_name}",
+            embedding_function=embeddings,
+            persist_directory=persist_directory,
+        )
+    return factory
+
+
+class RecencyIndex:
+    """
+    Splits documents into fixed-width time buckets, one vector store per bucket.
+
+    Every document carries a `timestamp` metadata field (Unix seconds). A "last N
+    days" query only searches buckets that overlap the window. A decayed search
+    walks buckets from newest to oldest and stops once an older bucket can no
+    longer beat the current k-th result, even with a perfect similarity.
+    """
+
+    def __init__(self, store_factory, bucket_seconds=DAY, half_life_seconds=7 * DAY):
+        """
+        Args:
+            store_factory: Callable(bucket_name) -> empty vector store (see faiss_bucket_factory / chroma_bucket_factory).
+            bucket_seconds (int): Width of a bucket (default one day).
+            half_life_seconds (float): Age at which the recency weight halves.
+        """
+        self.store_factory = store_factory
+        self.bucket_seconds = bucket_seconds
+        self.decay_rate = math.log(2) / half_life_seconds
+        self.buckets = {}  # bucket start (Unix seconds) -> vector store
+        self.id_to_bucket = {}
+
+    def _bucket_start(self, timestamp):
+        return int(timestamp // self.bucket_seconds * self.bucket_seconds)
+
+    def _bucket(self, start):
+        store = self.buckets.get(start)
+        if store is None:
+            store = self.buckets[start] = self.store_factory(str(start))
+        return store
+
+    def decay(self, age_seconds):
+        """Exponential recency weight: 1.0 for brand-new content, 0.5 after one half-life."""
+        return math.exp(-self.decay_rate * max(age_seconds, 0.0))
+
+    def add_documents(self, documents, ids=None):
+        """
+        Add documents to their time buckets. Documents without a timestamp are stamped "now".
+
+        An id that is already stored is replaced; its old copy is deleted from the
+        bucket that holds it, which may not be the bucket of the new timestamp.
+        The caller's documents are not modified.
+
+        Returns:
+            list: The document ids.
+        """
+        ids = ids or [str(uuid4()) for _ in documents]
+        self.delete([doc_id for doc_id in ids if doc_id in self.id_to_bucket])
+        now = time.time()
+        grouped = {}
+        for doc_id, doc in zip(ids, documents):
+            doc = Document(id=doc_id, page_content=doc.page_content, metadata={"timestamp": now, **doc.metadata})
+            start = self._bucket_start(doc.metadata["timestamp"])
+            grouped.setdefault(start, ([], []))
+            grouped[start][0].append(doc)
+            grouped[start][1].append(doc_id)
+            self.id_to_bucket[doc_id] = start
+        for start, (docs, doc_ids) in grouped.items():
+            self._bucket(start).add_documents(documents=docs, ids=doc_ids)
+        return ids
+
+    def delete(self, ids):
+        """Delete documents from the buckets that hold them."""
+        grouped = {}
+        for doc_id in ids:
+            start = self.id_to_bucket.pop(doc_id, None)
+            if start is not None:
+                grouped.setdefault(start, []).append(doc_id)
+        for start, doc_ids in grouped.items():
+            self.buckets[start].delete(ids=doc_ids)
+
+    def drop_older_than(self, max_age_seconds, now=None):
+        """Retention: discard whole buckets that are entirely older than the given age."""
+        cutoff = (now or time.time()) - max_age_seconds
+        for start in [s for s in self.buckets if s + self.bucket_seconds <= cutoff]:
+            store = self.buckets.pop(start)
+            if hasattr(store, "delete_collection"):
+                store.delete_collection()
+        self.id_to_bucket = {i: s for i, s in self.id_to_bucket.items() if s in self.buckets}
+
+    def search(self, query, k=4, last_seconds=None, fetch_k=20, now=None, filter=None):
+        """
+        Rank by similarity x exponential time decay.
+
+        Args:
+            query (str): Query text.
+            k (int): Number of results.
+            last_seconds (int): Only consider documents newer than this many seconds.
+            fetch_k (int): Candidates taken from each searched bucket. The bucket cut by the
+                `last_seconds` window is searched deeper until it yields fetch_k hits inside the window.
+            now (float): Reference time (default: current time).
+            filter (dict): Optional metadata filter, passed to every bucket.
+
+        Returns:
+            list: (Document, combined score) pairs, best first.
+        """
+        now = now or time.time()
+        oldest = now - last_seconds if last_seconds is not None else -math.inf
+        results = []
+        searched = 0
+        for start in sorted(self.buckets, reverse=True):
+            bucket_end = start + self.bucket_seconds
+            if bucket_end <= oldest:
+                break
+            # Relevance scores are at most 1, so no document in this or any older bucket
+            # can score above the decay of the bucket's newest possible timestamp.
+            if len(results) >= k and self.decay(now - bucket_end) <= results[k - 1][1]:
+                break
+            searched += 1
+            fetch = fetch_k
+            while True:
+                hits = self.buckets[start].similarity_search_with_relevance_scores(query, k=fetch, filter=filter)
+                in_window = [(doc, rel) for doc, rel in hits if doc.metadata.get("timestamp", start) >= oldest]
+                # Only a bucket that starts before the window can lose hits to the time filter
+                if start >= oldest or len(in_window) >= fetch_k or len(hits) < fetch:
+                    break
+                fetch *= 2
+            for doc, relevance in in_window:
+                results.append((doc, relevance * self.decay(now - doc.metadata.get("timestamp", start))))
+            results.sort(key=lambda item: item[1], reverse=True)
+        self.last_buckets_searched = searched
+        return results[:k]
+
+
+# Example usage
+if __name__ == "__main__":
+    embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2")
+    index = RecencyIndex(faiss_bucket_factory(embeddings), bucket_seconds=DAY, half_life_seconds=3 * DAY)
+    # For Chroma: RecencyIndex(chroma_bucket_factory(embeddings), ...)
+
+    now = time.time()
+    index.add_documents([
+        Document(page_content="The stock market is down 500 points today due to fears of a recession.", metadata={"source": "news", "timestamp": now - 3600}),
+        Document(page_content="The stock market rallied 300 points after the rate decision.", metadata={"source": "news", "timestamp": now - 10 * DAY}),
+        Document(page_content="Robbers broke into the city bank and stole $1 million in cash.", metadata={"source": "news", "timestamp": now - 2 * DAY}),
+    ])
+
+    for doc, score in index.search("stock market news", k=2):
+        print(f"* [{score:.3f}] {doc.page_content}")
+    print("Buckets searched:", index.last_buckets_searched)
+
+    for doc, score in index.search("stock market news", k=2, last_seconds=7 * DAY):
+        print(f"* [last 7 days {score:.3f}] {doc.page_content}")
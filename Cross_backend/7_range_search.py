@@ -0,0 +1,185 @@
+# Range (radius) search: every hit within a score threshold, capped at max_results
+# pip install -qU langchain-community langchain-huggingface faiss-cpu numpy
+
+import numpy as np
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+# Score direction of the emulated path for stores whose scores are distances (lower is closer)
+DISTANCE_STORES = {"Chroma"}
+
+
+def within(score, radius, higher_is_better):
+    """True when a score lies inside the radius for the store's score direction."""
+    return score >= radius if higher_is_better else score <= radius
+
+
+def faiss_range_search(store, query, radius, max_results=100, filter=None):
+    """
+    Native range search on a LangChain FAISS store with index.range_search.
+
+    The radius is in the index's own metric: a squared L2 distance for L2
+    indexes (hits have distance < radius) or an inner product for IP indexes
+    (hits have similarity > radius), i.e. the same scores similarity_search_with_score returns.
+
+    Args:
+        store (FAISS): The vector store.
+        query (str): Query text.
+        radius (float): Distance or similarity bound.
+        max_results (int): Maximum number of hits returned.
+        filter (dict): Optional metadata filter (exact match on each key).
+
+    Returns:
+        list: (Document, score) pairs, closest first.
+    """
+    import faiss
+
+    vector = np.asarray([store._embed_query(query)], dtype=np.float32)
+    if store._normalize_L2:
+        faiss.normalize_L2(vector)
+    higher_is_better = store.index.metric_type == faiss.METRIC_INNER_PRODUCT
+    try:
+        _, scores, labels = store.index.range_search(vector, radius)
+    except RuntimeError:
+        # Some index types (e.g. HNSW in older FAISS builds) do not implement range_search.
+        return emulated_range_search(store, query, radius, max_results, filter, higher_is_better)
+
+    # Only the in-range hits are sorted, and documents are looked up until max_results is reached.
+    order = np.argsort(-scores if higher_is_better else scores, kind="stable")
+    results = []
+    for i in order:
+        doc_id = store.index_to_docstore_id.get(int(labels[i]))
+        if doc_id is None:
+            continue
+        doc = store.docstore.search(doc_id)
+        if filter and any(doc.metadata.get(key) != value for key, value in filter.items()):
+            continue
+        results.append((doc, float(scores[i])))
+        if len(results) >= max_results:
+            break
+    return results
+
+
+def qdrant_range_search(store, query, radius, max_results=100, filter=None):
+    """
+    Native range search on a QdrantVectorStore with score_threshold.
+
+    For Cosine and Dot collections the radius is the minimum score; for Euclid
+    and Manhattan it is the maximum distance. Qdrant applies the threshold while
+    searching, so nothing outside it is returned.
+
+    Args:
+        store (QdrantVectorStore): The vector store.
+        query (str): Query text.
+        radius (float): Score threshold.
+        max_results (int): Maximum number of hits returned.
+        filter (models.Filter): Optional Qdrant filter.
+
+    Returns:
+        list: (Document, score) pairs, closest first.
+    """
+    return store.similarity_search_with_score(query, k=max_results, score_threshold=radius, filter=filter)
+
+
+def milvus_range_search(store, query, radius, max_results=100, filter=None, metric_type=None, params=None):
+    """
+    Native range search on a Milvus store with the radius search parameter.
+
+    For L2 the radius is the maximum distance; for COSINE and IP it is the
+    minimum similarity. Milvus prunes during the search and returns at most max_results hits.
+
+    Args:
+        store (Milvus): The vector store.
+        query (str): Query text.
+        radius (float): Distance or similarity bound.
+        max_results (int): Maximum number of hits returned.
+        filter (str): Optional Milvus filter expression.
+        metric_type (str): Index metric; read from the store's search_params when omitted.
+        params (dict): Extra index search parameters, e.g. {"ef": 64} or {"nprobe": 16}.
+
+    Returns:
+        list: (Document, score) pairs, closest first.
+    """
+    metric_type = metric_type or (store.search_params or {}).get("metric_type", "L2")
+    param = {"metric_type": metric_type, "params": {**(params or {}), "radius": radius}}
+    return store.similarity_search_with_score(query, k=max_results, param=param, expr=filter)
+
+
+def emulated_range_search(store, query, radius, max_results=100, filter=None, higher_is_better=None,
+                          initial_k=16):
+    """
+    Range search for stores without a native API, using widening top-k searches.
+
+    Hits come back sorted, so each round only checks whether the last hit is
+    still inside the radius. The search stops at the first round whose last hit
+    falls outside (or that returns fewer than k hits), and k doubles otherwise,
+    up to max_results.
+
+    Args:
+        store: Any LangChain vector store with similarity_search_with_score.
+        query (str): Query text.
+        radius (float): Distance or similarity bound, in the store's own scores.
+        max_results (int): Maximum number of hits returned.
+        filter: Optional filter in the store's own format.
+        higher_is_better (bool): Score direction; inferred for known distance stores (e.g. Chroma).
+        initial_k (int): Size of the first search.
+
+    Returns:
+        list: (Document, score) pairs, closest first.
+    """
+    if higher_is_better is None:
+        if type(store).__name__ not in DISTANCE_STORES:
+            raise ValueError(f"Pass higher_is_better for {type(store).__name__}")
+        higher_is_better = False
+    kwargs = {"filter": filter} if filter is not None else {}
+    k = min(initial_k, max_results)
+    while True:
+        hits = store.similarity_search_with_score(query, k=k, **kwargs)
+        exhausted = len(hits) < k
+        if exhausted or not within(hits[-1][1], radius, higher_is_better) or k >= max_results:
+            return [(doc, score) for doc, score in hits if within(score, radius, higher_is_better)][:max_results]
+        k = min(k * 2, max_results)
+
+
+def range_search(store, query, radius, max_results=100, filter=None, **kwargs):
+    """
+    Return every hit within the radius, using the store's native range search when it has one.
+
+    Args:
+        store: A LangChain vector store (FAISS, QdrantVectorStore, Milvus, Chroma, ...).
+        query (str): Query text.
+        radius (float): Distance or similarity bound, in the store's own scores.
+        max_results (int): Maximum number of hits returned.
+        filter: Optional filter in the store's own format.
+        **kwargs: Passed to the backend function (e.g. metric_type for Milvus, higher_is_better for emulation).
+
+    Returns:
+        list: (Document, score) pairs, closest first.
+    """
+    native = {
+        "FAISS": faiss_range_search,
+        "QdrantVectorStore": qdrant_range_search,
+        "Milvus": milvus_range_search,
+    }.get(type(store).__name__, emulated_range_search)
+    return native(store, query, radius, max_results, filter, **kwargs)
+
+
+# Example usage
+if __name__ == "__main__":
+    embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2")
+    db = FAISS.from_documents([
+        Document(page_content="Building an exciting new project with LangChain - come check it out!", metadata={"source": "tweet"}),
+        Document(page_content="LangGraph is the best framework for building stateful, agentic applications!", metadata={"source": "tweet"}),
+        Document(page_content="The stock market is down 500 points today due to fears of a recession.", metadata={"source": "news"}),
+        Document(page_content="Robbers broke into the city bank and stole $1 million in cash.", metadata={"source": "news"}),
+    ], embeddings)
+
+    # Squared L2 distance; with mpnet embeddings, smaller values are closer neighbors.
+    for doc, score in range_search(db, "LangChain framework", radius=1.0, max_results=10):
+        print(f"* [L2={score:.3f}] {doc.page_content} [{doc.metadata}]")
+
+    # With Chroma, scores are distances too, and the search is emulated:
+    # from langchain_chroma import Chroma
+    # chroma = Chroma.from_documents(docs, embeddings, collection_name="range_demo")
+    # range_search(chroma, "LangChain framework", radius=1.0, max_results=10)
@@ -0,0 +1,446 @@
+# Move vectors between FAISS, Chroma, Qdrant, Milvus and Weaviate without re-embedding
+# pip install -qU pyarrow numpy faiss-cpu langchain-community langchain-huggingface langchain-chroma qdrant-client pymilvus weaviate-client
+
+import hashlib
+import json
+import uuid
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+# A page is (ids, vectors, texts, metadatas) with vectors as an (n, d) float32 array.
+
+
+def _page(ids, vectors, texts, metadatas):
+    return list(ids), np.ascontiguousarray(vectors, dtype=np.float32), list(texts), list(metadatas)
+
+
+# ---------------------------------------------------------------- exporters
+
+def export_faiss(store, page_size=10_000):
+    """
+    Read a LangChain FAISS store in pages, reconstructing vectors from the index.
+
+    Args:
+        store (FAISS): The vector store. IVF indexes need a direct map (index.make_direct_map()).
+        page_size (int): Records per page.
+
+    Yields:
+        tuple: (ids, vectors, texts, metadatas) pages.
+    """
+    total = store.index.ntotal
+    for start in range(0, total, page_size):
+        count = min(page_size, total - start)
+        vectors = store.index.reconstruct_n(start, count)
+        ids = [store.index_to_docstore_id[i] for i in range(start, start + count)]
+        docs = [store.docstore.search(doc_id) for doc_id in ids]
+        yield _page(ids, vectors, [d.page_content for d in docs], [d.metadata for d in docs])
+
+
+def export_chroma(store, page_size=5_000):
+    """
+    Read a LangChain Chroma store in pages, including the stored embeddings.
+
+    Args:
+        store (Chroma): The vector store.
+        page_size (int): Records per page.
+
+    Yields:
+        tuple: (ids, vectors, texts, metadatas) pages.
+    """
+    offset = 0
+    while True:
+        page = store._collection.get(limit=page_size, offset=offset, include=["embeddings", "documents", "metadatas"])
+        if not page["ids"]:
+            return
+        yield _page(page["ids"], page["embeddings"], page["documents"], [m or {} for m in page["metadatas"]])
+        offset += len(page["ids"])
+
+
+def export_qdrant(client, collection_name, page_size=5_000, vector_name=""):
+    """
+    Scroll a Qdrant collection written by QdrantVectorStore.
+
+    Args:
+        client (QdrantClient): The Qdrant client.
+        collection_name (str): Collection to read.
+        page_size (int): Points per scroll request.
+        vector_name (str): Name of the dense vector ("" for the default vector).
+
+    Yields:
+        tuple: (ids, vectors, texts, metadatas) pages.
+    """
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name, limit=page_size, offset=offset, with_payload=True, with_vectors=True
+        )
+        if points:
+            vectors = [p.vector[vector_name] if isinstance(p.vector, dict) else p.vector for p in points]
+            yield _page(
+                [str(p.id) for p in points],
+                vectors,
+                [p.payload.get("page_content", "") for p in points],
+                [p.payload.get("metadata") or {} for p in points],
+            )
+        if offset is None:
+            return
+
+
+def export_milvus(client, collection_name, page_size=5_000, primary_field="pk", text_field="text", vector_field="vector"):
+    """
+    Iterate over a Milvus collection that uses langchain_milvus field names.
+
+    Args:
+        client (MilvusClient): The Milvus client.
+        collection_name (str): Collection to read.
+        page_size (int): Rows per iterator batch.
+        primary_field (str): Primary key field.
+        text_field (str): Text field.
+        vector_field (str): Vector field.
+
+    Yields:
+        tuple: (ids, vectors, texts, metadatas) pages.
+    """
+    iterator = client.query_iterator(collection_name, batch_size=page_size, filter="", output_fields=["*"])
+    try:
+        while True:
+            rows = iterator.next()
+            if not rows:
+                return
+            fixed = (primary_field, text_field, vector_field)
+            yield _page(
+                [str(r[primary_field]) for r in rows],
+                [r[vector_field] for r in rows],
+                [r[text_field] for r in rows],
+                [{k: v for k, v in r.items() if k not in fixed} for r in rows],
+            )
+    finally:
+        iterator.close()
+
+
+def export_weaviate(collection, page_size=5_000, text_key="text", vector_name="default"):
+    """
+    Iterate over a Weaviate v4 collection with its vectors.
+
+    Args:
+        collection: A weaviate.collections.Collection handle.
+        page_size (int): Objects fetched per request by the iterator.
+        text_key (str): Property holding the text.
+        vector_name (str): Named vector to export ("default" for the unnamed vector).
+
+    Yields:
+        tuple: (ids, vectors, texts, metadatas) pages.
+    """
+    batch = []
+    for obj in collection.iterator(include_vector=True, cache_size=page_size):
+        batch.append(obj)
+        if len(batch) == page_size:
+            yield _weaviate_page(batch, text_key, vector_name)
+            batch = []
+    if batch:
+        yield _weaviate_page(batch, text_key, vector_name)
+
+
+def _weaviate_page(objects, text_key, vector_name):
+    metadatas = [{k: v for k, v in o.properties.items() if k != text_key} for o in objects]
+    return _page(
+        [str(o.uuid) for o in objects],
+        [o.vector[vector_name] for o in objects],
+        [o.properties.get(text_key, "") for o in objects],
+        metadatas,
+    )
+
+
+# ---------------------------------------------------------------- portable format
+
+def write_parquet(pages, path, row_group_size=50_000):
+    """
+    Stream pages into a Parquet file with a fixed-size float32 vector column.
+
+    Metadata is stored as a JSON string so any schema round-trips between stores.
+
+    Args:
+        pages: Iterable of (ids, vectors, texts, metadatas) pages.
+        path (str): Output file.
+        row_group_size (int): Maximum rows per Parquet row group.
+
+    Returns:
+        int: Number of records written.
+    """
+    writer = None
+    written = 0
+    try:
+        for ids, vectors, texts, metadatas in pages:
+            dim = vectors.shape[1]
+            vector_column = pa.FixedSizeListArray.from_arrays(pa.array(vectors.reshape(-1), type=pa.float32()), dim)
+            table = pa.table({
+                "id": pa.array(ids, type=pa.string()),
+                "vector": vector_column,
+                "text": pa.array(texts, type=pa.string()),
+                "metadata": pa.array([json.dumps(m, default=str) for m in metadatas], type=pa.string()),
+            })
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression="zstd")
+            writer.write_table(table, row_group_size=row_group_size)
+            written += len(ids)
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+
+def read_parquet(path, page_size=10_000):
+    """
+    Read a file written by write_parquet() back as pages.
+
+    Vectors are taken from the Arrow buffer and reshaped, without going through Python floats.
+
+    Args:
+        path (str): Parquet file.
+        page_size (int): Records per page.
+
+    Yields:
+        tuple: (ids, vectors, texts, metadatas) pages.
+    """
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=page_size):
+        column = batch.column("vector")
+        vectors = column.flatten().to_numpy(zero_copy_only=False).reshape(len(batch), column.type.list_size)
+        yield _page(
+            batch.column("id").to_pylist(),
+            vectors,
+            batch.column("text").to_pylist(),
+            [json.loads(m) for m in batch.column("metadata").to_pylist()],
+        )
+
+
+# ---------------------------------------------------------------- importers
+
+def load_faiss(pages, embeddings, index=None):
+    """
+    Build a LangChain FAISS store directly from vectors.
+
+    Args:
+        pages: Iterable of (ids, vectors, texts, metadatas) pages.
+        embeddings (HuggingFaceEmbeddings): Used for queries only.
+        index (faiss.Index): Optional empty (trained) index; a flat L2 index is created when omitted.
+
+    Returns:
+        FAISS: The vector store.
+    """
+    import faiss
+
+    docstore, index_to_docstore_id = InMemoryDocstore(), {}
+    for ids, vectors, texts, metadatas in pages:
+        if index is None:
+            index = faiss.IndexFlatL2(vectors.shape[1])
+        start = index.ntotal
+        index.add(vectors)
+        docstore.add({i: Document(id=i, page_content=t, metadata=m) for i, t, m in zip(ids, texts, metadatas)})
+        index_to_docstore_id.update(zip(range(start, start + len(ids)), ids))
+    return FAISS(embeddings, index, docstore, index_to_docstore_id)
+
+
+def flatten_metadata(metadata, prefix=""):
+    """
+    Flatten metadata to the scalar values Chroma accepts.
+
+    Nested dicts become dotted keys ({"a": {"b": 1}} -> {"a.b": 1}), other
+    non-scalar values are stored as JSON strings and None values are dropped.
+
+    Args:
+        metadata (dict): Metadata of one record.
+        prefix (str): Key prefix used for nested dicts.
+
+    Returns:
+        dict: The flat metadata.
+    """
+    flat = {}
+    for key, value in metadata.items():
+        key = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_metadata(value, f"{key}."))
+        elif isinstance(value, (str, int, float, bool)):
+            flat[key] = value
+        elif value is not None:
+            flat[key] = json.dumps(value, default=str)
+    return flat
+
+
+def load_chroma(pages, store):
+    """
+    Add pages to a LangChain Chroma store with the stored vectors.
+
+    Nested metadata is flattened with flatten_metadata(), since Chroma only stores scalar values.
+
+    Args:
+        pages: Iterable of (ids, vectors, texts, metadatas) pages.
+        store (Chroma): Target store.
+
+    Returns:
+        int: Number of records loaded.
+    """
+    collection = store._collection
+    max_batch = store._client.get_max_batch_size()
+    loaded = 0
+    for ids, vectors, texts, metadatas in pages:
+        for start in range(0, len(ids), max_batch):
+            end = start + max_batch
+            collection.upsert(
+                ids=ids[start:end],
+                embeddings=vectors[start:end],
+                documents=texts[start:end],
+                metadatas=[flatten_metadata(m) or None for m in metadatas[start:end]],
+            )
+        loaded += len(ids)
+    return loaded
+
+
+def _uuid_id(value):
+    """Qdrant point ids and Weaviate object ids must be UUIDs; other ids map to a stable UUIDv5."""
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, str(value)))
+
+
+def load_qdrant(pages, client, collection_name, vector_name="", parallel=4):
+    """
+    Upload pages to Qdrant with upload_points, using the QdrantVectorStore payload layout.
+
+    Args:
+        pages: Iterable of (ids, vectors, texts, metadatas) pages.
+        client (QdrantClient): The Qdrant client; the collection must already exist.
+        collection_name (str): Target collection.
+        vector_name (str): Dense vector name ("" for the default vector).
+        parallel (int): Upload workers.
+
+    Returns:
+        int: Number of records loaded.
+    """
+    from qdrant_client.http import models
+
+    loaded = 0
+    for ids, vectors, texts, metadatas in pages:
+        points = [
+            models.PointStruct(
+                id=_uuid_id(i),
+                vector={vector_name: v} if vector_name else v,
+                payload={"page_content": t, "metadata": m},
+            )
+            for i, v, t, m in zip(ids, vectors.tolist(), texts, metadatas)
+        ]
+        client.upload_points(collection_name, points, batch_size=1_000, parallel=parallel, wait=False)
+        loaded += len(ids)
+    return loaded
+
+
+def _int64_id(value):
+    """Map an id to a Milvus INT64 key: integer strings keep their value, others get a stable 63-bit hash."""
+    try:
+        return int(value)
+    except ValueError:
+        return int.from_bytes(hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest(), "big") >> 1
+
+
+def load_milvus(pages, client, collection_name):
+    """
+    Insert pages into a Milvus collection in large batches and flush once.
+
+    The collection should use langchain_milvus field names (pk, text, vector) with
+    dynamic fields enabled, e.g. created by Milvus/4_milvus_db_bulk_insert_and_index.py.
+    With a VARCHAR pk the ids are kept as they are. With an INT64 pk, ids are mapped
+    by _int64_id() and the original id is kept in the `source_id` field.
+
+    Args:
+        pages: Iterable of (ids, vectors, texts, metadatas) pages.
+        client (MilvusClient): The Milvus client.
+        collection_name (str): Target collection.
+
+    Returns:
+        int: Number of records loaded.
+    """
+    from pymilvus import DataType
+
+    fields = client.describe_collection(collection_name)["fields"]
+    int_pk = next(f for f in fields if f.get("is_primary"))["type"] == DataType.INT64
+    loaded = 0
+    for ids, vectors, texts, metadatas in pages:
+        if int_pk:
+            rows = [
+                {**m, "source_id": i, "pk": _int64_id(i), "text": t, "vector": v}
+                for i, v, t, m in zip(ids, vectors, texts, metadatas)
+            ]
+        else:
+            rows = [
+                {**m, "pk": i, "text": t, "vector": v}
+                for i, v, t, m in zip(ids, vectors, texts, metadatas)
+            ]
+        client.insert(collection_name, rows)
+        loaded += len(rows)
+    client.flush(collection_name)
+    return loaded
+
+
+def load_weaviate(pages, collection, text_key="text", vector_name=None, batch_size=1_000, concurrent_requests=4):
+    """
+    Add pages to a Weaviate v4 collection with fixed-size batching.
+
+    Args:
+        pages: Iterable of (ids, vectors, texts, metadatas) pages.
+        collection: A weaviate.collections.Collection handle.
+        text_key (str): Property that receives the text.
+        vector_name (str): Target named vector, or None for the unnamed vector.
+        batch_size (int): Objects per batch request.
+        concurrent_requests (int): Batch requests in flight.
+
+    Returns:
+        int: Number of records loaded.
+
+    Raises:
+        RuntimeError: If Weaviate rejected any object; the batch does not raise on its own.
+    """
+    loaded = 0
+    with collection.batch.fixed_size(batch_size=batch_size, concurrent_requests=concurrent_requests) as batch:
+        for ids, vectors, texts, metadatas in pages:
+            for i, v, t, m in zip(ids, vectors.tolist(), texts, metadatas):
+                batch.add_object(
+                    properties={**m, text_key: t},
+                    vector={vector_name: v} if vector_name else v,
+                    uuid=_uuid_id(i),
+                )
+            loaded += len(ids)
+    failed = collection.batch.failed_objects
+    if failed:
+        raise RuntimeError(
+            f"Weaviate rejected {len(failed)} of {loaded} objects, e.g. {failed[0].object_.uuid}: {failed[0].message}"
+        )
+    return loaded
+
+
+# Example usage
+if __name__ == "__main__":
+    embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2")
+    source = FAISS.from_documents([
+        Document(page_content="Building an exciting new project with LangChain - come check it out!", metadata={"source": "tweet"}),
+        Document(page_content="The stock market is down 500 points today due to fears of a recession.", metadata={"source": "news"}),
+        Document(page_content="Robbers broke into the city bank and stole $1 million in cash.", metadata={"source": "news"}),
+    ], embeddings)
+
+    # Export once to a portable file, then load into any store without running the model again.
+    print("Exported:", write_parquet(export_faiss(source), "vectors.parquet"))
+
+    from langchain_chroma import Chroma
+    target = Chroma(collection_name="migrated", embedding_function=embeddings, persist_directory="./chroma_langchain_db")
+    print("Loaded into Chroma:", load_chroma(read_parquet("vectors.parquet"), target))
+    for doc in target.similarity_search("LangChain project", k=1):
+        print(f"* {doc.page_content} [{doc.metadata}]")
+
+    # Or stream straight from one store to another without the intermediate file:
+    # from qdrant_client import QdrantClient
+    # load_faiss(export_qdrant(QdrantClient(url="http://localhost:6333"), "demo_collection"), embeddings)
@@ -0,0 +1,279 @@
+# Zero-copy float32 vector transport between the embedding model and the stores
+# pip install -qU numpy faiss-cpu sentence-transformers langchain-community langchain-huggingface langchain-chroma qdrant-client pymilvus
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from uuid import uuid4
+
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+
+class ArrayEmbeddings(Embeddings):
+    """
+    HuggingFace embeddings that hand out contiguous float32 NumPy arrays.
+
+    SentenceTransformer already produces a NumPy array. HuggingFaceEmbeddings
+    turns it into a list of Python floats (one boxed object per dimension), and
+    each store then converts it back. embed_array() and embed_query_array() skip
+    both conversions. embed_documents() and embed_query() still return lists, so
+    the wrapper can be passed anywhere LangChain expects an Embeddings object.
+    """
+
+    def __init__(self, embeddings):
+        """
+        Args:
+            embeddings (HuggingFaceEmbeddings): The wrapped model; its encode_kwargs are reused.
+        """
+        self.embeddings = embeddings
+        self.model = embeddings.client
+        self.encode_kwargs = dict(embeddings.encode_kwargs)
+
+    def embed_array(self, texts, out=None):
+        """
+        Encode texts into an (n, d) float32 array.
+
+        Args:
+            texts (list): Texts to encode.
+            out (np.ndarray): Optional (n, d) float32 buffer to fill, e.g. a shared-memory view.
+
+        Returns:
+            np.ndarray: The vectors (`out` itself when given).
+        """
+        vectors = self.model.encode(
+            [text.replace("\n", " ") for text in texts],
+            **{**self.encode_kwargs, "convert_to_numpy": True},
+        )
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)  # no copy when already float32 and C-contiguous
+        if out is None:
+            return vectors
+        out[...] = vectors
+        return out
+
+    def embed_query_array(self, text):
+        """Encode one query into a (d,) float32 array."""
+        return self.embed_array([text])[0]
+
+    def embed_documents(self, texts):
+        return self.embed_array(texts).tolist()
+
+    def embed_query(self, text):
+        return self.embed_query_array(text).tolist()
+
+
+# ---------------------------------------------------------------- store adapters
+
+def empty_faiss_store(embeddings, dim):
+    """An empty LangChain FAISS store on a flat L2 index, without embedding a placeholder text."""
+    import faiss
+
+    return FAISS(embeddings, faiss.IndexFlatL2(dim), InMemoryDocstore(), {})
+
+
+def faiss_add_arrays(store, texts, vectors, metadatas=None, ids=None):
+    """
+    Add precomputed vectors to a LangChain FAISS store without list conversion.
+
+    Args:
+        store (FAISS): The vector store.
+        texts (list): Texts, one per vector.
+        vectors (np.ndarray): (n, d) float32 array.
+        metadatas (list): Optional metadata dicts.
+        ids (list): Optional ids; UUIDs are generated when omitted.
+
+    Returns:
+        list: The ids of the added documents.
+
+    Raises:
+        ValueError: If the ids repeat or are already stored. Nothing is added, so the
+            index never holds a vector without a docstore entry.
+    """
+    import faiss
+
+    ids = ids or [str(uuid4()) for _ in texts]
+    metadatas = metadatas or [{} for _ in texts]
+    if not len(ids) == len(texts) == len(vectors) == len(metadatas):
+        raise ValueError("texts, vectors, metadatas and ids must have the same length")
+    if len(set(ids)) != len(ids):
+        raise ValueError("Duplicate ids in one batch")
+    stored = set(store.index_to_docstore_id.values())
+    existing = [i for i in ids if i in stored or isinstance(store.docstore.search(i), Document)]
+    if existing:
+        raise ValueError(f"Ids already stored: {existing[:10]}")
+    if store._normalize_L2:
+        vectors = vectors.copy()  # normalize_L2 works in place; keep the caller's array intact
+        faiss.normalize_L2(vectors)
+    start = store.index.ntotal
+    store.index.add(vectors)
+    store.docstore.add({i: Document(id=i, page_content=t, metadata=m) for i, t, m in zip(ids, texts, metadatas)})
+    store.index_to_docstore_id.update(zip(range(start, start + len(ids)), ids))
+    return ids
+
+
+def chroma_add_arrays(store, texts, vectors, metadatas=None, ids=None):
+    """
+    Add precomputed vectors to a LangChain Chroma store; Chroma accepts NumPy arrays directly.
+
+    Returns:
+        list: The ids of the added documents.
+    """
+    ids = ids or [str(uuid4()) for _ in texts]
+    store._collection.upsert(ids=ids, embeddings=vectors, documents=list(texts), metadatas=metadatas)
+    return ids
+
+
+def qdrant_add_arrays(client, collection_name, texts, vectors, metadatas=None, ids=None, parallel=1):
+    """
+    Upload precomputed vectors to Qdrant with upload_collection, which takes the array as is.
+
+    Points use the QdrantVectorStore payload layout.
+
+    Returns:
+        list: The ids of the added points.
+    """
+    ids = ids or [str(uuid4()) for _ in texts]
+    metadatas = metadatas or [{} for _ in texts]
+    client.upload_collection(
+        collection_name,
+        vectors=vectors,
+        payload=[{"page_content": t, "metadata": m} for t, m in zip(texts, metadatas)],
+        ids=ids,
+        parallel=parallel,
+    )
+    return ids
+
+
+def milvus_add_arrays(client, collection_name, texts, vectors, metadatas=None, ids=None):
+    """
+    Insert precomputed vectors into a Milvus collection with langchain_milvus field names.
+
+    This saves the list conversion in the embedder only: pymilvus still turns
+    each row's array into a list (or bytes) while building the insert request.
+    Of the adapters here, only FAISS, Chroma and Qdrant take the array as is.
+
+    Returns:
+        list: The ids of the inserted rows.
+    """
+    ids = ids or [str(uuid4()) for _ in texts]
+    metadatas = metadatas or [{} for _ in texts]
+    rows = [{**m, "pk": i, "text": t, "vector": v} for i, t, v, m in zip(ids, texts, vectors, metadatas)]
+    client.insert(collection_name, rows)
+    return ids
+
+
+def search_by_array(store, query_vector, k=4, **kwargs):
+    """
+    Search a LangChain store with a float32 query array.
+
+    FAISS and Chroma convert the query to an array themselves, so passing the
+    array avoids building a list of d Python floats per query.
+
+    Returns:
+        list: (Document, score) pairs.
+    """
+    if hasattr(store, "similarity_search_with_score_by_vector"):
+        return store.similarity_search_with_score_by_vector(query_vector, k=k, **kwargs)
+    return store.similarity_search_by_vector_with_relevance_scores(query_vector, k=k, **kwargs)  # Chroma
+
+
+# ---------------------------------------------------------------- shared memory across processes
+
+class SharedVectorBuffer:
+    """
+    An (n, d) float32 array in shared memory.
+
+    Worker processes attach by name and write their slice in place, so vectors
+    are not pickled back to the parent. The parent reads the same memory.
+    """
+
+    def __init__(self, rows, dim, name=None):
+        """
+        Args:
+            rows (int): Number of vectors.
+            dim (int): Vector dimension.
+            name (str): Attach to an existing block instead of creating one.
+        """
+        self.shape = (rows, dim)
+        size = rows * dim * np.dtype(np.float32).itemsize
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size if self.owner else 0)
+        self.array = np.ndarray(self.shape, dtype=np.float32, buffer=self.shm.buf)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self):
+        """Detach; the creating process also frees the block."""
+        del self.array
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+_worker_embeddings = None
+
+
+def _embed_slice(model_name, buffer_name, rows, dim, start, texts):
+    global _worker_embeddings
+    if _worker_embeddings is None:
+        _worker_embeddings = ArrayEmbeddings(HuggingFaceEmbeddings(model_name=model_name))
+    buffer = SharedVectorBuffer(rows, dim, name=buffer_name)
+    try:
+        _worker_embeddings.embed_array(texts, out=buffer.array[start:start + len(texts)])
+    finally:
+        buffer.close()
+    return start
+
+
+def embed_in_processes(texts, model_name="sentence-transformers/all-mpnet-base-v2", dim=768, workers=2, chunk_size=1024):
+    """
+    Embed texts in worker processes that write straight into shared memory.
+
+    Args:
+        texts (list): Texts to encode.
+        model_name (str): SentenceTransformer model loaded once per worker.
+        dim (int): Embedding dimension (768 for all-mpnet-base-v2).
+        workers (int): Number of processes.
+        chunk_size (int): Texts per task.
+
+    Returns:
+        SharedVectorBuffer: Holds the (len(texts), dim) vectors; call close() when done.
+    """
+    buffer = SharedVectorBuffer(len(texts), dim)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_embed_slice, model_name, buffer.name, len(texts), dim, start, texts[start:start + chunk_size])
+            for start in range(0, len(texts), chunk_size)
+        ]
+        for future in futures:
+            future.result()
+    return buffer
+
+
+# Example usage
+if __name__ == "__main__":
+    embeddings = ArrayEmbeddings(HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2"))
+    texts = [
+        "Building an exciting new project with LangChain - come check it out!",
+        "The stock market is down 500 points today due to fears of a recession.",
+        "Robbers broke into the city bank and stole $1 million in cash.",
+    ]
+    metadatas = [{"source": "tweet"}, {"source": "news"}, {"source": "news"}]
+
+    db = empty_faiss_store(embeddings, dim=768)
+
+    # In-process: the array goes from the model into the index as one buffer.
+    faiss_add_arrays(db, texts, embeddings.embed_array(texts), metadatas)
+
+    # Across processes: workers fill a shared-memory buffer, and the index reads it in place.
+    buffer = embed_in_processes(texts, workers=2, chunk_size=2)
+    faiss_add_arrays(db, texts, buffer.array, metadatas)
+    buffer.close()
+
+    for doc, score in search_by_array(db, embeddings.embed_query_array("LangChain project"), k=2):
+        print(f"* [L2={score:.3f}] {doc.page_content} [{doc.metadata}]")
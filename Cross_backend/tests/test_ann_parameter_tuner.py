@@ -0,0 +1,64 @@
+# Tests for the FAISS side of the ANN parameter tuner; small random vectors, no model.
+#   python -m pytest Cross_backend/tests
+
+import importlib.util
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+faiss = pytest.importorskip("faiss")
+pytest.importorskip("langchain_community")
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "5_ann_parameter_tuner.py")
+spec = importlib.util.spec_from_file_location("ann_parameter_tuner", SCRIPT)
+tuner = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(tuner)
+
+DIM = 16
+
+
+@pytest.fixture
+def ivf_index():
+    vectors = np.random.RandomState(1).standard_normal((2000, DIM)).astype(np.float32)
+    index = faiss.IndexIVFFlat(faiss.IndexFlatL2(DIM), DIM, 32)
+    index.train(vectors)
+    index.add(vectors)
+    return index, vectors
+
+
+def test_brute_force_top_k_matches_flat_search(ivf_index):
+    _, vectors = ivf_index
+    flat = faiss.IndexFlatL2(DIM)
+    flat.add(vectors)
+    queries = vectors[:5] + 0.1
+    np.testing.assert_array_equal(tuner.brute_force_top_k(vectors, queries, 4, metric="l2"), flat.search(queries, 4)[1])
+
+
+def test_direct_map_is_only_built_for_the_read(ivf_index):
+    index, vectors = ivf_index
+    adapter = tuner.FaissAdapter(index, "unused")
+    assert index.direct_map.type == faiss.DirectMap.NoMap
+
+    queries = adapter.sample_queries(n=20, noise=0.1)
+    assert index.direct_map.type == faiss.DirectMap.NoMap
+    truth = adapter.ground_truth(queries, k=5)
+    assert index.direct_map.type == faiss.DirectMap.NoMap
+    assert truth.shape == (20, 5)
+
+
+def test_sample_queries_are_not_stored_vectors(ivf_index):
+    index, vectors = ivf_index
+    queries = tuner.FaissAdapter(index, "unused").sample_queries(n=20, noise=0.1)
+    distances = np.linalg.norm(queries[:, None, :] - vectors[None, :, :], axis=2).min(axis=1)
+    norms = np.linalg.norm(vectors, axis=1).min()
+    assert (distances > 0.01 * norms).all()
+
+
+def test_tune_picks_a_setting_and_persists_it(ivf_index, tmp_path):
+    index, _ = ivf_index
+    adapter = tuner.FaissAdapter(index, str(tmp_path))
+    result = tuner.tune(adapter, adapter.sample_queries(n=30), k=5, target_recall=0.9, repeats=1)
+    assert result["chosen"]["param"] == "nprobe"
+    assert result["chosen"]["recall"] >= 0.9
+    assert os.path.exists(tmp_path / "search_params.json")
@@ -0,0 +1,70 @@
+# Tests for recency-aware search over time buckets; no model is downloaded.
+#   python -m pytest Cross_backend/tests
+
+import hashlib
+import importlib.util
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("faiss")
+pytest.importorskip("langchain_community")
+
+from langchain_core.documents import Document  # noqa: E402
+from langchain_core.embeddings import Embeddings  # noqa: E402
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "6_recency_ranking.py")
+spec = importlib.util.spec_from_file_location("recency_ranking", SCRIPT)
+recency = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(recency)
+
+DIM = 8
+DAY = recency.DAY
+NOW = 100 * DAY + DAY // 2  # noon of a bucket
+
+
+class HashEmbeddings(Embeddings):
+    """Deterministic unit vectors, so relevance scores stay in [0, 1]."""
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        vector = np.frombuffer(digest[:DIM], dtype=np.uint8).astype(np.float32) + 1.0
+        return (vector / np.linalg.norm(vector)).tolist()
+
+
+@pytest.fixture
+def index():
+    return recency.RecencyIndex(recency.faiss_bucket_factory(HashEmbeddings(), dim=DIM), half_life_seconds=3 * DAY)
+
+
+def test_re_add_moves_the_document_to_its_new_bucket(index):
+    doc = Document(page_content="stock market news", metadata={"timestamp": NOW - 5 * DAY})
+    index.add_documents([doc], ids=["1"])
+    index.add_documents([Document(page_content="stock market news", metadata={"timestamp": NOW - 60})], ids=["1"])
+
+    results = index.search("stock market news", k=4, now=NOW)
+    assert [d.id for d, _ in results] == ["1"]
+    assert results[0][0].metadata["timestamp"] == NOW - 60
+    assert sum(store.index.ntotal for store in index.buckets.values()) == 1
+
+
+def test_add_does_not_modify_the_callers_metadata(index):
+    doc = Document(page_content="no timestamp", metadata={"source": "tweet"})
+    index.add_documents([doc])
+    assert doc.metadata == {"source": "tweet"}
+
+
+def test_narrow_window_returns_k_hits_from_a_partial_bucket(index):
+    bucket_start = NOW - NOW % DAY
+    # Older documents in the same bucket match the query exactly and fill the first fetch_k hits
+    old = [Document(page_content="query", metadata={"timestamp": bucket_start + 60}) for _ in range(30)]
+    new = [Document(page_content=f"other {i}", metadata={"timestamp": NOW - 60}) for i in range(3)]
+    index.add_documents(old + new)
+
+    results = index.search("query", k=3, last_seconds=3600, fetch_k=3, now=NOW)
+    assert len(results) == 3
+    assert all(doc.metadata["timestamp"] == NOW - 60 for doc, _ in results)
@@ -0,0 +1,104 @@
+# Tests for the migration helpers; the target stores are replaced by small recording fakes.
+#   python -m pytest Cross_backend/tests
+
+import importlib.util
+import os
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pyarrow")
+pytest.importorskip("faiss")
+pytest.importorskip("langchain_community")
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "8_vector_migration.py")
+spec = importlib.util.spec_from_file_location("vector_migration", SCRIPT)
+migration = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(migration)
+
+VECTORS = np.arange(8, dtype=np.float32).reshape(2, 4)
+
+
+def pages(metadatas=({"source": "a"}, {"source": "b"}), ids=("doc-1", "42")):
+    yield migration._page(ids, VECTORS, ["first", "second"], list(metadatas))
+
+
+def test_parquet_round_trip(tmp_path):
+    path = str(tmp_path / "vectors.parquet")
+    assert migration.write_parquet(pages(), path) == 2
+    (ids, vectors, texts, metadatas), = migration.read_parquet(path)
+    assert ids == ["doc-1", "42"]
+    np.testing.assert_array_equal(vectors, VECTORS)
+    assert texts == ["first", "second"]
+    assert metadatas == [{"source": "a"}, {"source": "b"}]
+
+
+def test_flatten_metadata():
+    metadata = {"source": "a", "author": {"name": "x", "org": {"id": 3}}, "tags": ["p", "q"], "score": None}
+    assert migration.flatten_metadata(metadata) == {
+        "source": "a",
+        "author.name": "x",
+        "author.org.id": 3,
+        "tags": '["p", "q"]',
+    }
+
+
+class RecordingCollection:
+    def __init__(self):
+        self.calls = []
+
+    def upsert(self, **kwargs):
+        self.calls.append(kwargs)
+
+
+def test_load_chroma_flattens_nested_metadata():
+    collection = RecordingCollection()
+    store = SimpleNamespace(_collection=collection, _client=SimpleNamespace(get_max_batch_size=lambda: 1))
+    assert migration.load_chroma(pages([{"author": {"name": "x"}}, {}]), store) == 2
+    assert [call["metadatas"] for call in collection.calls] == [[{"author.name": "x"}], [None]]
+
+
+class FakeWeaviateBatch:
+    def __init__(self, failed):
+        self.failed_objects = failed
+        self.added = []
+
+    def fixed_size(self, batch_size, concurrent_requests):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add_object(self, properties, vector, uuid):
+        self.added.append(uuid)
+
+
+def test_load_weaviate_uses_uuid_ids():
+    collection = SimpleNamespace(batch=FakeWeaviateBatch([]))
+    assert migration.load_weaviate(pages(), collection) == 2
+    assert collection.batch.added == [migration._uuid_id("doc-1"), migration._uuid_id("42")]
+
+
+def test_load_weaviate_raises_on_failed_objects():
+    error = SimpleNamespace(message="vector length mismatch", object_=SimpleNamespace(uuid="u1"))
+    collection = SimpleNamespace(batch=FakeWeaviateBatch([error]))
+    with pytest.raises(RuntimeError, match="1 of 2"):
+        migration.load_weaviate(pages(), collection)
+
+
+def test_load_milvus_maps_ids_for_an_int64_pk():
+    pymilvus = pytest.importorskip("pymilvus")
+    inserted = []
+    client = SimpleNamespace(
+        describe_collection=lambda name: {"fields": [{"name": "pk", "type": pymilvus.DataType.INT64, "is_primary": True}]},
+        insert=lambda name, rows: inserted.extend(rows),
+        flush=lambda name: None,
+    )
+    assert migration.load_milvus(pages(), client, "target") == 2
+    assert inserted[1]["pk"] == 42
+    assert 0 <= inserted[0]["pk"] < 2 ** 63 and inserted[0]["pk"] == migration._int64_id("doc-1")
+    assert [row["source_id"] for row in inserted] == ["doc-1", "42"]
@@ -0,0 +1,54 @@
+# Tests for the zero-copy embedding helpers; no model is downloaded.
+#   python -m pytest Cross_backend/tests
+
+import importlib.util
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("faiss")
+pytest.importorskip("langchain_community")
+
+from langchain_core.embeddings import FakeEmbeddings  # noqa: E402
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "9_zero_copy_embeddings.py")
+spec = importlib.util.spec_from_file_location("zero_copy_embeddings", SCRIPT)
+zero_copy = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(zero_copy)
+
+DIM = 8
+
+
+def test_faiss_add_arrays_rejects_duplicates_without_adding():
+    db = zero_copy.empty_faiss_store(FakeEmbeddings(size=DIM), DIM)
+    vectors = np.random.default_rng(0).random((3, DIM), dtype=np.float32)
+    zero_copy.faiss_add_arrays(db, ["a", "b"], vectors[:2], ids=["1", "2"])
+
+    with pytest.raises(ValueError):
+        zero_copy.faiss_add_arrays(db, ["c", "a again"], vectors[1:], ids=["3", "1"])
+    with pytest.raises(ValueError):
+        zero_copy.faiss_add_arrays(db, ["c", "c"], vectors[1:], ids=["3", "3"])
+    assert db.index.ntotal == 2
+    assert sorted(db.index_to_docstore_id.values()) == ["1", "2"]
+
+    doc, _ = zero_copy.search_by_array(db, vectors[1], k=1)[0]
+    assert (doc.id, doc.page_content) == ("2", "b")
+
+
+class FakeModel:
+    def encode(self, texts, **kwargs):
+        assert kwargs["convert_to_numpy"] is True
+        return np.ones((len(texts), DIM), dtype=np.float64)
+
+
+class FakeHuggingFaceEmbeddings:
+    client = FakeModel()
+    encode_kwargs = {"convert_to_numpy": False, "normalize_embeddings": True}
+
+
+def test_embed_array_accepts_convert_to_numpy_in_encode_kwargs():
+    embeddings = zero_copy.ArrayEmbeddings(FakeHuggingFaceEmbeddings())
+    vectors = embeddings.embed_array(["a", "b"])
+    assert vectors.dtype == np.float32 and vectors.shape == (2, DIM)
+    assert vectors.flags["C_CONTIGUOUS"]
@@ -0,0 +1,278 @@
+# elastic_search_knn.py
+
+# Install necessary libraries
+# Run these commands in your terminal:
+# pip install -qU "elasticsearch>=8.14,<9" langchain-huggingface
+# (the 9.x client sends compatibility headers that an 8.x server rejects)
+#
+# Start a single-node local Elasticsearch (security disabled, for development only):
+# docker run -d --name es -p 9200:9200 -e discovery.type=single-node -e xpack.security.enabled=false \
+#     docker.elastic.co/elasticsearch/elasticsearch:8.15.0
+
+from uuid import uuid4
+
+from elasticsearch import Elasticsearch
+from elasticsearch.helpers import bulk, parallel_bulk
+from langchain_core.documents import Document
+
+
+def initialize_embeddings():
+    """
+    Initialize Hugging Face embeddings using a pre-trained model.
+
+    Returns:
+        HuggingFaceEmbeddings: An instance of HuggingFaceEmbeddings initialized with a specific model.
+    """
+    from langchain_huggingface import HuggingFaceEmbeddings
+
+    return HuggingFaceEmbeddings(model="sentence-transformers/all-mpnet-base-v2")
+
+
+def create_index(client, index_name, dim=768, quantize=False, m=16, ef_construction=100, drop_old=False):
+    """
+    Create an index with a text field, keyword metadata and an HNSW dense_vector field.
+
+    Args:
+        client (Elasticsearch): The Elasticsearch client.
+        index_name (str): Name of the index.
+        dim (int): Vector dimension (768 for all-mpnet-base-v2).
+        quantize (bool): Use int8_hnsw, which stores int8 vectors in the graph (about 4x less memory).
+        m (int): HNSW neighbors per node.
+        ef_construction (int): HNSW candidate list size while building.
+        drop_old (bool): Delete an existing index first.
+    """
+    if drop_old:
+        client.indices.delete(index=index_name, ignore_unavailable=True)
+    client.indices.create(
+        index=index_name,
+        settings={"number_of_shards": 1, "number_of_replicas": 0},
+        mappings={
+            "dynamic_templates": [
+                # Metadata values are exact-match fields, so they can be used in kNN filters.
+                {"metadata_as_keyword": {"path_match": "metadata.*", "mapping": {"type": "keyword"}}}
+            ],
+            "properties": {
+                "text": {"type": "text"},
+                "vector": {
+                    "type": "dense_vector",
+                    "dims": dim,
+                    "index": True,
+                    "similarity": "cosine",
+                    "index_options": {
+                        "type": "int8_hnsw" if quantize else "hnsw",
+                        "m": m,
+                        "ef_construction": ef_construction,
+                    },
+                },
+            },
+        },
+    )
+
+
+def bulk_ingest(client, index_name, embeddings, documents, batch_size=500, thread_count=4, force_merge=True,
+                force_merge_timeout=3600):
+    """
+    Embed documents and index them with the parallel _bulk helper.
+
+    Refresh is switched off during the load, then the index's previous
+    refresh_interval is restored and the index is refreshed once. A force merge
+    to one segment leaves a single HNSW graph to search.
+
+    Args:
+        client (Elasticsearch): The Elasticsearch client.
+        index_name (str): Target index.
+        embeddings (HuggingFaceEmbeddings): The embeddings model.
+        documents (list): Documents to index.
+        batch_size (int): Documents per embedding batch and per _bulk request.
+        thread_count (int): Concurrent _bulk requests.
+        force_merge (bool): Merge segments after the load.
+        force_merge_timeout (float): Seconds to wait for the merge, which takes far longer
+            than a search on a large index.
+
+    Returns:
+        dict: Counts of indexed and failed documents, and the ids.
+    """
+    ids = [doc.id or str(uuid4()) for doc in documents]
+
+    def actions():
+        for start in range(0, len(documents), batch_size):
+            batch = documents[start:start + batch_size]
+            vectors = embeddings.embed_documents([doc.page_content for doc in batch])
+            for doc_id, doc, vector in zip(ids[start:], batch, vectors):
+                yield {
+                    "_index": index_name,
+                    "_id": doc_id,
+                    "_source": {"text": doc.page_content, "metadata": doc.metadata, "vector": vector},
+                }
+
+    current = client.indices.get_settings(index=index_name, name="index.refresh_interval")
+    # None when the index uses the default; putting None back restores the default
+    previous = current[index_name]["settings"].get("index", {}).get("refresh_interval")
+    client.indices.put_settings(index=index_name, settings={"index.refresh_interval": "-1"})
+    indexed, failed = 0, 0
+    try:
+        for ok, _ in parallel_bulk(client, actions(), chunk_size=batch_size, thread_count=thread_count,
+                                   raise_on_error=False):
+            indexed += ok
+            failed += not ok
+    finally:
+        client.indices.put_settings(index=index_name, settings={"index.refresh_interval": previous})
+        client.indices.refresh(index=index_name)
+    if force_merge:
+        client.options(request_timeout=force_merge_timeout).indices.forcemerge(index=index_name, max_num_segments=1)
+    return {"indexed": indexed, "failed": failed, "ids": ids}
+
+
+def build_filter(filter):
+    """
+    Turn {"source": "news"} or {"source": ["news", "tweet"]} into term / terms clauses.
+    """
+    return [
+        {"terms" if isinstance(value, list) else "term": {f"metadata.{key}": value}}
+        for key, value in (filter or {}).items()
+    ]
+
+
+def _to_results(response):
+    return [
+        (Document(id=hit["_id"], page_content=hit["_source"]["text"], metadata=hit["_source"].get("metadata", {})), hit["_score"])
+        for hit in response["hits"]["hits"]
+    ]
+
+
+def knn_clause(query_vector, k=4, num_candidates=100, filter=None):
+    """
+    Build the kNN clause, with the metadata filter applied during the HNSW traversal.
+
+    Returns:
+        dict: The value of the "knn" search option.
+    """
+    return {
+        "field": "vector",
+        "query_vector": query_vector,
+        "k": k,
+        "num_candidates": num_candidates,
+        "filter": build_filter(filter),
+    }
+
+
+def knn_request(query_vector, k=4, num_candidates=100, filter=None):
+    """
+    Build the search request for knn_search().
+
+    Returns:
+        dict: Keyword arguments for Elasticsearch.search (without the index).
+    """
+    return {
+        "knn": knn_clause(query_vector, k, num_candidates, filter),
+        "size": k,
+        "source": ["text", "metadata"],
+    }
+
+
+def hybrid_request(query, query_vector, k=4, num_candidates=100, filter=None,
+                   knn_boost=0.7, bm25_boost=0.3, fusion="linear"):
+    """
+    Build the search request for hybrid_search(): kNN and BM25 in one request.
+
+    Returns:
+        dict: Keyword arguments for Elasticsearch.search (without the index).
+    """
+    knn = knn_clause(query_vector, k, num_candidates, filter)
+    match = {"bool": {"must": {"match": {"text": query}}, "filter": build_filter(filter)}}
+    if fusion == "rrf":
+        return {
+            "retriever": {"rrf": {"retrievers": [{"standard": {"query": match}}, {"knn": knn}], "rank_window_size": num_candidates}},
+            "size": k,
+            "source": ["text", "metadata"],
+        }
+    if fusion == "linear":
+        match["bool"]["boost"] = bm25_boost
+        return {"knn": {**knn, "boost": knn_boost}, "query": match, "size": k, "source": ["text", "metadata"]}
+    raise ValueError(f"Unknown fusion method: {fusion}")
+
+
+def knn_search(client, index_name, query_vector, k=4, num_candidates=100, filter=None):
+    """
+    Approximate kNN search with the filter pushed into the HNSW traversal.
+
+    Filtering inside the kNN clause always yields k matching hits. A post_filter
+    would drop hits after the top k is chosen.
+
+    Returns:
+        list: (Document, score) pairs, best first.
+    """
+    return _to_results(client.search(index=index_name, **knn_request(query_vector, k, num_candidates, filter)))
+
+
+def hybrid_search(client, index_name, query, query_vector, k=4, num_candidates=100, filter=None,
+                  knn_boost=0.7, bm25_boost=0.3, fusion="linear"):
+    """
+    kNN and BM25 in one request.
+
+    Args:
+        client (Elasticsearch): The Elasticsearch client.
+        index_name (str): Index to search.
+        query (str): Query text for BM25.
+        query_vector (list): Query embedding for kNN.
+        k (int): Number of results.
+        num_candidates (int): HNSW candidates per shard.
+        filter (dict): Metadata filter applied to both sides.
+        knn_boost (float): Weight of the kNN score for linear fusion.
+        bm25_boost (float): Weight of the BM25 score for linear fusion.
+        fusion (str): "linear" (boosted sum) or "rrf" (reciprocal rank fusion retriever, Elasticsearch 8.14+).
+
+    Returns:
+        list: (Document, score) pairs, best first.
+    """
+    request = hybrid_request(query, query_vector, k, num_candidates, filter, knn_boost, bm25_boost, fusion)
+    return _to_results(client.search(index=index_name, **request))
+
+
+def delete_documents(client, index_name, ids):
+    """
+    Delete documents by id with a single _bulk request.
+
+    Returns:
+        int: Number of documents deleted.
+    """
+    deleted, _ = bulk(
+        client,
+        ({"_op_type": "delete", "_index": index_name, "_id": doc_id} for doc_id in ids),
+        raise_on_error=False,
+        refresh="wait_for",
+    )
+    return deleted
+
+
+def main():
+    embeddings = initialize_embeddings()
+    client = Elasticsearch("http://localhost:9200", request_timeout=60)
+    index_name = "langchain_knn"
+
+    create_index(client, index_name, quantize=True, drop_old=True)
+    stats = bulk_ingest(client, index_name, embeddings, [
+        Document(page_content="I had chocolate chip pancakes and scrambled eggs for breakfast this morning.", metadata={"source": "tweet"}),
+        Document(page_content="Building an exciting new project with LangChain - come check it out!", metadata={"source": "tweet"}),
+        Document(page_content="Robbers broke into the city bank and stole $1 million in cash.", metadata={"source": "news"}),
+        Document(page_content="LangGraph is the best framework for building stateful, agentic applications!", metadata={"source": "tweet"}),
+        Document(page_content="The stock market is down 500 points today due to fears of a recession.", metadata={"source": "news"}),
+    ])
+    print(f"Indexed: {stats['indexed']}, failed: {stats['failed']}")
+
+    query = "LangChain framework"
+    query_vector = embeddings.embed_query(query)
+
+    print("kNN with filter:")
+    for doc, score in knn_search(client, index_name, query_vector, k=2, filter={"source": "tweet"}):
+        print(f"* [SIM={score:.3f}] {doc.page_content} [{doc.metadata}]")
+
+    print("kNN + BM25:")
+    for doc, score in hybrid_search(client, index_name, query, query_vector, k=2):
+        print(f"* [SCORE={score:.3f}] {doc.page_content} [{doc.metadata}]")
+
+    delete_documents(client, index_name, stats["ids"][:1])
+
+
+if __name__ == "__main__":
+    main()
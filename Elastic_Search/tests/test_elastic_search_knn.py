@@ -0,0 +1,216 @@
+# Tests for the Elasticsearch kNN script.
+#
+# Request-body, bulk-load and delete tests run without a server. The round-trip test needs a
+# single-node local instance and is skipped when none is reachable:
+#   docker run -d --name es -p 9200:9200 -e discovery.type=single-node -e xpack.security.enabled=false \
+#       docker.elastic.co/elasticsearch/elasticsearch:8.15.0
+#   ES_URL=http://localhost:9200 python -m pytest Elastic_Search/tests
+
+import hashlib
+import importlib.util
+import os
+
+import pytest
+
+elasticsearch = pytest.importorskip("elasticsearch")
+pytest.importorskip("langchain_core")
+
+from langchain_core.documents import Document  # noqa: E402
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "1_elastic_search_knn.py")
+spec = importlib.util.spec_from_file_location("elastic_search_knn", SCRIPT)
+es_knn = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(es_knn)
+
+DIM = 8
+VECTOR = [0.1] * DIM
+
+
+class HashEmbeddings:
+    """Deterministic small vectors, so the tests do not download a model."""
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return [b / 255.0 + 0.01 for b in digest[:DIM]]
+
+
+@pytest.fixture
+def client():
+    url = os.environ.get("ES_URL", "http://localhost:9200")
+    conn = elasticsearch.Elasticsearch(url, request_timeout=30)
+    try:
+        reachable = conn.ping()
+    except Exception:
+        reachable = False
+    if not reachable:
+        pytest.skip(f"No Elasticsearch instance at {url}")
+    yield conn
+    conn.indices.delete(index="test_langchain_knn", ignore_unavailable=True)
+    conn.close()
+
+
+# ---- Request bodies ----
+
+def test_build_filter():
+    assert es_knn.build_filter(None) == []
+    assert es_knn.build_filter({"source": "news"}) == [{"term": {"metadata.source": "news"}}]
+    assert es_knn.build_filter({"source": ["news", "tweet"], "lang": "en"}) == [
+        {"terms": {"metadata.source": ["news", "tweet"]}},
+        {"term": {"metadata.lang": "en"}},
+    ]
+
+
+def test_knn_request_pushes_filter_into_knn():
+    request = es_knn.knn_request(VECTOR, k=3, num_candidates=50, filter={"source": "news"})
+    assert request == {
+        "knn": {
+            "field": "vector",
+            "query_vector": VECTOR,
+            "k": 3,
+            "num_candidates": 50,
+            "filter": [{"term": {"metadata.source": "news"}}],
+        },
+        "size": 3,
+        "source": ["text", "metadata"],
+    }
+    assert "post_filter" not in request
+
+
+def test_hybrid_request_linear():
+    request = es_knn.hybrid_request("LangChain", VECTOR, k=2, filter={"source": "tweet"}, knn_boost=0.6, bm25_boost=0.4)
+    filters = [{"term": {"metadata.source": "tweet"}}]
+    assert request["knn"]["boost"] == 0.6
+    assert request["knn"]["filter"] == filters
+    assert request["query"] == {"bool": {"must": {"match": {"text": "LangChain"}}, "filter": filters, "boost": 0.4}}
+    assert request["size"] == 2
+
+
+def test_hybrid_request_rrf():
+    request = es_knn.hybrid_request("LangChain", VECTOR, k=2, num_candidates=40, filter={"source": "tweet"}, fusion="rrf")
+    rrf = request["retriever"]["rrf"]
+    standard, knn = rrf["retrievers"]
+    assert rrf["rank_window_size"] == 40
+    assert standard["standard"]["query"]["bool"]["filter"] == [{"term": {"metadata.source": "tweet"}}]
+    assert knn["knn"]["filter"] == [{"term": {"metadata.source": "tweet"}}]
+    assert "boost" not in knn["knn"]
+    assert "knn" not in request and "query" not in request
+
+
+def test_hybrid_request_rejects_unknown_fusion():
+    with pytest.raises(ValueError):
+        es_knn.hybrid_request("LangChain", VECTOR, fusion="max")
+
+
+# ---- Bulk load and delete, with the transport replaced ----
+
+class RecordingIndices:
+    def __init__(self, refresh_interval):
+        self.settings = {} if refresh_interval is None else {"index": {"refresh_interval": refresh_interval}}
+        self.calls = []
+
+    def get_settings(self, index, name):
+        return {index: {"settings": self.settings}}
+
+    def put_settings(self, index, settings):
+        self.calls.append(("put_settings", settings))
+
+    def refresh(self, index):
+        self.calls.append(("refresh", index))
+
+    def forcemerge(self, index, max_num_segments):
+        self.calls.append(("forcemerge", max_num_segments))
+
+
+class RecordingClient:
+    """Records the index calls bulk_ingest makes."""
+
+    def __init__(self, refresh_interval=None):
+        self.indices = RecordingIndices(refresh_interval)
+        self.timeouts = []
+
+    def options(self, request_timeout):
+        self.timeouts.append(request_timeout)
+        return self
+
+
+@pytest.mark.parametrize("previous", ["30s", None])
+def test_bulk_ingest_restores_refresh_interval(monkeypatch, previous):
+    sent = []
+
+    def fake_parallel_bulk(client, actions, **kwargs):
+        for action in actions:
+            sent.append(action)
+            yield action["_id"] != "bad", {}
+
+    monkeypatch.setattr(es_knn, "parallel_bulk", fake_parallel_bulk)
+    client = RecordingClient(previous)
+    documents = [Document(page_content=f"doc {i}", metadata={"n": i}, id="bad" if i == 2 else None) for i in range(3)]
+    stats = es_knn.bulk_ingest(client, "idx", HashEmbeddings(), documents, batch_size=2, force_merge_timeout=900)
+
+    assert (stats["indexed"], stats["failed"]) == (2, 1)
+    assert [a["_id"] for a in sent] == stats["ids"]
+    assert sent[0]["_source"] == {"text": "doc 0", "metadata": {"n": 0}, "vector": HashEmbeddings().embed_query("doc 0")}
+    assert client.indices.calls == [
+        ("put_settings", {"index.refresh_interval": "-1"}),
+        ("put_settings", {"index.refresh_interval": previous}),
+        ("refresh", "idx"),
+        ("forcemerge", 1),
+    ]
+    assert client.timeouts == [900]
+
+
+def test_bulk_ingest_restores_refresh_interval_on_error(monkeypatch):
+    def failing_parallel_bulk(client, actions, **kwargs):
+        raise RuntimeError("connection lost")
+        yield
+
+    monkeypatch.setattr(es_knn, "parallel_bulk", failing_parallel_bulk)
+    client = RecordingClient("5s")
+    with pytest.raises(RuntimeError):
+        es_knn.bulk_ingest(client, "idx", HashEmbeddings(), [Document(page_content="a")])
+    assert client.indices.calls[-2:] == [("put_settings", {"index.refresh_interval": "5s"}), ("refresh", "idx")]
+
+
+def test_delete_documents_sends_one_bulk_request(monkeypatch):
+    requests = []
+
+    def fake_bulk(client, actions, **kwargs):
+        actions = list(actions)
+        requests.append((actions, kwargs))
+        return len(actions), []
+
+    monkeypatch.setattr(es_knn, "bulk", fake_bulk)
+    assert es_knn.delete_documents(None, "idx", ["a", "b"]) == 2
+    (actions, kwargs), = requests
+    assert actions == [
+        {"_op_type": "delete", "_index": "idx", "_id": "a"},
+        {"_op_type": "delete", "_index": "idx", "_id": "b"},
+    ]
+    assert kwargs["refresh"] == "wait_for"
+
+
+# ---- Against a local instance ----
+
+def test_bulk_ingest_and_knn_search(client):
+    index_name = "test_langchain_knn"
+    embeddings = HashEmbeddings()
+    es_knn.create_index(client, index_name, dim=DIM, drop_old=True)
+    client.indices.put_settings(index=index_name, settings={"index.refresh_interval": "30s"})
+
+    stats = es_knn.bulk_ingest(client, index_name, embeddings, [
+        Document(page_content="a tweet", metadata={"source": "tweet"}),
+        Document(page_content="a news story", metadata={"source": "news"}),
+        Document(page_content="another tweet", metadata={"source": "tweet"}),
+    ], batch_size=2, thread_count=2)
+    assert stats["indexed"] == 3 and stats["failed"] == 0
+
+    # The index's own refresh interval is restored after the load
+    settings = client.indices.get_settings(index=index_name, name="index.refresh_interval")
+    assert settings[index_name]["settings"]["index"]["refresh_interval"] == "30s"
+
+    results = es_knn.knn_search(client, index_name, embeddings.embed_query("a tweet"), k=3, filter={"source": "tweet"})
+    assert {doc.metadata["source"] for doc, _ in results} == {"tweet"}
+    assert results[0][0].page_content == "a tweet"
@@ -0,0 +1,365 @@
+# Write-ahead log, segment checkpoints and crash recovery for a FAISS store
+# pip install -qU langchain-community langchain-huggingface faiss-cpu numpy
+
+import glob
+import io
+import json
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+from uuid import uuid4
+
+import numpy as np
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+RECORD_HEADER = struct.Struct("<QII")  # sequence number, payload length, CRC32 of payload
+
+
+def _fsync_dir(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_atomic(path, data):
+    """Write bytes to a temporary file, fsync it and rename it over `path`."""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(os.path.dirname(path) or ".")
+
+
+class WriteAheadLog:
+    """
+    Append-only log of add/delete records with group commit.
+
+    Each record is framed with its sequence number, length and CRC32, so a record
+    torn by a crash is detected and dropped on replay. Writers that call `sync`
+    around the same time share one fsync (group commit).
+    """
+
+    def __init__(self, folder, start_seq, commit_delay=0.002):
+        self.folder = folder
+        self.commit_delay = commit_delay
+        self._append_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self.last_seq = start_seq
+        self.durable_seq = start_seq
+        self.fsyncs = 0
+        self._open(start_seq + 1)
+
+    def _open(self, first_seq):
+        self.path = os.path.join(self.folder, f"wal_{first_seq:020d}.log")
+        self._file = open(self.path, "ab")
+
+    def append(self, op, payload):
+        """Buffer one record; returns its sequence number (not yet durable)."""
+        with self._append_lock:
+            self.last_seq += 1
+            body = pickle.dumps((op, payload), protocol=pickle.HIGHEST_PROTOCOL)
+            self._file.write(RECORD_HEADER.pack(self.last_seq, len(body), zlib.crc32(body)) + body)
+            return self.last_seq
+
+    def sync(self, seq):
+        """Block until record `seq` is on disk, fsyncing once for every waiting writer."""
+        if self.durable_seq >= seq:
+            return
+        with self._sync_lock:
+            if self.durable_seq >= seq:
+                return  # another writer's fsync covered this record
+            if self.commit_delay:
+                time.sleep(self.commit_delay)  # let concurrent writers join this group
+            # Held through the fsync: rotate() may otherwise close the file under us
+            with self._append_lock:
+                target = self.last_seq
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            self.durable_seq = target
+            self.fsyncs += 1
+
+    def rotate(self):
+        """Start a new log file; returns the paths of the old files, which a checkpoint can delete."""
+        with self._append_lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            old = sorted(glob.glob(os.path.join(self.folder, "wal_*.log")))
+            self._open(self.last_seq + 1)
+            self.durable_seq = self.last_seq
+        return old
+
+    @staticmethod
+    def replay(folder, after_seq):
+        """Yield (seq, op, payload) for every intact record newer than `after_seq`."""
+        for path in sorted(glob.glob(os.path.join(folder, "wal_*.log"))):
+            with open(path, "rb") as f:
+                data = f.read()
+            offset = 0
+            while offset + RECORD_HEADER.size <= len(data):
+                seq, length, crc = RECORD_HEADER.unpack_from(data, offset)
+                body = data[offset + RECORD_HEADER.size:offset + RECORD_HEADER.size + length]
+                if len(body) < length or zlib.crc32(body) != crc:
+                    print(f"Torn record at {path}:{offset}; ignoring the rest of the log.")
+                    return
+                offset += RECORD_HEADER.size + length
+                if seq > after_seq:
+                    op, payload = pickle.loads(body)
+                    yield seq, op, payload
+
+    def close(self):
+        self._file.close()
+
+
+class DurableFAISS:
+    """
+    FAISS store whose writes are logged before they are applied.
+
+    Data on disk:
+      - `wal_*.log`: add/delete records since the last checkpoint.
+      - `segment_*.npy` / `segment_*.json`: vectors and documents in append-only segments.
+        A full segment is sealed, written once, and never rewritten.
+      - `tombstones.json`: ids deleted from sealed segments.
+      - `manifest.json`: the segment list and the WAL sequence the checkpoint covers.
+
+    A checkpoint only writes the open segment, the tombstones and the manifest.
+    Opening the store loads the segments and replays the WAL after the checkpoint.
+    """
+
+    def __init__(self, folder, embeddings, segment_size=100_000, checkpoint_every=10_000, commit_delay=0.002):
+        """
+        Args:
+            folder (str): Directory holding the log, segments and manifest.
+            embeddings: LangChain embeddings model.
+            segment_size (int): Vectors per segment before it is sealed.
+            checkpoint_every (int): Take a checkpoint after this many WAL records.
+            commit_delay (float): Seconds a group commit waits for more writers.
+        """
+        os.makedirs(folder, exist_ok=True)
+        self.folder = folder
+        self.embeddings = embeddings
+        self.segment_size = segment_size
+        self.checkpoint_every = checkpoint_every
+        self._lock = threading.RLock()
+        self._load()
+        self.wal = WriteAheadLog(folder, self.applied_seq, commit_delay=commit_delay)
+
+    # ---- Loading and recovery ----
+
+    def _load(self):
+        manifest_path = os.path.join(self.folder, "manifest.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {"checkpoint_seq": 0, "segments": [], "next_segment": 0}
+        tombstones_path = os.path.join(self.folder, "tombstones.json")
+        self.tombstones = set()
+        if os.path.exists(tombstones_path):
+            with open(tombstones_path) as f:
+                self.tombstones = set(json.load(f))
+
+        self.db = None
+        self.open_segment = {"ids": [], "vectors": [], "texts": [], "metadatas": []}
+        segments = []
+        for i, name in enumerate(self.manifest["segments"]):
+            vectors = np.load(os.path.join(self.folder, f"{name}.npy"), mmap_mode="r")
+            with open(os.path.join(self.folder, f"{name}.json")) as f:
+                docs = json.load(f)
+            is_open = i == len(self.manifest["segments"]) - 1 and len(docs["ids"]) < self.segment_size
+            if is_open:
+                self.open_segment = {
+                    "name": name, "ids": docs["ids"], "vectors": [np.array(v) for v in vectors],
+                    "texts": docs["texts"], "metadatas": docs["metadatas"],
+                }
+            segments.append((vectors, docs))
+
+        # An id re-added after a delete has a copy in more than one row; only the last write is live
+        last = {}
+        for i, (_, docs) in enumerate(segments):
+            for j, doc_id in enumerate(docs["ids"]):
+                last[doc_id] = (i, j)
+        for i, (vectors, docs) in enumerate(segments):
+            live = [
+                j for j, doc_id in enumerate(docs["ids"])
+                if doc_id not in self.tombstones and last[doc_id] == (i, j)
+            ]
+            self._apply_add(
+                [docs["ids"][j] for j in live], np.asarray(vectors[live]),
+                [docs["texts"][j] for j in live], [docs["metadatas"][j] for j in live],
+            )
+
+        self.applied_seq = self.manifest["checkpoint_seq"]
+        replayed = 0
+        for seq, op, payload in WriteAheadLog.replay(self.folder, self.applied_seq):
+            self._apply(op, payload)
+            self.applied_seq = seq
+            replayed += 1
+        if replayed:
+            print(f"Recovered {replayed} operations from the write-ahead log.")
+        self.ops_since_checkpoint = replayed
+
+    # ---- Applying operations to memory ----
+
+    def _present(self, ids):
+        """The ids stored in the index, each once."""
+        if self.db is None:
+            return []
+        stored = set(self.db.index_to_docstore_id.values())
+        return [i for i in dict.fromkeys(ids) if i in stored]
+
+    def _apply_add(self, ids, vectors, texts, metadatas):
+        if not ids:
+            return
+        # Re-adding an id replaces its current copy
+        existing = self._present(ids)
+        if existing:
+            self.db.delete(existing)
+        pairs = list(zip(texts, np.asarray(vectors, dtype=np.float32).tolist()))
+        if self.db is None:
+            self.db = FAISS.from_embeddings(pairs, self.embeddings, metadatas=metadatas, ids=ids)
+        else:
+            self.db.add_embeddings(pairs, metadatas=metadatas, ids=ids)
+
+    def _apply(self, op, payload):
+        if op == "add":
+            ids, vectors, texts, metadatas = payload
+            self._apply_add(ids, vectors, texts, metadatas)
+            segment = self.open_segment
+            segment["ids"].extend(ids)
+            segment["vectors"].extend(vectors)
+            segment["texts"].extend(texts)
+            segment["metadatas"].extend(metadatas)
+            segment["dirty"] = True
+            self.tombstones.difference_update(ids)
+        elif op == "delete":
+            ids = payload
+            present = self._present(ids)
+            if present:
+                self.db.delete(present)
+            self.tombstones.update(ids)
+
+    # ---- Public API ----
+
+    def add_documents(self, documents, ids=None):
+        """
+        Log, apply, then fsync (group commit). Returns the ids once the write is durable.
+
+        Logging and applying happen under one lock so memory follows log order. Searches
+        may see the batch before its fsync completes; after a crash it is recovered only
+        if the fsync finished. Ids already in the store are replaced.
+
+        Raises:
+            ValueError: If the ids do not match the documents or repeat within the batch.
+                Nothing is logged, since a record that cannot be applied would fail
+                again on every reopen.
+        """
+        ids = ids or [str(uuid4()) for _ in documents]
+        if len(ids) != len(documents):
+            raise ValueError(f"Got {len(ids)} ids for {len(documents)} documents")
+        if len(set(ids)) != len(ids):
+            raise ValueError("Duplicate ids in one batch")
+        texts = [d.page_content for d in documents]
+        metadatas = [d.metadata for d in documents]
+        vectors = np.asarray(self.embeddings.embed_documents(texts), dtype=np.float32)
+        with self._lock:
+            seq = self.wal.append("add", (ids, vectors, texts, metadatas))
+            self._apply("add", (ids, vectors, texts, metadatas))
+            self.applied_seq = seq
+        self.wal.sync(seq)
+        self._after_write()
+        return ids
+
+    def delete(self, ids):
+        with self._lock:
+            seq = self.wal.append("delete", list(ids))
+            self._apply("delete", list(ids))
+            self.applied_seq = seq
+        self.wal.sync(seq)
+        self._after_write()
+
+    def similarity_search_with_score(self, query, k=4, **kwargs):
+        return self.db.similarity_search_with_score(query, k=k, **kwargs) if self.db else []
+
+    def similarity_search(self, query, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k, **kwargs)]
+
+    def _after_write(self):
+        self.ops_since_checkpoint += 1
+        if self.ops_since_checkpoint >= self.checkpoint_every:
+            self.checkpoint()
+
+    # ---- Checkpoints ----
+
+    def _write_segment(self, segment):
+        name = segment.get("name")
+        if name is None:
+            name = segment["name"] = f"segment_{self.manifest['next_segment']:06d}"
+            self.manifest["next_segment"] += 1
+            self.manifest["segments"].append(name)
+        out = io.BytesIO()
+        np.save(out, np.asarray(segment["vectors"], dtype=np.float32))
+        _write_atomic(os.path.join(self.folder, f"{name}.npy"), out.getvalue())
+        docs = {"ids": segment["ids"], "texts": segment["texts"], "metadatas": segment["metadatas"]}
+        _write_atomic(os.path.join(self.folder, f"{name}.json"), json.dumps(docs).encode("utf-8"))
+        segment["dirty"] = False
+
+    def checkpoint(self):
+        """
+        Persist only what changed since the last checkpoint, then drop the covered WAL files.
+
+        Full segments are sealed: written one last time and then left untouched.
+        """
+        with self._lock:
+            fields = ("ids", "vectors", "texts", "metadatas")
+            segment = self.open_segment
+            written = 0
+            while len(segment["ids"]) >= self.segment_size:
+                # Seal a full segment; the remainder starts a new open segment
+                full = {key: segment[key][:self.segment_size] for key in fields}
+                full["name"] = segment.get("name")
+                self._write_segment(full)
+                written += 1
+                segment = {key: segment[key][self.segment_size:] for key in fields}
+                segment["dirty"] = True
+            if segment.get("dirty") and segment["ids"]:
+                self._write_segment(segment)
+                written += 1
+            self.open_segment = segment
+            _write_atomic(os.path.join(self.folder, "tombstones.json"), json.dumps(sorted(self.tombstones)).encode("utf-8"))
+            self.manifest["checkpoint_seq"] = self.applied_seq
+            old_logs = self.wal.rotate()
+            _write_atomic(os.path.join(self.folder, "manifest.json"), json.dumps(self.manifest).encode("utf-8"))
+            for path in old_logs:
+                os.remove(path)
+            self.ops_since_checkpoint = 0
+            print(f"Checkpoint at seq {self.applied_seq}: {written} segment file(s) written.")
+
+    def close(self):
+        self.checkpoint()
+        self.wal.close()
+
+
+# Example usage
+if __name__ == "__main__":
+    embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2")
+
+    store = DurableFAISS("faiss_durable", embeddings, segment_size=1000, checkpoint_every=100)
+    ids = store.add_documents([Document(page_content="foo"), Document(page_content="bar")])
+    store.delete([ids[0]])
+    # Simulate a crash: no checkpoint was taken, but both operations are durable in the WAL.
+    store.wal.close()
+
+    recovered = DurableFAISS("faiss_durable", embeddings)  # replays the WAL
+    print(recovered.similarity_search("bar", k=1))
+
+    recovered.close()  # checkpoint: writes the open segment, tombstones and manifest
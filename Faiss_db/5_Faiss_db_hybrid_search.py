@@ -0,0 +1,311 @@
+# Hybrid (dense + BM25) search for FAISS and Chroma without a search server
+# pip install -qU langchain-community langchain-huggingface faiss-cpu numpy
+
+import re
+from array import array
+from uuid import uuid4
+
+import numpy as np
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_core.documents import Document
+
+from faiss_utils import empty_faiss_store
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Lowercase word tokenizer shared by indexing and querying."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """
+    In-memory inverted index with BM25 scoring.
+
+    Postings are kept per term as two compact typed arrays (document numbers
+    and term frequencies) that can be appended to in place and viewed as NumPy
+    arrays without copying, so a query only touches the postings of its own terms.
+    Deleted documents are tombstoned and removed from the postings once they make
+    up more than `compact_ratio` of the index. Writes and searches must not run
+    at the same time (a typed array cannot grow while NumPy is viewing it).
+    """
+
+    def __init__(self, k1=1.5, b=0.75, compact_ratio=0.25):
+        self.k1 = k1
+        self.b = b
+        self.compact_ratio = compact_ratio
+        self.postings = {}              # term -> (array('i') doc numbers, array('f') term frequencies)
+        self.doc_lengths = array("f")   # doc number -> token count
+        self.alive = bytearray()        # doc number -> 1 if not deleted
+        self.doc_ids = []               # doc number -> external id
+        self.id_to_num = {}             # external id -> doc number
+        self.total_length = 0.0
+        self.live_count = 0
+
+    def add(self, ids, texts):
+        """
+        Index new texts under the given external ids.
+
+        Args:
+            ids (list): External document ids.
+            texts (list): Texts to index, one per id.
+        """
+        for doc_id, text in zip(ids, texts):
+            if doc_id in self.id_to_num:
+                self.delete([doc_id])
+            num = len(self.doc_ids)
+            tokens = tokenize(text)
+            counts = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for term, tf in counts.items():
+                nums, tfs = self.postings.setdefault(term, (array("i"), array("f")))
+                nums.append(num)
+                tfs.append(tf)
+            self.doc_ids.append(doc_id)
+            self.id_to_num[doc_id] = num
+            self.doc_lengths.append(len(tokens))
+            self.alive.append(1)
+            self.total_length += len(tokens)
+            self.live_count += 1
+
+    def delete(self, ids):
+        """
+        Tombstone documents by external id.
+
+        Args:
+            ids (list): External document ids to remove.
+        """
+        for doc_id in ids:
+            num = self.id_to_num.pop(doc_id, None)
+            if num is None:
+                continue
+            self.alive[num] = 0
+            self.total_length -= self.doc_lengths[num]
+            self.live_count -= 1
+        dead = len(self.doc_ids) - self.live_count
+        if self.doc_ids and dead / len(self.doc_ids) > self.compact_ratio:
+            self.compact()
+
+    def compact(self):
+        """Drop tombstoned documents and renumber the remaining ones."""
+        alive = np.frombuffer(bytes(self.alive), dtype=np.uint8).astype(bool)
+        remap = np.cumsum(alive, dtype=np.int64) - 1
+        for term in list(self.postings):
+            nums, tfs = self.postings[term]
+            nums_np = np.frombuffer(nums, dtype=np.int32)
+            keep = alive[nums_np]
+            if not keep.any():
+                del self.postings[term]
+                continue
+            new_nums = array("i", remap[nums_np[keep]].astype(np.int32).tobytes())
+            new_tfs = array("f", np.frombuffer(tfs, dtype=np.float32)[keep].tobytes())
+            self.postings[term] = (new_nums, new_tfs)
+        lengths = np.frombuffer(self.doc_lengths, dtype=np.float32)[alive]
+        self.doc_lengths = array("f", lengths.tobytes())
+        self.doc_ids = [d for d, a in zip(self.doc_ids, alive) if a]
+        self.id_to_num = {d: i for i, d in enumerate(self.doc_ids)}
+        self.alive = bytearray(b"\x01" * len(self.doc_ids))
+
+    def search(self, query, k=10, predicate=None):
+        """
+        Score the query with BM25 and return the top k documents.
+
+        Args:
+            query (str): Query text.
+            k (int): Number of results to return.
+            predicate (callable): Optional external id -> bool; documents it rejects
+                are dropped before the top k cut.
+
+        Returns:
+            list: (external id, score) pairs, best first.
+        """
+        if k <= 0 or not self.live_count:
+            return []
+        n_docs = len(self.doc_ids)
+        scores = np.zeros(n_docs, dtype=np.float32)
+        lengths = np.frombuffer(self.doc_lengths, dtype=np.float32)
+        avg_length = self.total_length / self.live_count
+        for term in set(tokenize(query)):
+            entry = self.postings.get(term)
+            if entry is None:
+                continue
+            nums = np.frombuffer(entry[0], dtype=np.int32)
+            tfs = np.frombuffer(entry[1], dtype=np.float32)
+            # Document frequency includes tombstones until the next compaction,
+            # which only slightly under-weights rare terms in the meantime.
+            df = len(nums)
+            idf = np.log(1.0 + (self.live_count - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1.0 - self.b + self.b * lengths[nums] / avg_length)
+            scores[nums] += idf * tfs * (self.k1 + 1.0) / (tfs + norm)
+        scores[np.frombuffer(bytes(self.alive), dtype=np.uint8) == 0] = 0.0
+        candidates = np.flatnonzero(scores > 0)
+        if predicate is not None:
+            candidates = np.array([i for i in candidates if predicate(self.doc_ids[i])], dtype=np.int64)
+        if not len(candidates):
+            return []
+        k = min(k, len(candidates))
+        top = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        top = top[np.argsort(-scores[top])]
+        return [(self.doc_ids[i], float(scores[i])) for i in top]
+
+
+def reciprocal_rank_fusion(result_lists, rrf_k=60):
+    """
+    Fuse ranked id lists with Reciprocal Rank Fusion.
+
+    Args:
+        result_lists (list): Lists of (id, score) pairs, each best first.
+        rrf_k (int): Damping constant; 60 is the value from the original RRF paper.
+
+    Returns:
+        dict: id -> fused score.
+    """
+    fused = {}
+    for results in result_lists:
+        for rank, (doc_id, _) in enumerate(results):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (rrf_k + rank + 1)
+    return fused
+
+
+def weighted_score_fusion(dense, sparse, alpha=0.5):
+    """
+    Fuse dense and sparse scores after min-max normalising each list.
+
+    Args:
+        dense (list): (id, score) pairs from the dense index.
+        sparse (list): (id, score) pairs from BM25.
+        alpha (float): Weight of the dense score; 1 - alpha goes to BM25.
+
+    Returns:
+        dict: id -> fused score.
+    """
+    def normalise(results):
+        if not results:
+            return {}
+        values = [s for _, s in results]
+        low, high = min(values), max(values)
+        span = (high - low) or 1.0
+        return {doc_id: (s - low) / span for doc_id, s in results}
+
+    dense_n, sparse_n = normalise(dense), normalise(sparse)
+    return {
+        doc_id: alpha * dense_n.get(doc_id, 0.0) + (1 - alpha) * sparse_n.get(doc_id, 0.0)
+        for doc_id in dense_n.keys() | sparse_n.keys()
+    }
+
+
+class HybridRetriever:
+    """
+    Pairs a LangChain vector store (FAISS or Chroma) with a local BM25 index.
+
+    All writes go through this class so both indexes stay in sync.
+    """
+
+    def __init__(self, vector_store, fusion="rrf", alpha=0.5, rrf_k=60):
+        """
+        Args:
+            vector_store: A FAISS or Chroma vector store.
+            fusion (str): "rrf" or "weighted".
+            alpha (float): Dense weight for weighted fusion.
+            rrf_k (int): Damping constant for RRF.
+        """
+        if fusion not in ("rrf", "weighted"):
+            raise ValueError(f"Unknown fusion method: {fusion}")
+        self.vector_store = vector_store
+        self.bm25 = BM25Index()
+        self.documents = {}
+        self.fusion = fusion
+        self.alpha = alpha
+        self.rrf_k = rrf_k
+
+    def add_documents(self, documents, ids=None):
+        """
+        Add documents to the dense store and the BM25 index.
+
+        Args:
+            documents (list): Documents to add.
+            ids (list): Optional ids; UUIDs are generated when omitted.
+
+        Returns:
+            list: The ids of the added documents.
+        """
+        ids = ids or [str(uuid4()) for _ in documents]
+        self.vector_store.add_documents(documents=documents, ids=ids)
+        self.bm25.add(ids, [doc.page_content for doc in documents])
+        self.documents.update(zip(ids, documents))
+        return ids
+
+    def delete(self, ids):
+        """
+        Delete documents from both indexes.
+
+        Args:
+            ids (list): Ids of the documents to delete.
+        """
+        self.vector_store.delete(ids=ids)
+        self.bm25.delete(ids)
+        for doc_id in ids:
+            self.documents.pop(doc_id, None)
+
+    def search(self, query, k=4, fetch_k=20, filter=None):
+        """
+        Run dense and BM25 search and fuse the two rankings.
+
+        Args:
+            query (str): Query text.
+            k (int): Number of fused results to return.
+            fetch_k (int): Candidates taken from each index before fusion.
+            filter (dict): Optional metadata filter, applied to both sides.
+
+        Returns:
+            list: (Document, fused score) pairs, best first.
+        """
+        dense = [
+            (doc.id, score)
+            for doc, score in self.vector_store.similarity_search_with_relevance_scores(
+                query, k=fetch_k, filter=filter
+            )
+        ]
+        predicate = None
+        if filter:
+            def predicate(doc_id):
+                metadata = self.documents[doc_id].metadata
+                return all(metadata.get(key) == value for key, value in filter.items())
+        # Filter before the fetch_k cut, so matching documents are not crowded out
+        sparse = self.bm25.search(query, k=fetch_k, predicate=predicate)
+
+        if self.fusion == "rrf":
+            fused = reciprocal_rank_fusion([dense, sparse], rrf_k=self.rrf_k)
+        else:
+            fused = weighted_score_fusion(dense, sparse, alpha=self.alpha)
+        ranked = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(self.documents[doc_id], score) for doc_id, score in ranked if doc_id in self.documents]
+
+
+# Example usage
+if __name__ == "__main__":
+    embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2")
+
+    # Start from an empty FAISS index; the retriever fills both indexes.
+    db = empty_faiss_store(embeddings, dim=768)
+
+    # For Chroma, pass the store instead:
+    # from langchain_chroma import Chroma
+    # db = Chroma(collection_name="hybrid", embedding_function=embeddings, persist_directory="./chroma_langchain_db")
+
+    retriever = HybridRetriever(db, fusion="rrf")
+    ids = retriever.add_documents([
+        Document(page_content="Building an exciting new project with LangChain - come check it out!", metadata={"source": "tweet"}),
+        Document(page_content="Robbers broke into the city bank and stole $1 million in cash.", metadata={"source": "news"}),
+        Document(page_content="The stock market is down 500 points today due to fears of a recession.", metadata={"source": "news"}),
+        Document(page_content="LangGraph is the best framework for building stateful, agentic applications!", metadata={"source": "tweet"}),
+    ])
+
+    for doc, score in retriever.search("LangChain framework", k=2):
+        print(f"* [RRF={score:.4f}] {doc.page_content} [{doc.metadata}]")
+
+    retriever.delete([ids[0]])
+    for doc, score in retriever.search("LangChain framework", k=2, filter={"source": "tweet"}):
+        print(f"* [RRF={score:.4f}] {doc.page_content} [{doc.metadata}]")
@@ -0,0 +1,304 @@
+# Sharded FAISS index across worker processes with scatter-gather search
+# pip install -qU langchain-community langchain-huggingface "faiss-cpu>=1.8" numpy
+
+import hashlib
+import multiprocessing as mp
+import os
+import pickle
+
+import numpy as np
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_core.documents import Document
+
+
+def to_int64_id(doc_id):
+    """Stable 63-bit integer id for a string document id (FAISS ids are int64)."""
+    return int.from_bytes(hashlib.blake2b(str(doc_id).encode("utf-8"), digest_size=8).digest(), "little") >> 1
+
+
+def _shard_worker(conn, dim, metric, path, mmap):
+    """
+    Owns one shard: a FAISS IndexIDMap2 plus the texts/metadata of its documents.
+
+    Runs in its own process, so searches on different shards use different
+    cores without contending for the GIL.
+    """
+    import faiss
+
+    faiss.omp_set_num_threads(1)
+    docstore = {}
+    if path and os.path.exists(path + ".faiss"):
+        # IO_FLAG_MMAP_IFC (faiss >= 1.8) maps the flat vector storage itself;
+        # plain IO_FLAG_MMAP only applies to on-disk IVF lists.
+        flags = faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY if mmap else 0
+        index = faiss.read_index(path + ".faiss", flags)
+        with open(path + ".pkl", "rb") as f:
+            docstore = pickle.load(f)
+    else:
+        flat = faiss.IndexFlatIP(dim) if metric == "ip" else faiss.IndexFlatL2(dim)
+        index = faiss.IndexIDMap2(flat)
+
+    while True:
+        command, payload = conn.recv()
+        if command == "add":
+            int_ids, vectors, records = payload
+            index.add_with_ids(vectors, int_ids)
+            docstore.update(zip(int_ids.tolist(), records))
+            conn.send(index.ntotal)
+        elif command == "delete":
+            int_ids = payload
+            removed = index.remove_ids(int_ids)
+            for i in int_ids.tolist():
+                docstore.pop(i, None)
+            conn.send(removed)
+        elif command == "search":
+            vectors, k = payload
+            scores, ids = index.search(vectors, k)
+            conn.send((scores, ids))
+        elif command == "fetch":
+            conn.send([docstore.get(i) for i in payload])
+        elif command == "save":
+            faiss.write_index(index, payload + ".faiss")
+            with open(payload + ".pkl", "wb") as f:
+                pickle.dump(docstore, f)
+            conn.send(True)
+        elif command == "ntotal":
+            conn.send(index.ntotal)
+        elif command == "close":
+            conn.send(True)
+            return
+
+
+class HashRouter:
+    """Assigns documents to shards by hashing their id; every query goes to every shard."""
+
+    def __init__(self, n_shards):
+        self.n_shards = n_shards
+
+    def shard_for_ids(self, int_ids, vectors=None):
+        return int_ids % self.n_shards
+
+    def shards_for_query(self, vectors):
+        return list(range(self.n_shards))
+
+
+class IVFRouter:
+    """
+    Assigns documents to shards by their nearest coarse centroid.
+
+    Similar vectors end up on the same shard, so a query can be sent only to the
+    shards that own its `nprobe` nearest centroids instead of to all of them.
+    """
+
+    def __init__(self, n_shards, training_vectors, n_centroids=256, nprobe=8, metric="l2"):
+        import faiss
+
+        self.n_shards = n_shards
+        self.nprobe = nprobe
+        kmeans = faiss.Kmeans(training_vectors.shape[1], n_centroids, niter=20, spherical=metric == "ip")
+        kmeans.train(np.ascontiguousarray(training_vectors, dtype=np.float32))
+        self.quantizer = kmeans.index
+        # Balance centroids over shards round-robin
+        self.centroid_to_shard = np.arange(n_centroids) % n_shards
+
+    def shard_for_ids(self, int_ids, vectors):
+        _, centroids = self.quantizer.search(vectors, 1)
+        return self.centroid_to_shard[centroids[:, 0]]
+
+    def shards_for_query(self, vectors):
+        _, centroids = self.quantizer.search(vectors, self.nprobe)
+        return sorted(set(self.centroid_to_shard[centroids.ravel()].tolist()))
+
+    def __getstate__(self):
+        import faiss
+
+        state = self.__dict__.copy()
+        state["quantizer"] = faiss.serialize_index(self.quantizer)
+        return state
+
+    def __setstate__(self, state):
+        import faiss
+
+        state["quantizer"] = faiss.deserialize_index(state["quantizer"])
+        self.__dict__.update(state)
+
+
+class ShardedFAISS:
+    """
+    Coordinator for a FAISS index split over K worker processes.
+
+    Writes are routed to the owning shard; searches are scattered to the relevant
+    shards in parallel and the partial top-k lists are merged here.
+    """
+
+    def __init__(self, embedding, dim, n_shards=None, metric="l2", router=None, folder_path=None, mmap=False):
+        """
+        Args:
+            embedding: LangChain embeddings used for documents and queries.
+            dim (int): Vector dimension (768 for all-mpnet-base-v2).
+            n_shards (int): Number of worker processes (default: CPU count).
+            metric (str): "l2" or "ip".
+            router: HashRouter (default) or IVFRouter.
+            folder_path (str): Load shards from this folder if it holds a saved index.
+            mmap (bool): Memory-map the vectors of saved shards (faiss >= 1.8) instead of
+                loading them into RAM. Mapped shards serve searches only: adds and deletes
+                raise RuntimeError; reopen without mmap to write.
+        """
+        self.embedding = embedding
+        self.metric = metric
+        self.n_shards = n_shards or os.cpu_count()
+        self.mmap = mmap
+        self.router = router or HashRouter(self.n_shards)
+        self.id_to_shard = {}
+        if folder_path and os.path.exists(os.path.join(folder_path, "router.pkl")):
+            with open(os.path.join(folder_path, "router.pkl"), "rb") as f:
+                self.router, self.id_to_shard = pickle.load(f)
+        context = mp.get_context("spawn")
+        self.conns, self.procs = [], []
+        for shard in range(self.n_shards):
+            parent, child = context.Pipe()
+            path = os.path.join(folder_path, f"shard_{shard}") if folder_path else None
+            proc = context.Process(target=_shard_worker, args=(child, dim, metric, path, mmap), daemon=True)
+            proc.start()
+            self.conns.append(parent)
+            self.procs.append(proc)
+
+    def _check_writable(self):
+        if self.mmap:
+            raise RuntimeError("Shards are memory-mapped read-only; reopen with mmap=False to add or delete")
+
+    def _broadcast(self, shards, command, payloads):
+        for shard in shards:
+            self.conns[shard].send((command, payloads[shard]))
+        return {shard: self.conns[shard].recv() for shard in shards}
+
+    def add_vectors(self, vectors, texts, metadatas=None, ids=None):
+        """
+        Add precomputed vectors, routing each to its shard.
+
+        An id that is already stored is replaced: the old copy is removed from the
+        shard that owns it, which is not always the shard the new vector goes to.
+
+        Returns:
+            list: The document ids.
+        """
+        self._check_writable()
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [hashlib.blake2b(t.encode("utf-8"), digest_size=16).hexdigest() for t in texts]
+        last = {doc_id: i for i, doc_id in enumerate(ids)}
+        if len(last) < len(ids):
+            # The same id twice in one batch: keep the last copy
+            keep = sorted(last.values())
+            vectors = vectors[keep]
+            texts, metadatas, ids = [texts[i] for i in keep], [metadatas[i] for i in keep], [ids[i] for i in keep]
+        # IndexIDMap2.add_with_ids does not replace existing ids, so remove them first
+        self.delete([doc_id for doc_id in ids if doc_id in self.id_to_shard])
+        int_ids = np.array([to_int64_id(i) for i in ids], dtype=np.int64)
+        shards = self.router.shard_for_ids(int_ids, vectors)
+        payloads = {}
+        for shard in np.unique(shards).tolist():
+            mask = shards == shard
+            records = [(ids[i], texts[i], metadatas[i]) for i in np.flatnonzero(mask)]
+            payloads[shard] = (int_ids[mask], vectors[mask], records)
+        self._broadcast(list(payloads), "add", payloads)
+        self.id_to_shard.update(zip(ids, shards.tolist()))
+        return ids
+
+    def add_texts(self, texts, metadatas=None, ids=None):
+        """Embed texts in the coordinator and add them to their shards."""
+        return self.add_vectors(self.embedding.embed_documents(texts), texts, metadatas, ids)
+
+    def delete(self, ids):
+        """
+        Delete documents by id from the shards that own them.
+
+        Returns:
+            int: Number of vectors removed.
+        """
+        self._check_writable()
+        by_shard = {}
+        for doc_id in ids:
+            shard = self.id_to_shard.pop(doc_id, None)
+            if shard is not None:
+                by_shard.setdefault(shard, []).append(to_int64_id(doc_id))
+        payloads = {s: np.array(v, dtype=np.int64) for s, v in by_shard.items()}
+        return sum(self._broadcast(list(payloads), "delete", payloads).values())
+
+    def similarity_search_by_vector_with_score(self, vector, k=4):
+        """
+        Scatter one query to the relevant shards, gather and merge their top-k.
+
+        Returns:
+            list: (Document, score) pairs, best first.
+        """
+        query = np.ascontiguousarray([vector], dtype=np.float32)
+        shards = self.router.shards_for_query(query)
+        partial = self._broadcast(shards, "search", {s: (query, k) for s in shards})
+
+        scores = np.concatenate([partial[s][0][0] for s in shards])
+        int_ids = np.concatenate([partial[s][1][0] for s in shards])
+        owner = np.concatenate([np.full(len(partial[s][1][0]), s) for s in shards])
+        valid = int_ids >= 0
+        scores, int_ids, owner = scores[valid], int_ids[valid], owner[valid]
+        order = np.argsort(scores if self.metric == "l2" else -scores)[:k]
+
+        fetch = {}
+        for pos in order:
+            fetch.setdefault(int(owner[pos]), []).append(int(int_ids[pos]))
+        fetched = self._broadcast(list(fetch), "fetch", fetch)
+        records = {i: r for s in fetch for i, r in zip(fetch[s], fetched[s])}
+        results = []
+        for pos in order:
+            doc_id, text, metadata = records[int(int_ids[pos])]
+            results.append((Document(id=doc_id, page_content=text, metadata=metadata), float(scores[pos])))
+        return results
+
+    def similarity_search_with_score(self, query, k=4):
+        """Embed the query and run a scatter-gather search."""
+        return self.similarity_search_by_vector_with_score(self.embedding.embed_query(query), k)
+
+    def similarity_search(self, query, k=4):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    @property
+    def ntotal(self):
+        return sum(self._broadcast(range(self.n_shards), "ntotal", {s: None for s in range(self.n_shards)}).values())
+
+    def save_local(self, folder_path):
+        """Save every shard (written in parallel by the workers) plus the routing table."""
+        os.makedirs(folder_path, exist_ok=True)
+        paths = {s: os.path.join(folder_path, f"shard_{s}") for s in range(self.n_shards)}
+        self._broadcast(range(self.n_shards), "save", paths)
+        with open(os.path.join(folder_path, "router.pkl"), "wb") as f:
+            pickle.dump((self.router, self.id_to_shard), f)
+
+    def close(self):
+        """Stop the worker processes."""
+        self._broadcast(range(self.n_shards), "close", {s: None for s in range(self.n_shards)})
+        for proc in self.procs:
+            proc.join()
+
+
+# Example usage
+if __name__ == "__main__":
+    embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2")
+
+    db = ShardedFAISS(embeddings, dim=768, n_shards=4)
+    ids = db.add_texts(
+        ["foo", "bar", "Building an exciting project with LangChain!", "Robbers stole $1 million from the bank."],
+        metadatas=[{"page": 1}, {"page": 1}, {"page": 2}, {"page": 3}],
+    )
+    print("Vectors:", db.ntotal)
+
+    for doc, score in db.similarity_search_with_score("LangChain project", k=2):
+        print(f"Content: {doc.page_content}, Metadata: {doc.metadata}, Score: {score}")
+
+    db.delete([ids[0]])
+    db.save_local("faiss_sharded_index")
+    db.close()
+
+    # Reopen with memory-mapped, read-only shards for serving
+    db = ShardedFAISS(embeddings, dim=768, n_shards=4, folder_path="faiss_sharded_index", mmap=True)
+    print(db.similarity_search("bank robbery", k=1))
+    db.close()
@@ -0,0 +1,205 @@
+# Parallel, resumable IVF index build using FAISS on-disk inverted lists (CPU only)
+# pip install -qU langchain-community langchain-huggingface "faiss-cpu>=1.7.3" numpy
+
+import json
+import os
+import pickle
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.document_loaders import TextLoader
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+MODEL_NAME = "sentence-transformers/all-mpnet-base-v2"
+
+_worker_embeddings = None
+
+
+def _init_worker(model_name, threads):
+    global _worker_embeddings
+    faiss.omp_set_num_threads(threads)
+    _worker_embeddings = HuggingFaceEmbeddings(model_name=model_name)
+
+
+def _write_atomic(path, write):
+    """Write to a temporary file and rename, so a crash never leaves a half-written file behind."""
+    tmp = path + ".tmp"
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def train_coarse_quantizer(texts, embeddings, folder, factory="IVF4096,Flat", sample_size=100_000, metric=faiss.METRIC_L2):
+    """
+    Step 1: train the IVF coarse quantizer on a random sample and save the empty index.
+
+    Args:
+        texts (list): All chunk texts (only a sample is embedded).
+        embeddings: Embedding model for the sample.
+        folder (str): Build folder.
+        factory (str): faiss index_factory string, e.g. "IVF4096,Flat" or "IVF16384,SQ8".
+        sample_size (int): Training vectors; ~30-256 per list is enough.
+        metric: faiss.METRIC_L2 or faiss.METRIC_INNER_PRODUCT.
+
+    Returns:
+        str: Path of the trained, empty index.
+    """
+    path = os.path.join(folder, "trained.index")
+    if os.path.exists(path):
+        print("Trained index found, skipping training.")
+        return path
+    sample = random.Random(0).sample(texts, min(sample_size, len(texts)))
+    vectors = np.asarray(embeddings.embed_documents(sample), dtype=np.float32)
+    index = faiss.index_factory(vectors.shape[1], factory, metric)
+    index.train(vectors)
+    _write_atomic(path, lambda tmp: faiss.write_index(index, tmp))
+    return path
+
+
+def _dump_pickle(obj, path):
+    with open(path, "wb") as f:
+        pickle.dump(obj, f)
+
+
+def _build_block(block_no, start, texts, metadatas, trained_path, folder):
+    """Step 2 (in a worker): embed one shard and add it to a copy of the trained index."""
+    index = faiss.read_index(trained_path)
+    vectors = np.asarray(_worker_embeddings.embed_documents(texts), dtype=np.float32)
+    # Global positions as ids, so the merged index lines up with LangChain's index_to_docstore_id
+    index.add_with_ids(vectors, np.arange(start, start + len(texts), dtype=np.int64))
+    docs_path = os.path.join(folder, f"block_{block_no}.pkl")
+    _write_atomic(docs_path, lambda tmp: _dump_pickle((start, texts, metadatas), tmp))
+    # The index file is written last: its presence marks the block as complete
+    _write_atomic(os.path.join(folder, f"block_{block_no}.index"), lambda tmp: faiss.write_index(index, tmp))
+    return block_no, len(texts)
+
+
+def build_blocks(documents, trained_path, folder, block_size=500_000, workers=4, threads_per_worker=1):
+    """
+    Step 2: embed and add shards in parallel processes, one block index per shard.
+
+    Blocks that already exist are skipped, so an interrupted build resumes where it stopped.
+
+    Returns:
+        int: Number of blocks.
+    """
+    n_blocks = (len(documents) + block_size - 1) // block_size
+    todo = [b for b in range(n_blocks) if not os.path.exists(os.path.join(folder, f"block_{b}.index"))]
+    print(f"{n_blocks - len(todo)}/{n_blocks} blocks already built.")
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(MODEL_NAME, threads_per_worker)) as pool:
+        futures = []
+        for b in todo:
+            shard = documents[b * block_size:(b + 1) * block_size]
+            futures.append(pool.submit(
+                _build_block, b, b * block_size,
+                [d.page_content for d in shard], [d.metadata for d in shard], trained_path, folder,
+            ))
+        done = n_blocks - len(todo)
+        for future in as_completed(futures):
+            block_no, count = future.result()
+            done += 1
+            print(f"Block {block_no} done ({count} vectors), {done}/{n_blocks}")
+    return n_blocks
+
+
+def merge_blocks(folder, n_blocks):
+    """
+    Step 3: merge the block inverted lists into one on-disk IVF index.
+
+    Block indexes are memory-mapped, and the merged lists are written to a single
+    .ivfdata file, so the merge never needs the whole index in RAM.
+
+    Returns:
+        str: Path of the merged index.
+    """
+    merged_path = os.path.join(folder, "merged.index")
+    if os.path.exists(merged_path):
+        return merged_path
+    index = faiss.read_index(os.path.join(folder, "trained.index"))
+    ivf = faiss.extract_index_ivf(index)
+    block_indexes, invlists = [], faiss.InvertedListsPtrVector()
+    for b in range(n_blocks):
+        block = faiss.read_index(os.path.join(folder, f"block_{b}.index"), faiss.IO_FLAG_MMAP)
+        block_indexes.append(block)  # keep the mmapped blocks alive until the merge is done
+        invlists.push_back(faiss.extract_index_ivf(block).invlists)
+
+    ivfdata = os.path.join(folder, "merged.ivfdata")
+    if os.path.exists(ivfdata):
+        os.remove(ivfdata)  # leftover from an interrupted merge
+    on_disk = faiss.OnDiskInvertedLists(ivf.nlist, ivf.code_size, ivfdata)
+    # Renamed from merge_from to merge_from_multiple after faiss 1.7.4
+    merge = getattr(on_disk, "merge_from_multiple", None) or on_disk.merge_from
+    ntotal = merge(invlists.data(), invlists.size())
+    ivf.ntotal = index.ntotal = ntotal
+    on_disk.this.disown()  # the index owns the lists now; the Python wrapper must not free them too
+    ivf.replace_invlists(on_disk, True)
+    _write_atomic(merged_path, lambda tmp: faiss.write_index(index, tmp))
+    print(f"Merged {ntotal} vectors into {merged_path}")
+    return merged_path
+
+
+def load_as_langchain(folder, n_blocks, embeddings, nprobe=32):
+    """
+    Open the merged index as a regular LangChain FAISS store.
+
+    The inverted lists stay on disk and are paged in by the OS as they are searched.
+
+    Returns:
+        FAISS: The vector store.
+    """
+    index = faiss.read_index(os.path.join(folder, "merged.index"), faiss.IO_FLAG_ONDISK_SAME_DIR)
+    faiss.extract_index_ivf(index).nprobe = nprobe
+    docstore, index_to_docstore_id = {}, {}
+    for b in range(n_blocks):
+        with open(os.path.join(folder, f"block_{b}.pkl"), "rb") as f:
+            start, texts, metadatas = pickle.load(f)
+        for offset, (text, metadata) in enumerate(zip(texts, metadatas)):
+            doc_id = str(start + offset)
+            docstore[doc_id] = Document(id=doc_id, page_content=text, metadata=metadata)
+            index_to_docstore_id[start + offset] = doc_id
+    return FAISS(embeddings, index, InMemoryDocstore(docstore), index_to_docstore_id)
+
+
+def build_ivf_index(documents, folder, factory="IVF4096,Flat", block_size=500_000, workers=4):
+    """
+    Run the full train -> parallel add -> merge pipeline. Safe to re-run after a crash.
+
+    Returns:
+        int: Number of blocks.
+    """
+    os.makedirs(folder, exist_ok=True)
+    manifest = os.path.join(folder, "manifest.json")
+    if os.path.exists(manifest):
+        with open(manifest) as f:
+            saved = json.load(f)
+        if saved != {"factory": factory, "block_size": block_size, "count": len(documents)}:
+            raise ValueError(f"{folder} holds a build with different settings: {saved}")
+    else:
+        with open(manifest, "w") as f:
+            json.dump({"factory": factory, "block_size": block_size, "count": len(documents)}, f)
+
+    trained = train_coarse_quantizer(
+        [d.page_content for d in documents], HuggingFaceEmbeddings(model_name=MODEL_NAME), folder, factory
+    )
+    n_blocks = build_blocks(documents, trained, folder, block_size=block_size, workers=workers)
+    merge_blocks(folder, n_blocks)
+    return n_blocks
+
+
+# Example usage
+if __name__ == "__main__":
+    loader = TextLoader("/content/abc.txt")  # Replace with your file path
+    documents = loader.load()
+    docs = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=0).split_documents(documents)
+
+    # For a small demo corpus use few lists; for tens of millions of vectors use IVF16384 or more.
+    n_blocks = build_ivf_index(docs, "faiss_ivf_build", factory="IVF16,Flat", block_size=1000, workers=2)
+
+    db = load_as_langchain("faiss_ivf_build", n_blocks, HuggingFaceEmbeddings(model_name=MODEL_NAME))
+    for doc in db.similarity_search("What did the president say about Ketanji Brown Jackson", k=2):
+        print(f"Text: {doc.page_content}")
@@ -0,0 +1,201 @@
+# Tombstone deletes and background compaction for a FAISS vector store
+# pip install -qU langchain-community langchain-huggingface faiss-cpu numpy
+
+import threading
+import time
+from uuid import uuid4
+
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+
+class CompactingFAISS:
+    """
+    Wraps a LangChain FAISS store so deletes are cheap and compaction happens in the background.
+
+    `delete` only records a tombstone; searches over-fetch and drop tombstoned hits.
+    When tombstones exceed `threshold` of the index, a background thread rebuilds a
+    compact index from the live vectors (no re-embedding) and swaps it in. Readers
+    never wait for the rebuild. Writes made while it runs are replayed onto the new
+    index before the swap.
+
+    The store and its tombstones are published together as one immutable
+    (db, tombstones) snapshot, and each search reads it once, so a search never
+    pairs a store with the tombstones of another.
+    """
+
+    def __init__(self, db, threshold=0.2, check_interval=5.0, min_deleted=1000):
+        """
+        Args:
+            db (FAISS): The LangChain FAISS store to manage.
+            threshold (float): Deleted fraction that triggers compaction.
+            check_interval (float): Seconds between background checks.
+            min_deleted (int): Do not compact for fewer tombstones than this.
+        """
+        self._state = (db, frozenset())
+        self.threshold = threshold
+        self.min_deleted = min_deleted
+        self.compactions = 0
+        self._write_lock = threading.Lock()
+        self._pending_adds = None  # ids added while a compaction is running
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(check_interval,), daemon=True)
+        self._thread.start()
+
+    @property
+    def db(self):
+        return self._state[0]
+
+    @property
+    def tombstones(self):
+        return self._state[1]
+
+    @property
+    def deleted_fraction(self):
+        db, dead = self._state
+        total = db.index.ntotal
+        return len(dead) / total if total else 0.0
+
+    @staticmethod
+    def _copy(db):
+        """A private copy of the store that writers can change while readers use the original."""
+        ids = list(db.index_to_docstore_id.values())
+        return FAISS(
+            db.embedding_function, faiss.clone_index(db.index),
+            InMemoryDocstore({doc_id: db.docstore.search(doc_id) for doc_id in ids}), dict(db.index_to_docstore_id),
+            distance_strategy=db.distance_strategy, normalize_L2=db._normalize_L2,
+        )
+
+    @staticmethod
+    def _append(db, ids, vectors, documents):
+        """Append rows; docstore entries go in before the vectors, so a search can resolve every hit."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if db._normalize_L2:
+            faiss.normalize_L2(vectors)
+        start = db.index.ntotal
+        db.docstore.add({
+            doc_id: Document(id=doc_id, page_content=doc.page_content, metadata=doc.metadata)
+            for doc_id, doc in zip(ids, documents)
+        })
+        db.index_to_docstore_id.update(zip(range(start, start + len(ids)), ids))
+        db.index.add(vectors)
+
+    def add_documents(self, documents, ids=None):
+        """
+        Add documents. An id that is already stored, live or tombstoned, is replaced.
+
+        New rows are appended to the published store. Replacing rows renumbers the
+        index, so that is done on a copy, which is then published in place of the old one.
+
+        Returns:
+            list: The ids of the added documents.
+        """
+        ids = list(ids) if ids else [doc.id or str(uuid4()) for doc in documents]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Duplicate ids in one batch")
+        vectors = self.db._embed_documents([doc.page_content for doc in documents])
+        with self._write_lock:
+            db, dead = self._state
+            replaced = [doc_id for doc_id in ids if isinstance(db.docstore.search(doc_id), Document)]
+            if replaced:
+                db = self._copy(db)
+                db.delete(replaced)
+            self._append(db, ids, vectors, documents)
+            if self._pending_adds is not None:
+                self._pending_adds.extend(ids)
+            self._state = (db, dead.difference(ids))
+        return ids
+
+    def delete(self, ids):
+        """Tombstone documents; their vectors are removed at the next compaction."""
+        with self._write_lock:
+            db, dead = self._state
+            # InMemoryDocstore.search returns a message string for unknown ids
+            self._state = (db, dead.union(i for i in ids if isinstance(db.docstore.search(i), Document)))
+
+    def similarity_search_with_score(self, query, k=4, **kwargs):
+        db, dead = self._state  # one consistent snapshot for this query
+        fetch = k + min(len(dead), 4 * k) if dead else k
+        while True:
+            hits = db.similarity_search_with_score(query, k=fetch, **kwargs)
+            live = [(doc, score) for doc, score in hits if doc.id not in dead]
+            if len(live) >= k or len(hits) < fetch:
+                return live[:k]
+            fetch *= 2
+
+    def similarity_search(self, query, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k, **kwargs)]
+
+    def compact(self):
+        """Rebuild the index without tombstoned vectors and swap it in atomically."""
+        with self._write_lock:
+            # Copy the live rows while writers are blocked; the index is built from the copy
+            old, dead = self._state
+            self._pending_adds = []
+            live = [(p, doc_id) for p, doc_id in sorted(old.index_to_docstore_id.items()) if doc_id not in dead]
+            ids = [doc_id for _, doc_id in live]
+            positions = np.array([p for p, _ in live], dtype=np.int64)
+            vectors = old.index.reconstruct_batch(positions) if live else None
+            docs = {doc_id: old.docstore.search(doc_id) for doc_id in ids}
+            index = faiss.clone_index(old.index)
+        index.reset()  # keeps IVF training, drops the vectors
+
+        new = self._rebuild(old, index, ids, vectors, docs)
+
+        with self._write_lock:
+            # Replay what happened while rebuilding: new documents, then new tombstones.
+            # They are read from the current store, which a re-add may have replaced.
+            current, dead = self._state
+            current_pos = {doc_id: p for p, doc_id in current.index_to_docstore_id.items()}
+            added = [doc_id for doc_id in dict.fromkeys(self._pending_adds) if doc_id in current_pos]
+            if added:
+                replaced = [doc_id for doc_id in added if doc_id in docs]
+                if replaced:
+                    new.delete(replaced)  # the copied row was overwritten by a re-add
+                vectors = current.index.reconstruct_batch(np.array([current_pos[doc_id] for doc_id in added], dtype=np.int64))
+                self._append(new, added, vectors, [current.docstore.search(doc_id) for doc_id in added])
+            kept = set(new.index_to_docstore_id.values())
+            self._state = (new, frozenset(doc_id for doc_id in dead if doc_id in kept))
+            self._pending_adds = None
+            self.compactions += 1
+
+    @staticmethod
+    def _rebuild(old, index, ids, vectors, docs):
+        if vectors is not None:
+            index.add(vectors)
+        return FAISS(
+            old.embedding_function, index, InMemoryDocstore(dict(docs)), dict(enumerate(ids)),
+            distance_strategy=old.distance_strategy, normalize_L2=old._normalize_L2,
+        )
+
+    def _run(self, interval):
+        while not self._stop.wait(interval):
+            if len(self.tombstones) >= self.min_deleted and self.deleted_fraction > self.threshold:
+                start = time.perf_counter()
+                self.compact()
+                print(f"Compacted FAISS index in {time.perf_counter() - start:.2f}s ({self.db.index.ntotal} live vectors)")
+
+    def close(self):
+        """Stop the background thread."""
+        self._stop.set()
+        self._thread.join()
+
+
+# Example usage
+if __name__ == "__main__":
+    embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2")
+    db = FAISS.from_texts([f"document number {i}" for i in range(100)], embeddings)
+
+    store = CompactingFAISS(db, threshold=0.2, check_interval=1.0, min_deleted=10)
+    doomed = list(db.index_to_docstore_id.values())[:30]
+    store.delete(doomed)
+    print(f"Deleted fraction: {store.deleted_fraction:.2f}")
+    print(store.similarity_search("document number 5", k=2))
+
+    time.sleep(2)  # let the background thread compact
+    print(f"Vectors after compaction: {store.db.index.ntotal}, compactions: {store.compactions}")
+    store.close()
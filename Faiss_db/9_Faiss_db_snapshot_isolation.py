@@ -0,0 +1,209 @@
+# Snapshot-isolated FAISS store: lock-free reads, delta writes, RCU-style merges
+# pip install -qU langchain-community langchain-huggingface faiss-cpu numpy
+
+import threading
+import time
+from uuid import uuid4
+
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+
+class Snapshot:
+    """
+    An immutable view of the store: a base FAISS index, a small delta and tombstones.
+
+    Nothing in a published snapshot is ever modified, so readers need no locks.
+    """
+
+    __slots__ = ("base", "delta_vectors", "delta_ids", "delta_docs", "tombstones", "version")
+
+    def __init__(self, base, delta_vectors, delta_ids, delta_docs, tombstones, version):
+        self.base = base
+        self.delta_vectors = delta_vectors
+        self.delta_ids = delta_ids
+        self.delta_docs = delta_docs
+        self.tombstones = tombstones
+        self.version = version
+
+
+class SnapshotFAISS:
+    """
+    FAISS store for serving while ingesting.
+
+    Each write batch builds a new snapshot: the batch is appended to a copy of the
+    small delta (copy-on-write), and the snapshot is published with one reference
+    assignment. A search therefore sees either all of a batch or none of it.
+    A background merge folds the delta and tombstones into a new base index off to
+    the side, then publishes it the same way. Only writers take a lock.
+    """
+
+    def __init__(self, base, merge_threshold=10_000, merge_interval=10.0):
+        """
+        Args:
+            base (FAISS): Initial LangChain FAISS store (L2 distance).
+            merge_threshold (int): Delta size (vectors + tombstones) that triggers a merge.
+            merge_interval (float): Seconds between background merge checks.
+        """
+        self.embedding = base.embedding_function
+        dim = base.index.d
+        self._snapshot = Snapshot(base, np.empty((0, dim), dtype=np.float32), (), (), frozenset(), 0)
+        self.merge_threshold = merge_threshold
+        self._write_lock = threading.Lock()
+        self._merge_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(merge_interval,), daemon=True)
+        self._thread.start()
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    # ---- Writes ----
+
+    def add_documents(self, documents, ids=None):
+        """Embed outside the lock, then publish a snapshot containing the whole batch."""
+        ids = ids or [str(uuid4()) for _ in documents]
+        vectors = np.asarray(self.embedding.embed_documents([d.page_content for d in documents]), dtype=np.float32)
+        docs = tuple(Document(id=i, page_content=d.page_content, metadata=d.metadata) for i, d in zip(ids, documents))
+        with self._write_lock:
+            snap = self._snapshot
+            self._snapshot = Snapshot(
+                snap.base,
+                np.vstack([snap.delta_vectors, vectors]),
+                snap.delta_ids + tuple(ids),
+                snap.delta_docs + docs,
+                snap.tombstones - set(ids),
+                snap.version + 1,
+            )
+        return ids
+
+    def delete(self, ids):
+        with self._write_lock:
+            snap = self._snapshot
+            self._snapshot = Snapshot(
+                snap.base, snap.delta_vectors, snap.delta_ids, snap.delta_docs,
+                snap.tombstones | set(ids), snap.version + 1,
+            )
+
+    # ---- Reads ----
+
+    def similarity_search_with_score_by_vector(self, embedding, k=4):
+        snap = self._snapshot  # everything below reads this one snapshot
+        query = np.asarray(embedding, dtype=np.float32)
+        dead = snap.tombstones
+        # Ids rewritten in the delta shadow their older base copy
+        shadowed = dead.union(snap.delta_ids)
+        fetch = k + len(shadowed)
+        results = []
+        if snap.base.index.ntotal:
+            for doc, score in snap.base.similarity_search_with_score_by_vector(query, k=fetch):
+                if doc.id not in shadowed:
+                    results.append((doc, float(score)))
+        if len(snap.delta_ids):
+            # Only the newest delta copy of an id that was written more than once is live
+            newest = {doc_id: pos for pos, doc_id in enumerate(snap.delta_ids)}
+            distances = ((snap.delta_vectors - query) ** 2).sum(axis=1)
+            order = np.argsort(distances)[:fetch]
+            results.extend(
+                (snap.delta_docs[pos], float(distances[pos]))
+                for pos in order
+                if snap.delta_ids[pos] not in dead and newest[snap.delta_ids[pos]] == pos
+            )
+        results.sort(key=lambda item: item[1])
+        return results[:k]
+
+    def similarity_search_with_score(self, query, k=4):
+        return self.similarity_search_with_score_by_vector(self.embedding.embed_query(query), k)
+
+    def similarity_search(self, query, k=4):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    # ---- Merge ----
+
+    def merge(self):
+        """Fold the delta and tombstones into a new base index and publish it."""
+        with self._merge_lock:
+            snap = self._snapshot
+            new_base = self._build_base(snap)
+            with self._write_lock:
+                current = self._snapshot
+                # Keep only what was written after `snap` was taken
+                n_merged = len(snap.delta_ids)
+                delta_ids = current.delta_ids[n_merged:]
+                # Tombstones carry forward; only those matching nothing in the new base or delta are dropped
+                live = set(new_base.index_to_docstore_id.values()).union(delta_ids)
+                self._snapshot = Snapshot(
+                    new_base,
+                    current.delta_vectors[n_merged:],
+                    delta_ids,
+                    current.delta_docs[n_merged:],
+                    frozenset(current.tombstones & live),
+                    current.version + 1,
+                )
+
+    @staticmethod
+    def _build_base(snap):
+        base, dead = snap.base, snap.tombstones
+        overridden = set(snap.delta_ids)
+        keep = [
+            p for p, doc_id in base.index_to_docstore_id.items()
+            if doc_id not in dead and doc_id not in overridden
+        ]
+        # Later delta entries win over earlier ones with the same id
+        last_pos = {doc_id: pos for pos, doc_id in enumerate(snap.delta_ids)}
+        delta_keep = [pos for doc_id, pos in last_pos.items() if doc_id not in dead]
+
+        index = faiss.clone_index(base.index)
+        index.reset()
+        parts = []
+        if keep:
+            parts.append(np.vstack([base.index.reconstruct(p) for p in keep]))
+        if delta_keep:
+            parts.append(snap.delta_vectors[delta_keep])
+        if parts:
+            index.add(np.vstack(parts))
+
+        ids = [base.index_to_docstore_id[p] for p in keep] + [snap.delta_ids[p] for p in delta_keep]
+        docs = [base.docstore.search(base.index_to_docstore_id[p]) for p in keep] + [snap.delta_docs[p] for p in delta_keep]
+        return FAISS(
+            base.embedding_function, index, InMemoryDocstore(dict(zip(ids, docs))), dict(enumerate(ids)),
+            distance_strategy=base.distance_strategy,
+        )
+
+    def _run(self, interval):
+        while not self._stop.wait(interval):
+            snap = self._snapshot
+            if len(snap.delta_ids) + len(snap.tombstones) >= self.merge_threshold:
+                start = time.perf_counter()
+                self.merge()
+                print(f"Published snapshot v{self._snapshot.version} in {time.perf_counter() - start:.2f}s")
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
+
+# Example usage
+if __name__ == "__main__":
+    from concurrent.futures import ThreadPoolExecutor
+
+    embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2")
+    base = FAISS.from_texts(["foo", "bar"], embeddings)
+    store = SnapshotFAISS(base, merge_threshold=4, merge_interval=0.5)
+
+    # Searches keep running while a writer ingests batches
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        writer = pool.submit(lambda: [store.add_documents([Document(page_content=f"batch {b} doc {i}") for i in range(3)]) for b in range(5)])
+        readers = [pool.submit(store.similarity_search, "batch 2", 2) for _ in range(20)]
+        writer.result()
+        print(readers[-1].result())
+
+    time.sleep(1)  # let the background merge publish a new base
+    snap = store.snapshot
+    print(f"Snapshot v{snap.version}: base={snap.base.index.ntotal}, delta={len(snap.delta_ids)}")
+    store.close()
@@ -0,0 +1,24 @@
+# faiss_utils.py
+# Helpers shared by the FAISS scripts in this folder and in Cross_backend.
+
+import faiss
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+
+
+def empty_faiss_store(embeddings, dim, **kwargs):
+    """
+    Create an empty LangChain FAISS store backed by a flat L2 index.
+
+    FAISS.from_texts needs at least one text, so this builds the store directly
+    instead of embedding a throwaway document and deleting it.
+
+    Args:
+        embeddings: The embeddings model used for queries and later adds.
+        dim (int): Vector dimension (768 for all-mpnet-base-v2).
+        **kwargs: Passed to FAISS, e.g. normalize_L2=True.
+
+    Returns:
+        FAISS: A store with no vectors.
+    """
+    return FAISS(embeddings, faiss.IndexFlatL2(dim), InMemoryDocstore(), {}, **kwargs)
@@ -0,0 +1,170 @@
+# Tests for the FAISS scripts.
+#
+# They use small random vectors and a hash-based fake embedder, so no model is
+# downloaded:
+#   python -m pytest Faiss_db/tests
+
+import hashlib
+import importlib
+import importlib.util
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+faiss = pytest.importorskip("faiss")
+pytest.importorskip("langchain_community")
+
+from langchain_core.documents import Document  # noqa: E402
+from langchain_core.embeddings import Embeddings  # noqa: E402
+
+FAISS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIM = 8
+
+
+def load_script(filename):
+    """Import a numbered script from the Faiss_db folder as a module."""
+    spec = importlib.util.spec_from_file_location(filename[:-3], os.path.join(FAISS_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class HashEmbeddings(Embeddings):
+    """Deterministic small vectors, so the tests do not download a model."""
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return [b / 255.0 + 0.01 for b in digest[:DIM]]
+
+
+# ---- 5: hybrid search ----
+
+@pytest.fixture
+def hybrid(monkeypatch):
+    monkeypatch.syspath_prepend(FAISS_DIR)  # for faiss_utils
+    return load_script("5_Faiss_db_hybrid_search.py")
+
+
+def test_bm25_search_handles_non_positive_k(hybrid):
+    index = hybrid.BM25Index()
+    index.add(["a", "b"], ["red apple", "green apple"])
+    assert index.search("apple", k=0) == []
+    assert index.search("apple", k=-1) == []
+    assert [doc_id for doc_id, _ in index.search("apple", k=5)] == ["a", "b"]
+
+
+def test_hybrid_filter_applies_before_the_fetch_k_cut(hybrid):
+    retriever = hybrid.HybridRetriever(hybrid.empty_faiss_store(HashEmbeddings(), dim=DIM))
+    # Ten strong keyword matches outside the filter and one weak match inside it
+    documents = [Document(page_content="apple apple apple", metadata={"page": 1}) for _ in range(10)]
+    documents.append(Document(page_content="apple pie with cream and sugar", metadata={"page": 2}))
+    ids = retriever.add_documents(documents)
+
+    sparse = retriever.bm25.search("apple", k=3, predicate=lambda doc_id: doc_id == ids[-1])
+    assert [doc_id for doc_id, _ in sparse] == [ids[-1]]
+    results = retriever.search("apple", k=2, fetch_k=3, filter={"page": 2})
+    assert [doc.page_content for doc, _ in results] == ["apple pie with cream and sugar"]
+
+
+# ---- 7: parallel IVF build ----
+
+def test_merge_blocks_into_on_disk_index(tmp_path, monkeypatch):
+    ivf_build = load_script("7_Faiss_db_parallel_ivf_build.py")
+    embeddings = HashEmbeddings()
+    monkeypatch.setattr(ivf_build, "_worker_embeddings", embeddings)
+    folder = str(tmp_path)
+    texts = [f"text {i}" for i in range(300)]
+
+    trained = ivf_build.train_coarse_quantizer(texts, embeddings, folder, factory="IVF4,Flat")
+    # Build the blocks in this process, as a worker would
+    for b in range(3):
+        ivf_build._build_block(b, b * 100, texts[b * 100:(b + 1) * 100], [{"block": b}] * 100, trained, folder)
+    merged = ivf_build.merge_blocks(folder, 3)
+    assert os.path.exists(merged)
+
+    db = ivf_build.load_as_langchain(folder, 3, embeddings, nprobe=4)
+    assert db.index.ntotal == 300
+    doc = db.similarity_search("text 150", k=1)[0]
+    assert doc.page_content == "text 150"
+    assert doc.metadata == {"block": 1}
+
+
+# ---- 6: sharded index ----
+
+@pytest.fixture
+def sharded(monkeypatch):
+    # Spawned shard workers import the script by name, so it must be on sys.path
+    monkeypatch.syspath_prepend(FAISS_DIR)
+    return importlib.import_module("6_Faiss_db_sharded_index")
+
+
+def test_sharded_re_add_replaces_existing_id(sharded):
+    rng = np.random.default_rng(0)
+    vectors = rng.random((3, DIM), dtype=np.float32)
+    training = rng.random((64, DIM), dtype=np.float32)
+    router = sharded.IVFRouter(2, training, n_centroids=4, nprobe=4)
+    db = sharded.ShardedFAISS(HashEmbeddings(), dim=DIM, n_shards=2, router=router)
+    try:
+        db.add_vectors(vectors, ["a1", "b", "c"], ids=["1", "2", "3"])
+        # The new vector sits next to another centroid, so it may move to the other shard
+        db.add_vectors(vectors[2:3] + 0.001, ["a2"], ids=["1"])
+        assert db.ntotal == 3
+        results = db.similarity_search_by_vector_with_score(vectors[2], k=3)
+        assert sorted(doc.id for doc, _ in results) == ["1", "2", "3"]
+        assert [doc.page_content for doc, _ in results if doc.id == "1"] == ["a2"]
+
+        # Default ids hash the text, so adding the same text twice keeps one copy
+        db.add_vectors(vectors[:2], ["same", "same"])
+        assert db.ntotal == 4
+    finally:
+        db.close()
+
+
+# ---- 8: compaction ----
+
+def test_compaction_drops_tombstones_and_keeps_re_adds():
+    compaction = load_script("8_Faiss_db_compaction.py")
+    from langchain_community.vectorstores import FAISS
+
+    embeddings = HashEmbeddings()
+    db = FAISS.from_texts([f"doc {i}" for i in range(20)], embeddings, ids=[str(i) for i in range(20)])
+    store = compaction.CompactingFAISS(db, check_interval=3600)
+    try:
+        store.delete([str(i) for i in range(10)])
+        before, dead = store._state
+        store.add_documents([Document(page_content="doc 3, again")], ids=["3"])
+        # The re-add went to a copy; the snapshot searches were using is unchanged
+        assert before.index.ntotal == 20 and "3" in dead
+        assert "3" not in store.tombstones
+
+        store.compact()
+        assert store.db.index.ntotal == 11
+        assert store.tombstones == frozenset()
+        assert store.similarity_search("doc 3, again", k=1)[0].id == "3"
+        assert {doc.id for doc in store.similarity_search("doc 4", k=20)} == {"3"} | {str(i) for i in range(10, 20)}
+    finally:
+        store.close()
+
+
+# ---- 10: write-ahead log ----
+
+def test_wal_rejects_duplicate_ids_before_logging(tmp_path):
+    wal = load_script("10_Faiss_db_write_ahead_log.py")
+    embeddings = HashEmbeddings()
+    store = wal.DurableFAISS(str(tmp_path), embeddings, commit_delay=0)
+    store.add_documents([Document(page_content="a"), Document(page_content="b")], ids=["1", "2"])
+    with pytest.raises(ValueError):
+        store.add_documents([Document(page_content="c"), Document(page_content="d")], ids=["3", "3"])
+    # Re-adding a stored id replaces it
+    store.add_documents([Document(page_content="a2")], ids=["1"])
+    store.delete(["2", "2"])
+    store.wal.close()  # crash: nothing checkpointed, everything replayed from the log
+
+    reopened = wal.DurableFAISS(str(tmp_path), embeddings, commit_delay=0)
+    assert sorted(reopened.db.index_to_docstore_id.values()) == ["1"]
+    assert reopened.similarity_search("a2", k=1)[0].page_content == "a2"
+    reopened.close()
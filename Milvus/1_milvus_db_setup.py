@@ -14,9 +14,18 @@ embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-b
 # Step 2: Set up the Milvus vector store
 # If you have a Milvus server, use its URI, otherwise, Milvus Lite will store everything in a local file.
 URI = "./milvus_example.db"
+
+# Choose the index and its search parameters explicitly instead of relying on the defaults.
+# Milvus Lite always uses a FLAT index; HNSW takes effect on a Milvus server.
+# See 4_milvus_db_bulk_insert_and_index.py for IVF_FLAT / IVF_SQ8 presets and building the index after a bulk load.
+INDEX_PARAMS = {"index_type": "HNSW", "metric_type": "L2", "params": {"M": 16, "efConstruction": 200}}
+SEARCH_PARAMS = {"metric_type": "L2", "params": {"ef": 64}}  # ef >= k; higher is more accurate and slower
+
 vector_store = Milvus(
     embedding_function=embeddings,
     connection_args={"uri": URI},
+    index_params=INDEX_PARAMS,
+    search_params=SEARCH_PARAMS,
 )
 
 # Step 3: Create documents with content and metadata
@@ -13,6 +13,11 @@ embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-b
 # Using Milvus Lite where everything is stored in a local file. If you have a Milvus server, you can use its URI.
 URI = "./milvus_example.db"
 
+# Index and search parameters work together with the partition key.
+# Milvus Lite always uses a FLAT index; HNSW takes effect on a Milvus server.
+INDEX_PARAMS = {"index_type": "HNSW", "metric_type": "L2", "params": {"M": 16, "efConstruction": 200}}
+SEARCH_PARAMS = {"metric_type": "L2", "params": {"ef": 64}}
+
 # Step 3: Create documents with content and metadata
 # The 'namespace' field in metadata will be used as the partition key.
 docs = [
@@ -29,6 +34,8 @@ vectorstore = Milvus.from_documents(
     connection_args={"uri": URI},
     drop_old=True,  # Drop old data if it exists in the same collection
     partition_key_field="namespace",  # Use the 'namespace' field for partitioning
+    index_params=INDEX_PARAMS,
+    search_params=SEARCH_PARAMS,
 )
 
 # Step 5: Retrieve documents from a specific partition
@@ -0,0 +1,125 @@
+# %pip install -qU langchain-community langchain_milvus pymilvus
+
+# Import necessary libraries
+import time
+from uuid import uuid4
+
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_core.documents import Document
+from langchain_milvus import Milvus
+from pymilvus import DataType, MilvusClient
+
+# Index presets: index type, metric and build parameters
+INDEX_PRESETS = {
+    "HNSW": {"index_type": "HNSW", "params": {"M": 16, "efConstruction": 200}},
+    "IVF_FLAT": {"index_type": "IVF_FLAT", "params": {"nlist": 1024}},
+    "IVF_SQ8": {"index_type": "IVF_SQ8", "params": {"nlist": 1024}},
+}
+
+
+def create_collection_without_index(client, collection_name, dim=768, drop_old=True):
+    """
+    Create a collection with the same field names langchain_milvus uses (pk, text, vector),
+    but without an index, so inserts do not trigger incremental index builds.
+    """
+    if drop_old and client.has_collection(collection_name):
+        client.drop_collection(collection_name)
+    schema = MilvusClient.create_schema(auto_id=False, enable_dynamic_field=True)  # metadata goes in dynamic fields
+    schema.add_field("pk", DataType.VARCHAR, is_primary=True, max_length=64)
+    schema.add_field("text", DataType.VARCHAR, max_length=65_535)
+    schema.add_field("vector", DataType.FLOAT_VECTOR, dim=dim)
+    client.create_collection(collection_name, schema=schema)
+
+
+def bulk_insert(client, collection_name, documents, embeddings, batch_size=10_000):
+    """
+    Embed and insert documents in large batches, then flush once.
+
+    Returns:
+        dict: Timings in seconds.
+    """
+    timings = {"embed": 0.0, "insert": 0.0}
+    for start in range(0, len(documents), batch_size):
+        batch = documents[start:start + batch_size]
+        t0 = time.perf_counter()
+        vectors = embeddings.embed_documents([doc.page_content for doc in batch])
+        t1 = time.perf_counter()
+        rows = [
+            {**doc.metadata, "pk": str(uuid4()), "text": doc.page_content, "vector": vector}  # metadata cannot overwrite these
+            for doc, vector in zip(batch, vectors)
+        ]
+        client.insert(collection_name, rows)
+        timings["embed"] += t1 - t0
+        timings["insert"] += time.perf_counter() - t1
+
+    t0 = time.perf_counter()
+    client.flush(collection_name)  # seal all segments once, instead of once per small insert
+    timings["flush"] = time.perf_counter() - t0
+    return timings
+
+
+def build_index(client, collection_name, index="HNSW", metric_type="COSINE", params=None):
+    """
+    Build the vector index once, after all data is loaded, then load the collection for search.
+
+    Returns:
+        dict: Timings in seconds.
+    """
+    preset = INDEX_PRESETS[index]
+    index_params = client.prepare_index_params()
+    index_params.add_index(
+        field_name="vector",
+        index_type=preset["index_type"],
+        metric_type=metric_type,
+        params=params or preset["params"],
+    )
+    t0 = time.perf_counter()
+    client.create_index(collection_name, index_params)
+    t1 = time.perf_counter()
+    client.load_collection(collection_name)
+    return {"index": t1 - t0, "load": time.perf_counter() - t1}
+
+
+# Step 1: Initialize the embedding model
+embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2")
+
+# Step 2: Connect to Milvus
+# Milvus Lite stores everything in a local file. Note that Milvus Lite always uses a FLAT index;
+# the index type below takes effect on a Milvus server (use its URI, e.g. "http://localhost:19530").
+URI = "./milvus_example.db"
+collection_name = "bulk_collection"
+client = MilvusClient(uri=URI)
+
+# Step 3: Prepare documents
+documents = [
+    Document(page_content="I had chocolate chip pancakes and scrambled eggs for breakfast this morning.", metadata={"source": "tweet"}),
+    Document(page_content="The weather forecast for tomorrow is cloudy and overcast, with a high of 62 degrees.", metadata={"source": "news"}),
+    Document(page_content="Building an exciting new project with LangChain - come check it out!", metadata={"source": "tweet"}),
+]
+
+# Step 4: Create the collection, bulk insert, flush once, then build the index
+create_collection_without_index(client, collection_name)
+timings = bulk_insert(client, collection_name, documents, embeddings)
+timings.update(build_index(client, collection_name, index="HNSW", metric_type="COSINE"))
+print("Timings (s):", {name: round(seconds, 3) for name, seconds in timings.items()})
+
+# Step 5: Search through langchain_milvus with explicit search parameters
+vector_store = Milvus(
+    embedding_function=embeddings,
+    connection_args={"uri": URI},
+    collection_name=collection_name,
+    search_params={"metric_type": "COSINE", "params": {"ef": 64}},
+)
+results = vector_store.similarity_search("LangChain provides abstractions to make working with LLMs easy", k=2)
+for res in results:
+    print(f"* {res.page_content} [{res.metadata}]")
+
+# Alternatively, choose the index when langchain_milvus creates the collection:
+# vector_store = Milvus.from_documents(
+#     documents,
+#     embeddings,
+#     connection_args={"uri": URI},
+#     index_params={"index_type": "IVF_SQ8", "metric_type": "L2", "params": {"nlist": 1024}},
+#     search_params={"metric_type": "L2", "params": {"nprobe": 16}},
+#     drop_old=True,
+# )
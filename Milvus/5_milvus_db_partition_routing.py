@@ -0,0 +1,265 @@
+# %pip install -qU langchain-community langchain_milvus pymilvus
+
+# Import necessary libraries
+import hashlib
+import json
+from uuid import uuid4
+
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_core.documents import Document
+from pymilvus import DataType, MilvusClient
+
+# Metrics where a larger distance means a better match
+HIGHER_IS_BETTER = {"COSINE", "IP"}
+
+# Milvus allows at most 1024 partitions per collection by default
+# (rootCoord.maxPartitionNum, at most 4096), including "_default".
+MAX_PARTITIONS = 1024
+
+
+def partition_name(namespace, n_partitions=None):
+    """
+    Map a namespace to a valid Milvus partition name.
+
+    The name is a hash of the namespace, so two different namespaces never share a
+    partition (replacing invalid characters would map "a.b" and "a-b" to the same one).
+    With n_partitions, namespaces are hashed into that many shared partitions instead.
+    """
+    digest = hashlib.sha1(str(namespace).encode("utf-8")).hexdigest()
+    if n_partitions:
+        return f"ns_bucket_{int(digest, 16) % n_partitions}"
+    return "ns_" + digest
+
+
+class PartitionRouter:
+    """
+    Routes each request to the partitions its context may see.
+
+    Every namespace (user or tenant) gets its own named partition, so a search
+    only touches that partition's segments instead of filtering every segment
+    with an expression. A request that spans several namespaces searches all of
+    their partitions in one call.
+
+    A collection holds at most MAX_PARTITIONS partitions. For more namespaces than
+    that, pass n_partitions: namespaces are hashed into that many shared partitions,
+    and searches also filter on the namespace field.
+    """
+
+    def __init__(self, client, collection_name, embeddings, metric_type="COSINE", n_partitions=None):
+        """
+        Args:
+            client (MilvusClient): The Milvus client.
+            collection_name (str): Collection holding pk, text, namespace and vector fields.
+            embeddings (HuggingFaceEmbeddings): The embeddings used for queries and documents.
+            metric_type (str): Metric of the collection's vector index.
+            n_partitions (int): Hash namespaces into this many partitions (None: one partition per namespace).
+        """
+        if n_partitions is not None and not 0 < n_partitions < MAX_PARTITIONS:
+            raise ValueError(f"n_partitions must be between 1 and {MAX_PARTITIONS - 1}")
+        self.client = client
+        self.collection_name = collection_name
+        self.embeddings = embeddings
+        self.metric_type = metric_type
+        self.n_partitions = n_partitions
+        self._partitions = set(client.list_partitions(collection_name))
+
+    def ensure_partition(self, namespace):
+        """
+        Create the partition for a namespace if it does not exist yet.
+
+        Raises:
+            RuntimeError: If the collection already holds MAX_PARTITIONS partitions.
+        """
+        name = partition_name(namespace, self.n_partitions)
+        if name not in self._partitions:
+            if len(self._partitions) >= MAX_PARTITIONS:
+                raise RuntimeError(
+                    f"{self.collection_name} has {len(self._partitions)} partitions, the Milvus limit; "
+                    "use n_partitions to share partitions between namespaces"
+                )
+            if not self.client.has_partition(self.collection_name, name):
+                self.client.create_partition(self.collection_name, name)
+            self._partitions.add(name)
+        return name
+
+    def add_documents(self, documents, namespace_key="namespace"):
+        """
+        Insert documents into the partition of their namespace.
+
+        Args:
+            documents (list): Documents whose metadata holds the namespace.
+            namespace_key (str): Metadata key with the namespace.
+
+        Returns:
+            list: Ids of the inserted documents.
+        """
+        groups = {}
+        for doc in documents:
+            groups.setdefault(doc.metadata[namespace_key], []).append(doc)
+        ids = []
+        for namespace, docs in groups.items():
+            vectors = self.embeddings.embed_documents([doc.page_content for doc in docs])
+            rows = [
+                {**doc.metadata, "pk": str(uuid4()), "text": doc.page_content, "vector": vector, "namespace": str(namespace)}
+                for doc, vector in zip(docs, vectors)
+            ]
+            self.client.insert(self.collection_name, rows, partition_name=self.ensure_partition(namespace))
+            ids.extend(row["pk"] for row in rows)
+        return ids
+
+    @staticmethod
+    def namespaces(context):
+        """
+        Collect the namespaces a request context may read.
+
+        Args:
+            context (dict): May hold "user", "tenant" and a "namespaces" list.
+
+        Returns:
+            list: Namespaces, without duplicates.
+        """
+        found = list(context.get("namespaces", []))
+        found += [context[key] for key in ("user", "tenant") if context.get(key)]
+        return list(dict.fromkeys(found))
+
+    def route(self, context):
+        """
+        Map a request context to existing partition names.
+
+        Namespaces without a partition hold no data and are pruned. An empty
+        result means the request may not see anything, never "search everything".
+
+        Returns:
+            list: Partition names to search.
+        """
+        names = (partition_name(namespace, self.n_partitions) for namespace in self.namespaces(context))
+        return [name for name in dict.fromkeys(names) if name in self._partitions]
+
+    def search(self, query, context, k=4, filter=None, search_params=None):
+        """
+        Search only the partitions the context routes to and merge the hits.
+
+        Args:
+            query (str): The search query.
+            context (dict): Request context passed to route().
+            k (int): Number of results to return.
+            filter (str): Optional Milvus filter expression applied inside the partitions.
+            search_params (dict): Optional index search parameters, e.g. {"params": {"ef": 64}}.
+
+        Returns:
+            list: (Document, score) pairs, best first.
+        """
+        partitions = self.route(context)
+        if not partitions:
+            return []
+        if self.n_partitions:
+            # Shared partitions also hold other namespaces
+            namespace_filter = partition_key_expr(context)
+            filter = f"({namespace_filter}) and ({filter})" if filter else namespace_filter
+        # One request; Milvus searches the listed partitions and merges their top k
+        hits = self.client.search(
+            self.collection_name,
+            data=[self.embeddings.embed_query(query)],
+            limit=k,
+            filter=filter or "",
+            partition_names=partitions,
+            output_fields=["*"],
+            search_params=search_params or {},
+        )[0]
+        hits = sorted(hits, key=lambda hit: hit["distance"], reverse=self.metric_type in HIGHER_IS_BETTER)
+        results = []
+        for hit in hits[:k]:
+            entity = dict(hit["entity"])
+            text = entity.pop("text", "")
+            entity.pop("vector", None)
+            results.append((Document(id=str(hit["id"]), page_content=text, metadata=entity), hit["distance"]))
+        return results
+
+    def partition_stats(self, hot_factor=2.0):
+        """
+        Report row counts per partition and flag hot or skewed partitions.
+
+        Args:
+            hot_factor (float): A partition is hot when it holds more than hot_factor x the mean row count.
+
+        Returns:
+            dict: Row counts, mean, max, skew (max / mean) and the hot partitions.
+        """
+        counts = {
+            name: int(self.client.get_partition_stats(self.collection_name, name)["row_count"])
+            for name in sorted(self._partitions)
+            if name != "_default"
+        }
+        if not counts:
+            return {"row_counts": {}, "mean": 0.0, "max": 0, "skew": 0.0, "hot": []}
+        mean = sum(counts.values()) / len(counts)
+        largest = max(counts.values())
+        return {
+            "row_counts": counts,
+            "mean": mean,
+            "max": largest,
+            "skew": largest / mean if mean else 0.0,
+            "hot": [name for name, count in counts.items() if mean and count > hot_factor * mean],
+        }
+
+
+def partition_key_expr(context, field="namespace"):
+    """
+    Build a filter expression for collections created with partition_key_field.
+
+    With a partition key, Milvus hashes namespaces into a fixed set of partitions
+    and prunes them itself when the expression pins the key with == or in.
+
+    Args:
+        context (dict): Request context, as for PartitionRouter.route().
+        field (str): The partition key field.
+
+    Returns:
+        str: A filter expression such as 'namespace in ["ankush", "harrison"]'.
+    """
+    # json.dumps quotes and escapes each value, so a namespace cannot break out of the list
+    values = ", ".join(json.dumps(str(namespace)) for namespace in PartitionRouter.namespaces(context))
+    return f"{field} in [{values}]"
+
+
+# Step 1: Initialize the embedding model
+embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2")
+
+# Step 2: Connect to Milvus and create a collection with one partition per namespace
+URI = "./milvus_example.db"
+collection_name = "partitioned_collection"
+client = MilvusClient(uri=URI)
+if client.has_collection(collection_name):
+    client.drop_collection(collection_name)
+schema = MilvusClient.create_schema(auto_id=False, enable_dynamic_field=True)
+schema.add_field("pk", DataType.VARCHAR, is_primary=True, max_length=64)
+schema.add_field("text", DataType.VARCHAR, max_length=65_535)
+schema.add_field("namespace", DataType.VARCHAR, max_length=256)
+schema.add_field("vector", DataType.FLOAT_VECTOR, dim=768)
+index_params = client.prepare_index_params()
+index_params.add_index(field_name="vector", index_type="HNSW", metric_type="COSINE", params={"M": 16, "efConstruction": 200})
+client.create_collection(collection_name, schema=schema, index_params=index_params)
+
+# Step 3: Insert documents into their namespace partitions
+router = PartitionRouter(client, collection_name, embeddings)
+router.add_documents([
+    Document(page_content="I worked at Kensho", metadata={"namespace": "harrison"}),
+    Document(page_content="I worked at Facebook", metadata={"namespace": "ankush"}),
+    Document(page_content="I worked at SDSD", metadata={"namespace": "ankush"}),
+])
+
+# Step 4: Search only the partitions the request context may see
+for doc, score in router.search("Where did I work?", {"user": "ankush"}, k=2):
+    print(f"* [SIM={score:.3f}] {doc.page_content} [{doc.metadata}]")
+for doc, score in router.search("Where did I work?", {"namespaces": ["ankush", "harrison"]}, k=3):
+    print(f"* [SIM={score:.3f}] {doc.page_content} [{doc.metadata}]")
+
+# Step 5: Check partition sizes for hot or skewed tenants
+print("Partition stats:", router.partition_stats())
+
+# With more tenants than Milvus allows partitions, hash them into a fixed number:
+# router = PartitionRouter(client, collection_name, embeddings, n_partitions=64)
+
+# For a collection created with partition_key_field="namespace" (see 3_milvus_db_role_based_access_control.py),
+# pin the key in the expression so Milvus prunes partitions itself:
+# retriever = vectorstore.as_retriever(search_kwargs={"expr": partition_key_expr({"user": "ankush"})})
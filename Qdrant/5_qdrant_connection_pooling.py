@@ -0,0 +1,266 @@
+# qdrant_connection_pooling.py
+
+# Install necessary libraries
+# Run these commands in your terminal:
+# pip install -qU langchain-huggingface langchain-qdrant qdrant-client httpx
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import httpx
+from langchain_huggingface import HuggingFaceEmbeddings
+from langchain_qdrant import QdrantVectorStore
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import Distance, VectorParams
+
+# Keepalive settings for the gRPC channel. Pings keep idle connections open
+# through load balancers so the next search does not pay for a new handshake.
+DEFAULT_GRPC_OPTIONS = {
+    "grpc.keepalive_time_ms": 30_000,
+    "grpc.keepalive_timeout_ms": 10_000,
+    "grpc.keepalive_permit_without_calls": 1,
+    "grpc.http2.max_pings_without_data": 0,
+    "grpc.max_send_message_length": 64 * 1024 * 1024,
+    "grpc.max_receive_message_length": 64 * 1024 * 1024,
+}
+
+
+@dataclass
+class ConnectionMetrics:
+    """Counters for one Qdrant endpoint."""
+    transport: str = "none"
+    clients_created: int = 0
+    reuses: int = 0
+    grpc_fallbacks: int = 0
+    connect_seconds: float = 0.0
+    last_error: str = ""
+    created_at: float = field(default_factory=time.time)
+
+
+class QdrantConnectionManager:
+    """
+    Creates one long-lived QdrantClient per endpoint and shares it.
+
+    QdrantClient is thread-safe and keeps its own HTTP/gRPC connection pool, so
+    a single instance per endpoint should be reused by every vector store and
+    thread in the process instead of being built per request.
+    """
+
+    def __init__(self, timeout=10, grpc_port=6334, grpc_options=None,
+                 max_connections=100, keepalive_expiry=60.0):
+        """
+        Args:
+            timeout (int): Request timeout in seconds for both transports.
+            grpc_port (int): Port of the Qdrant gRPC interface.
+            grpc_options (dict): Extra gRPC channel options (merged over the keepalive defaults).
+            max_connections (int): Size of the HTTP connection pool used by the REST fallback.
+            keepalive_expiry (float): Seconds an idle HTTP connection is kept open.
+        """
+        self.timeout = timeout
+        self.grpc_port = grpc_port
+        self.grpc_options = {**DEFAULT_GRPC_OPTIONS, **(grpc_options or {})}
+        self.http_limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._clients = {}
+        self._metrics = {}
+        self._connect_locks = {}  # one per endpoint, so a slow connect does not block other endpoints
+        self._lock = threading.Lock()  # guards the three dicts; never held while connecting
+
+    @staticmethod
+    def _key(url, api_key):
+        return (url.rstrip("/"), api_key)
+
+    def _connect_grpc(self, url, api_key):
+        client = QdrantClient(
+            url=url,
+            api_key=api_key,
+            prefer_grpc=True,
+            grpc_port=self.grpc_port,
+            grpc_options=self.grpc_options,
+            timeout=self.timeout,
+        )
+        # The gRPC channel is created lazily; issue a cheap call so a blocked
+        # port is detected here rather than on the first real search.
+        client.get_collections()
+        return client
+
+    def _connect_http(self, url, api_key):
+        client = QdrantClient(
+            url=url,
+            api_key=api_key,
+            prefer_grpc=False,
+            timeout=self.timeout,
+            limits=self.http_limits,
+        )
+        client.get_collections()
+        return client
+
+    def get_client(self, url, api_key=None):
+        """
+        Return the shared client for an endpoint, connecting on first use.
+
+        gRPC is tried first because it sends vectors as packed floats instead of
+        JSON arrays. If the gRPC port is unreachable the manager falls back to HTTP.
+        Connecting holds only this endpoint's lock, so callers of other endpoints
+        (and of already connected ones) are not blocked by a slow handshake.
+
+        Args:
+            url (str): Qdrant server URL, e.g. "http://localhost:6333".
+            api_key (str): Optional API key for Qdrant Cloud.
+
+        Returns:
+            QdrantClient: The pooled client for this endpoint.
+        """
+        key = self._key(url, api_key)
+        with self._lock:
+            metrics = self._metrics.setdefault(key, ConnectionMetrics())
+            client = self._clients.get(key)
+            if client is not None:
+                metrics.reuses += 1
+                return client
+            connect_lock = self._connect_locks.setdefault(key, threading.Lock())
+
+        with connect_lock:
+            # Another thread may have connected while this one waited
+            with self._lock:
+                client = self._clients.get(key)
+                if client is not None:
+                    metrics.reuses += 1
+                    return client
+
+            start = time.perf_counter()
+            error = None
+            try:
+                client, transport = self._connect_grpc(url, api_key), "grpc"
+            except Exception as e:
+                error = e
+                client, transport = self._connect_http(url, api_key), "http"
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                if error is not None:
+                    metrics.grpc_fallbacks += 1
+                    metrics.last_error = str(error)
+                metrics.transport = transport
+                metrics.connect_seconds += elapsed
+                metrics.clients_created += 1
+                self._clients[key] = client
+            return client
+
+    def get_vector_store(self, embeddings, collection_name, url, api_key=None, **kwargs):
+        """
+        Build a QdrantVectorStore on top of the shared client.
+
+        Args:
+            embeddings (HuggingFaceEmbeddings): The embeddings to use for vector representation.
+            collection_name (str): Name of an existing collection.
+            url (str): Qdrant server URL.
+            api_key (str): Optional API key for Qdrant Cloud.
+            **kwargs: Passed through to QdrantVectorStore (e.g. retrieval_mode).
+
+        Returns:
+            QdrantVectorStore: A vector store that reuses the pooled client.
+        """
+        return QdrantVectorStore(
+            client=self.get_client(url, api_key),
+            collection_name=collection_name,
+            embedding=embeddings,
+            **kwargs,
+        )
+
+    def metrics(self):
+        """
+        Return a snapshot of per-endpoint connection metrics.
+
+        Returns:
+            dict: Mapping of endpoint URL to its metric values.
+        """
+        with self._lock:
+            return {key[0]: vars(m).copy() for key, m in self._metrics.items()}
+
+    def close(self, url=None, api_key=None):
+        """
+        Close one endpoint's client, or all clients when no URL is given.
+
+        Args:
+            url (str): Endpoint to close. Closes every client if omitted.
+            api_key (str): API key the endpoint was opened with.
+        """
+        with self._lock:
+            keys = [self._key(url, api_key)] if url else list(self._clients)
+            clients = [self._clients.pop(key, None) for key in keys]
+        for client in clients:
+            if client is not None:
+                client.close()
+
+
+# A module-level manager shared by everything in the process.
+connection_manager = QdrantConnectionManager()
+
+
+def initialize_embeddings():
+    """Initialize Hugging Face embeddings."""
+    return HuggingFaceEmbeddings(model="sentence-transformers/all-mpnet-base-v2")
+
+
+def ensure_collection(client, collection_name, size=768):
+    """
+    Create the collection if it does not exist yet.
+
+    Args:
+        client (QdrantClient): The pooled client.
+        collection_name (str): Name of the collection.
+        size (int): Vector dimension (768 for all-mpnet-base-v2).
+    """
+    if not client.collection_exists(collection_name):
+        client.create_collection(
+            collection_name=collection_name,
+            vectors_config=VectorParams(size=size, distance=Distance.COSINE),
+        )
+
+
+def concurrent_searches(vector_store, queries, workers=8):
+    """
+    Run several searches from a thread pool against one shared store.
+
+    Args:
+        vector_store (QdrantVectorStore): Store backed by the pooled client.
+        queries (list): Query strings.
+        workers (int): Number of threads.
+
+    Returns:
+        list: One result list per query, in input order.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda q: vector_store.similarity_search(q, k=2), queries))
+
+
+def main():
+    embeddings = initialize_embeddings()
+
+    # Replace with your Qdrant server URL
+    url = "http://localhost:6333"
+    client = connection_manager.get_client(url)
+    ensure_collection(client, "demo_collection")
+
+    # Both stores share the same client and connection pool.
+    store_a = connection_manager.get_vector_store(embeddings, "demo_collection", url)
+    store_b = connection_manager.get_vector_store(embeddings, "demo_collection", url)
+    store_a.add_texts(["Building an exciting project with LangChain!", "Robbers stole $1 million from the bank."])
+
+    results = concurrent_searches(store_b, ["LangChain project", "bank robbery"] * 4)
+    for docs in results[:2]:
+        for doc in docs:
+            print(f"* {doc.page_content} [{doc.metadata}]")
+
+    print("Connection metrics:", connection_manager.metrics())
+    connection_manager.close()
+
+
+if __name__ == "__main__":
+    main()
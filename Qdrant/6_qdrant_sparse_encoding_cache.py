@@ -0,0 +1,245 @@
+# qdrant_sparse_encoding_cache.py
+
+# Install necessary libraries
+# Run these commands in your terminal:
+# pip install -qU langchain-huggingface langchain-qdrant qdrant-client fastembed numpy
+
+import hashlib
+import sqlite3
+import threading
+from functools import lru_cache
+from uuid import uuid4
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_huggingface import HuggingFaceEmbeddings
+from langchain_qdrant import QdrantVectorStore, RetrievalMode, FastEmbedSparse
+from langchain_qdrant.sparse_embeddings import SparseEmbeddings, SparseVector
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+
+# Default vector names used by QdrantVectorStore
+DENSE_VECTOR_NAME = ""
+SPARSE_VECTOR_NAME = "langchain-sparse"
+
+
+@lru_cache(maxsize=None)
+def get_sparse_encoder(model_name="Qdrant/BM25", batch_size=256):
+    """
+    Return one FastEmbedSparse instance per model, shared by every store.
+
+    Loading the BM25 model is not free, so stores that use the same model
+    should not each build their own encoder.
+
+    Args:
+        model_name (str): FastEmbed sparse model name.
+        batch_size (int): Number of texts encoded per call to the model.
+
+    Returns:
+        FastEmbedSparse: The shared encoder.
+    """
+    return FastEmbedSparse(model_name=model_name, batch_size=batch_size)
+
+
+class CachedSparseEmbeddings(SparseEmbeddings):
+    """
+    Sparse encoder wrapper with a persistent per-text cache.
+
+    BM25 document vectors hold only term statistics of the text itself (Qdrant
+    applies IDF server-side), so a text always encodes to the same vector and can
+    be cached on disk across runs. Cache misses are encoded in a single batch.
+    Keys include the model name, so one cache file can serve several models
+    without returning another model's vectors.
+    """
+
+    def __init__(self, encoder, cache_path="sparse_cache.sqlite", query_cache_size=4096, model_name=None):
+        """
+        Args:
+            encoder (SparseEmbeddings): The underlying encoder, e.g. from get_sparse_encoder().
+            cache_path (str): SQLite file used to persist document vectors.
+            query_cache_size (int): Number of query vectors kept in memory.
+            model_name (str): Name of the encoder's model (default: encoder.model_name,
+                else the encoder's class name).
+        """
+        self.encoder = encoder
+        self.model_name = model_name or getattr(encoder, "model_name", None) or type(encoder).__name__
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(cache_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sparse (key TEXT PRIMARY KEY, indices BLOB, vals BLOB)"
+        )
+        self._query_cache = lru_cache(maxsize=query_cache_size)(encoder.embed_query)
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, text):
+        return hashlib.blake2b(f"{self.model_name}\0{text}".encode("utf-8"), digest_size=16).hexdigest()
+
+    def embed_documents(self, texts):
+        """
+        Encode documents, reading cached vectors and batch-encoding the rest.
+
+        Args:
+            texts (list): Texts to encode.
+
+        Returns:
+            list: One SparseVector per text.
+        """
+        keys = [self._key(t) for t in texts]
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT key, indices, vals FROM sparse WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+                for key, indices, vals in rows:
+                    found[key] = SparseVector(
+                        indices=np.frombuffer(indices, dtype=np.int32).tolist(),
+                        values=np.frombuffer(vals, dtype=np.float32).tolist(),
+                    )
+
+        missing = {key: text for key, text in zip(keys, texts) if key not in found}
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            encoded = self.encoder.embed_documents(list(missing.values()))
+            rows = []
+            for key, vector in zip(missing, encoded):
+                found[key] = vector
+                rows.append((
+                    key,
+                    np.asarray(vector.indices, dtype=np.int32).tobytes(),
+                    np.asarray(vector.values, dtype=np.float32).tobytes(),
+                ))
+            with self._lock:
+                self._db.executemany("INSERT OR REPLACE INTO sparse VALUES (?, ?, ?)", rows)
+                self._db.commit()
+        return [found[key] for key in keys]
+
+    def embed_query(self, text):
+        """
+        Encode a query, reusing the vector for repeated queries.
+
+        Args:
+            text (str): Query text.
+
+        Returns:
+            SparseVector: The query vector.
+        """
+        return self._query_cache(text)
+
+    def close(self):
+        """Close the cache database."""
+        self._db.close()
+
+
+def encode_batches(texts, dense_embeddings, sparse_embeddings, batch_size=256):
+    """
+    Produce dense and sparse vectors for each batch in a single pass.
+
+    Args:
+        texts (list): Texts to encode.
+        dense_embeddings (HuggingFaceEmbeddings): Dense model.
+        sparse_embeddings (SparseEmbeddings): Sparse model (ideally cached).
+        batch_size (int): Texts per batch.
+
+    Yields:
+        tuple: (start offset, dense vectors, sparse vectors) for each batch.
+    """
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        yield start, dense_embeddings.embed_documents(batch), sparse_embeddings.embed_documents(batch)
+
+
+def create_hybrid_collection(client, collection_name, size=768):
+    """
+    Create a collection with a dense vector and an IDF-weighted sparse vector.
+
+    Args:
+        client (QdrantClient): The Qdrant client.
+        collection_name (str): Name of the collection.
+        size (int): Dense vector dimension (768 for all-mpnet-base-v2).
+    """
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config={DENSE_VECTOR_NAME: models.VectorParams(size=size, distance=models.Distance.COSINE)},
+        sparse_vectors_config={SPARSE_VECTOR_NAME: models.SparseVectorParams(modifier=models.Modifier.IDF)},
+    )
+
+
+def ingest_precomputed(client, collection_name, documents, dense_embeddings, sparse_embeddings, batch_size=256):
+    """
+    Upsert documents with dense and sparse vectors computed in the same pass.
+
+    Points use the same payload layout as QdrantVectorStore, so the collection can
+    be searched with a regular hybrid store afterwards.
+
+    Args:
+        client (QdrantClient): The Qdrant client.
+        collection_name (str): Target collection.
+        documents (list): Documents to ingest.
+        dense_embeddings (HuggingFaceEmbeddings): Dense model.
+        sparse_embeddings (SparseEmbeddings): Sparse model.
+        batch_size (int): Documents per batch.
+
+    Returns:
+        list: Ids of the ingested points.
+    """
+    texts = [doc.page_content for doc in documents]
+    ids = [str(uuid4()) for _ in documents]
+    for start, dense, sparse in encode_batches(texts, dense_embeddings, sparse_embeddings, batch_size):
+        points = [
+            models.PointStruct(
+                id=ids[start + i],
+                vector={
+                    DENSE_VECTOR_NAME: dense[i],
+                    SPARSE_VECTOR_NAME: models.SparseVector(indices=sparse[i].indices, values=sparse[i].values),
+                },
+                payload={"page_content": texts[start + i], "metadata": documents[start + i].metadata},
+            )
+            for i in range(len(dense))
+        ]
+        # Earlier batches are not awaited; waiting on the last one means every batch is
+        # applied (updates are applied in order) before the caller searches.
+        last = start + batch_size >= len(texts)
+        client.upsert(collection_name=collection_name, points=points, wait=last)
+    return ids
+
+
+def main():
+    embeddings = HuggingFaceEmbeddings(model="sentence-transformers/all-mpnet-base-v2")
+    sparse_embeddings = CachedSparseEmbeddings(get_sparse_encoder("Qdrant/BM25"), model_name="Qdrant/BM25")
+
+    documents = [
+        Document(page_content="Chocolate chip pancakes and scrambled eggs.", metadata={"source": "tweet"}),
+        Document(page_content="Tomorrow's weather: cloudy and overcast.", metadata={"source": "news"}),
+        Document(page_content="Building an exciting project with LangChain!", metadata={"source": "tweet"}),
+        Document(page_content="Robbers stole $1 million from the bank.", metadata={"source": "news"}),
+        Document(page_content="Amazing movie, can't wait to see it again!", metadata={"source": "tweet"}),
+    ]
+
+    client = QdrantClient(":memory:")
+    create_hybrid_collection(client, "hybrid_collection")
+    ingest_precomputed(client, "hybrid_collection", documents, embeddings, sparse_embeddings)
+
+    # Search with the same cached encoder the data was ingested with.
+    hybrid_store = QdrantVectorStore(
+        client=client,
+        collection_name="hybrid_collection",
+        embedding=embeddings,
+        sparse_embedding=sparse_embeddings,
+        retrieval_mode=RetrievalMode.HYBRID,
+    )
+    for doc in hybrid_store.similarity_search("LangChain project", k=2):
+        print(f"* {doc.page_content} [{doc.metadata}]")
+
+    # A second pass over the same corpus is served from the cache.
+    sparse_embeddings.embed_documents([doc.page_content for doc in documents])
+    print(f"Sparse cache hits: {sparse_embeddings.hits}, misses: {sparse_embeddings.misses}")
+    sparse_embeddings.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# redis_db_setup.py
+
+# Install necessary libraries
+# Run these commands in your terminal:
+# pip install -qU redis numpy langchain-huggingface
+#
+# Start a local Redis Stack server (includes the RediSearch vector index):
+# docker run -d --name redis-stack -p 6379:6379 redis/redis-stack-server:latest
+
+from uuid import uuid4
+
+import redis
+from langchain_core.documents import Document
+from redis.commands.search.field import TagField, TextField, VectorField
+from redis.commands.search.query import Query
+
+from redis_utils import IndexDefinition, IndexType, hash_fields, to_bytes
+
+
+def initialize_embeddings():
+    """
+    Initialize Hugging Face embeddings using a pre-trained model.
+
+    Returns:
+        HuggingFaceEmbeddings: An instance of HuggingFaceEmbeddings initialized with a specific model.
+    """
+    from langchain_huggingface import HuggingFaceEmbeddings
+
+    return HuggingFaceEmbeddings(model="sentence-transformers/all-mpnet-base-v2")
+
+
+def connect(host="localhost", port=6379, password=None):
+    """
+    Connect to Redis.
+
+    Responses are not decoded, because vectors are stored as raw float32 bytes.
+
+    Returns:
+        redis.Redis: The client.
+    """
+    return redis.Redis(host=host, port=port, password=password, decode_responses=False)
+
+
+def create_index(client, index_name="docs", prefix="doc:", dim=768, algorithm="HNSW", metric="COSINE",
+                 m=16, ef_construction=200, ef_runtime=10, drop_old=False):
+    """
+    Create a RediSearch index over hashes with a vector field.
+
+    Args:
+        client (redis.Redis): The Redis client.
+        index_name (str): Name of the index.
+        prefix (str): Key prefix of the indexed hashes.
+        dim (int): Vector dimension (768 for all-mpnet-base-v2).
+        algorithm (str): "HNSW" (approximate) or "FLAT" (exact, best for small or hot data sets).
+        metric (str): "COSINE", "IP" or "L2".
+        m (int): HNSW neighbors per node.
+        ef_construction (int): HNSW candidate list size while building.
+        ef_runtime (int): Default HNSW candidate list size while searching.
+        drop_old (bool): Drop an existing index first (its documents are kept).
+    """
+    if drop_old:
+        try:
+            client.ft(index_name).dropindex(delete_documents=False)
+        except redis.ResponseError:
+            pass
+    attributes = {"TYPE": "FLOAT32", "DIM": dim, "DISTANCE_METRIC": metric}
+    if algorithm == "HNSW":
+        attributes.update({"M": m, "EF_CONSTRUCTION": ef_construction, "EF_RUNTIME": ef_runtime})
+    elif algorithm != "FLAT":
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    client.ft(index_name).create_index(
+        [
+            TextField("text"),
+            TagField("source"),
+            VectorField("vector", algorithm, attributes),
+        ],
+        definition=IndexDefinition(prefix=[prefix], index_type=IndexType.HASH),
+    )
+
+
+def add_documents(client, embeddings, documents, prefix="doc:", batch_size=500):
+    """
+    Store documents as hashes, writing each batch in one pipeline round trip.
+
+    Args:
+        client (redis.Redis): The Redis client.
+        embeddings (HuggingFaceEmbeddings): The embeddings model.
+        documents (list): Documents to store.
+        prefix (str): Key prefix matching the index.
+        batch_size (int): Documents embedded and written per pipeline.
+
+    Returns:
+        list: The ids of the stored documents.
+    """
+    ids = []
+    for start in range(0, len(documents), batch_size):
+        batch = documents[start:start + batch_size]
+        vectors = embeddings.embed_documents([doc.page_content for doc in batch])
+        pipe = client.pipeline(transaction=False)
+        for doc, vector in zip(batch, vectors):
+            doc_id = doc.id or str(uuid4())
+            pipe.hset(f"{prefix}{doc_id}", mapping=hash_fields(doc.page_content, vector, doc.metadata))
+            ids.append(doc_id)
+        pipe.execute()
+    return ids
+
+
+def similarity_search(client, embeddings, query, k=2, index_name="docs"):
+    """
+    Run a KNN search and return (text, distance) pairs, closest first.
+    """
+    q = (
+        Query("*=>[KNN $k @vector $vec AS score]")
+        .sort_by("score")
+        .return_fields("text", "source", "score")
+        .paging(0, k)
+        .dialect(2)
+    )
+    results = client.ft(index_name).search(q, query_params={"vec": to_bytes(embeddings.embed_query(query)), "k": k})
+    return [(doc.text, float(doc.score)) for doc in results.docs]
+
+
+def main():
+    embeddings = initialize_embeddings()
+    client = connect()
+
+    # HNSW for large collections; use algorithm="FLAT" for exact search on small, hot data sets.
+    create_index(client, algorithm="HNSW", metric="COSINE", drop_old=True)
+
+    add_documents(client, embeddings, [
+        Document(page_content="I had chocolate chip pancakes and scrambled eggs for breakfast this morning.", metadata={"source": "tweet"}),
+        Document(page_content="The weather forecast for tomorrow is cloudy and overcast, with a high of 62 degrees.", metadata={"source": "news"}),
+        Document(page_content="Building an exciting new project with LangChain - come check it out!", metadata={"source": "tweet"}),
+    ])
+
+    for text, score in similarity_search(client, embeddings, "LangChain provides abstractions to make working with LLMs easy"):
+        print(f"* [DIST={score:.3f}] {text}")
+
+
+if __name__ == "__main__":
+    main()
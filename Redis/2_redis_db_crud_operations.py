@@ -0,0 +1,126 @@
+# redis_db_crud_operations.py
+
+# Install necessary libraries
+# Run these commands in your terminal:
+# pip install -qU redis numpy langchain-huggingface
+
+from uuid import uuid4
+
+import redis
+from langchain_core.documents import Document
+from redis.commands.search.field import TagField, TextField, VectorField
+
+from redis_utils import IndexDefinition, IndexType, hash_fields, scalar_metadata
+
+PREFIX = "doc:"
+INDEX_NAME = "docs"
+
+
+def setup(client, dim=768):
+    """Create the index used by this example (HNSW, cosine), replacing an old one."""
+    try:
+        client.ft(INDEX_NAME).dropindex(delete_documents=True)
+    except redis.ResponseError:
+        pass
+    client.ft(INDEX_NAME).create_index(
+        [
+            TextField("text"),
+            TagField("source"),
+            VectorField("vector", "HNSW", {"TYPE": "FLOAT32", "DIM": dim, "DISTANCE_METRIC": "COSINE"}),
+        ],
+        definition=IndexDefinition(prefix=[PREFIX], index_type=IndexType.HASH),
+    )
+
+
+# Create
+def add_documents(client, embeddings, documents, ids=None, batch_size=500):
+    """
+    Insert or overwrite documents, one transaction per batch.
+
+    Args:
+        client (redis.Redis): The Redis client.
+        embeddings (HuggingFaceEmbeddings): The embeddings model.
+        documents (list): Documents to store.
+        ids (list): Optional ids; UUIDs are generated when omitted.
+        batch_size (int): Documents embedded and written per pipeline.
+
+    Returns:
+        list: The ids of the stored documents.
+    """
+    ids = ids or [str(uuid4()) for _ in documents]
+    for start in range(0, len(documents), batch_size):
+        batch = documents[start:start + batch_size]
+        vectors = embeddings.embed_documents([doc.page_content for doc in batch])
+        # MULTI/EXEC, so no reader sees a key between the delete and the hset
+        pipe = client.pipeline(transaction=True)
+        for doc_id, doc, vector in zip(ids[start:start + batch_size], batch, vectors):
+            key = f"{PREFIX}{doc_id}"
+            pipe.delete(key)  # drop fields of a previous version
+            pipe.hset(key, mapping=hash_fields(doc.page_content, vector, doc.metadata))
+        pipe.execute()
+    return ids
+
+
+# Read
+def get_documents(client, ids):
+    """
+    Fetch documents by id in one pipeline round trip.
+
+    Returns:
+        list: Documents (None for missing ids), in input order.
+    """
+    pipe = client.pipeline(transaction=False)
+    for doc_id in ids:
+        pipe.hgetall(f"{PREFIX}{doc_id}")
+    documents = []
+    for doc_id, fields in zip(ids, pipe.execute()):
+        if not fields:
+            documents.append(None)
+            continue
+        fields.pop(b"vector", None)
+        metadata = {k.decode(): v.decode() for k, v in fields.items() if k != b"text"}
+        documents.append(Document(id=doc_id, page_content=fields[b"text"].decode(), metadata=metadata))
+    return documents
+
+
+# Update
+def update_metadata(client, doc_id, **metadata):
+    """Change metadata fields in place; the vector is not recomputed."""
+    client.hset(f"{PREFIX}{doc_id}", mapping=scalar_metadata(metadata))
+
+
+# Delete
+def delete_documents(client, ids):
+    """
+    Delete documents by id; the index drops them automatically.
+
+    Returns:
+        int: Number of documents deleted.
+    """
+    return client.delete(*[f"{PREFIX}{doc_id}" for doc_id in ids]) if ids else 0
+
+
+def main():
+    from langchain_huggingface import HuggingFaceEmbeddings
+
+    embeddings = HuggingFaceEmbeddings(model="sentence-transformers/all-mpnet-base-v2")
+    client = redis.Redis(host="localhost", port=6379, decode_responses=False)
+    setup(client)
+
+    ids = add_documents(client, embeddings, [
+        Document(page_content="Building an exciting new project with LangChain - come check it out!", metadata={"source": "tweet"}),
+        Document(page_content="Robbers broke into the city bank and stole $1 million in cash.", metadata={"source": "news"}),
+        Document(page_content="I have a bad feeling I am going to get deleted :(", metadata={"source": "tweet"}),
+    ])
+
+    # Update: re-embed the changed text under the same id, or change metadata only.
+    add_documents(client, embeddings, [Document(page_content="Building a new project with LangGraph!", metadata={"source": "tweet"})], ids=[ids[0]])
+    update_metadata(client, ids[1], source="website")
+
+    delete_documents(client, [ids[2]])
+    for doc in get_documents(client, ids):
+        print(doc)
+
+
+if __name__ == "__main__":
+    main()
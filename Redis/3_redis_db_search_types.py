@@ -0,0 +1,183 @@
+# redis_db_search_types.py
+
+# Install necessary libraries
+# Run these commands in your terminal:
+# pip install -qU redis numpy langchain-huggingface
+
+import re
+
+import redis
+from langchain_core.documents import Document
+from redis.commands.search.field import TagField, TextField, VectorField
+from redis.commands.search.query import Query
+
+from redis_utils import IndexDefinition, IndexType, hash_fields, tag_clause, to_bytes
+
+PREFIX = "doc:"
+INDEX_NAME = "docs"
+
+
+def setup(client, embeddings, documents, algorithm="HNSW", dim=768):
+    """Create the index and load the example documents with one pipeline."""
+    try:
+        client.ft(INDEX_NAME).dropindex(delete_documents=True)
+    except redis.ResponseError:
+        pass
+    client.ft(INDEX_NAME).create_index(
+        [
+            TextField("text"),
+            TagField("source"),
+            VectorField("vector", algorithm, {"TYPE": "FLOAT32", "DIM": dim, "DISTANCE_METRIC": "COSINE"}),
+        ],
+        definition=IndexDefinition(prefix=[PREFIX], index_type=IndexType.HASH),
+    )
+    vectors = embeddings.embed_documents([doc.page_content for doc in documents])
+    pipe = client.pipeline(transaction=False)
+    for i, (doc, vector) in enumerate(zip(documents, vectors)):
+        pipe.hset(f"{PREFIX}{i}", mapping=hash_fields(doc.page_content, vector, doc.metadata))
+    pipe.execute()
+
+
+def _run(client, query, params):
+    results = client.ft(INDEX_NAME).search(query, query_params=params)
+    return [
+        (Document(id=doc.id, page_content=doc.text, metadata=_metadata(doc)), float(doc.score))
+        for doc in results.docs
+    ]
+
+
+def _metadata(doc):
+    source = getattr(doc, "source", None)  # hashes without a source field have no attribute
+    return {} if source is None else {"source": source}
+
+
+def knn_query_string(filter=None, ef_runtime=None):
+    """
+    Build the KNN query string with an optional tag pre-filter.
+
+    Args:
+        filter (dict): Tag filter, e.g. {"source": ["tweet", "news"]}; all fields must match.
+        ef_runtime (int): Optional HNSW candidate list size for this query.
+
+    Returns:
+        str: The query, or None when a filter field has no allowed values (nothing can match).
+    """
+    clauses = [tag_clause(field, values) for field, values in (filter or {}).items()]
+    if None in clauses:
+        return None
+    prefilter = f"({' '.join(clauses)})" if clauses else "*"
+    ef = " EF_RUNTIME $ef" if ef_runtime else ""
+    return f"{prefilter}=>[KNN $k @vector $vec{ef} AS score]"
+
+
+def knn_search(client, query_vector, k=4, filter=None, ef_runtime=None):
+    """
+    Approximate (HNSW) or exact (FLAT) KNN search with an optional pre-filter.
+
+    Args:
+        client (redis.Redis): The Redis client.
+        query_vector (list): Query embedding.
+        k (int): Number of results.
+        filter (dict): Optional tag filter, e.g. {"source": ["tweet", "news"]}.
+        ef_runtime (int): Optional HNSW candidate list size for this query.
+
+    Returns:
+        list: (Document, cosine distance) pairs, closest first.
+    """
+    query_string = knn_query_string(filter, ef_runtime)
+    if query_string is None:
+        return []
+    query = (
+        Query(query_string)
+        .sort_by("score")
+        .return_fields("text", "source", "score")
+        .paging(0, k)
+        .dialect(2)
+    )
+    params = {"vec": to_bytes(query_vector), "k": k}
+    if ef_runtime:
+        params["ef"] = ef_runtime
+    return _run(client, query, params)
+
+
+def range_search(client, query_vector, radius=0.5, max_results=100):
+    """
+    Return every document within a cosine distance of the query.
+
+    Returns:
+        list: (Document, cosine distance) pairs, closest first.
+    """
+    query = (
+        Query("@vector:[VECTOR_RANGE $radius $vec]=>{$YIELD_DISTANCE_AS: score}")
+        .sort_by("score")
+        .return_fields("text", "source", "score")
+        .paging(0, max_results)
+        .dialect(2)
+    )
+    return _run(client, query, {"vec": to_bytes(query_vector), "radius": radius})
+
+
+def hybrid_query_string(query_text):
+    """
+    Build the KNN query restricted to documents matching any word of the text.
+
+    Returns:
+        str: The query; without words it searches every document.
+    """
+    terms = " | ".join(re.findall(r"\w+", query_text))
+    prefilter = f"(@text:({terms}))" if terms else "*"
+    return f"{prefilter}=>[KNN $k @vector $vec AS score]"
+
+
+def hybrid_search(client, query_text, query_vector, k=4):
+    """
+    KNN restricted to documents whose text matches the full-text query.
+
+    Returns:
+        list: (Document, cosine distance) pairs, closest first.
+    """
+    query = (
+        Query(hybrid_query_string(query_text))
+        .sort_by("score")
+        .return_fields("text", "source", "score")
+        .paging(0, k)
+        .dialect(2)
+    )
+    return _run(client, query, {"vec": to_bytes(query_vector), "k": k})
+
+
+def main():
+    from langchain_huggingface import HuggingFaceEmbeddings
+
+    embeddings = HuggingFaceEmbeddings(model="sentence-transformers/all-mpnet-base-v2")
+    client = redis.Redis(host="localhost", port=6379, decode_responses=False)
+    setup(client, embeddings, [
+        Document(page_content="I had chocolate chip pancakes and scrambled eggs for breakfast this morning.", metadata={"source": "tweet"}),
+        Document(page_content="Building an exciting new project with LangChain - come check it out!", metadata={"source": "tweet"}),
+        Document(page_content="Robbers broke into the city bank and stole $1 million in cash.", metadata={"source": "news"}),
+        Document(page_content="LangGraph is the best framework for building stateful, agentic applications!", metadata={"source": "tweet"}),
+        Document(page_content="The stock market is down 500 points today due to fears of a recession.", metadata={"source": "news"}),
+    ])
+
+    query = "LangChain provides abstractions to make working with LLMs easy"
+    query_vector = embeddings.embed_query(query)
+
+    print("KNN:")
+    for doc, score in knn_search(client, query_vector, k=2, ef_runtime=50):
+        print(f"* [DIST={score:.3f}] {doc.page_content} [{doc.metadata}]")
+
+    print("KNN with tag filter:")
+    for doc, score in knn_search(client, query_vector, k=2, filter={"source": "news"}):
+        print(f"* [DIST={score:.3f}] {doc.page_content} [{doc.metadata}]")
+
+    print("Range:")
+    for doc, score in range_search(client, query_vector, radius=0.6):
+        print(f"* [DIST={score:.3f}] {doc.page_content} [{doc.metadata}]")
+
+    print("Hybrid (full-text + KNN):")
+    for doc, score in hybrid_search(client, "LangChain framework", query_vector, k=2):
+        print(f"* [DIST={score:.3f}] {doc.page_content} [{doc.metadata}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# redis_db_role_based_access_control.py
+
+# Install necessary libraries
+# Run these commands in your terminal:
+# pip install -qU redis numpy langchain-huggingface
+
+from uuid import uuid4
+
+import redis
+from langchain_core.documents import Document
+from redis.commands.search.field import TagField, TextField, VectorField
+from redis.commands.search.query import Query
+
+from redis_utils import IndexDefinition, IndexType, hash_fields, tag_clause, to_bytes
+
+PREFIX = "acl:"
+INDEX_NAME = "acl_docs"
+
+
+def setup(client, dim=768):
+    """Create an index with an `allowed` tag field listing the principals that may read each document."""
+    try:
+        client.ft(INDEX_NAME).dropindex(delete_documents=True)
+    except redis.ResponseError:
+        pass
+    client.ft(INDEX_NAME).create_index(
+        [
+            TextField("text"),
+            TagField("allowed", separator=","),
+            VectorField("vector", "HNSW", {"TYPE": "FLOAT32", "DIM": dim, "DISTANCE_METRIC": "COSINE"}),
+        ],
+        definition=IndexDefinition(prefix=[PREFIX], index_type=IndexType.HASH),
+    )
+
+
+def add_documents(client, embeddings, documents, batch_size=500):
+    """
+    Store documents with their access list (metadata["allowed"], a list of users or groups).
+
+    Returns:
+        list: The ids of the stored documents.
+    """
+    ids = []
+    for start in range(0, len(documents), batch_size):
+        batch = documents[start:start + batch_size]
+        vectors = embeddings.embed_documents([doc.page_content for doc in batch])
+        pipe = client.pipeline(transaction=False)
+        for doc, vector in zip(batch, vectors):
+            allowed = list(doc.metadata["allowed"])
+            if any("," in principal for principal in allowed):
+                raise ValueError("Principals cannot contain ',', the tag separator")
+            doc_id = str(uuid4())
+            pipe.hset(f"{PREFIX}{doc_id}", mapping=hash_fields(doc.page_content, vector, {"allowed": ",".join(allowed)}))
+            ids.append(doc_id)
+        pipe.execute()
+    return ids
+
+
+def acl_query_string(principals):
+    """
+    Build the KNN query restricted to documents whose `allowed` tags include a principal.
+
+    Args:
+        principals (list): The user id and group names of the caller.
+
+    Returns:
+        str: The query, or None when there are no principals (the caller may see nothing).
+    """
+    allowed = tag_clause("allowed", list(principals))
+    if allowed is None:
+        return None
+    return f"({allowed})=>[KNN $k @vector $vec AS score]"
+
+
+def search_as(client, embeddings, query, principals, k=4):
+    """
+    Search only documents visible to the given user and groups.
+
+    The tag filter is applied inside the index before KNN, so documents the
+    caller may not see never compete for the top k.
+
+    Args:
+        client (redis.Redis): The Redis client.
+        embeddings (HuggingFaceEmbeddings): The embeddings model.
+        query (str): The search query.
+        principals (list): The user id and group names of the caller.
+        k (int): Number of results.
+
+    Returns:
+        list: (text, cosine distance) pairs, closest first.
+    """
+    query_string = acl_query_string(principals)
+    if query_string is None:
+        return []
+    q = (
+        Query(query_string)
+        .sort_by("score")
+        .return_fields("text", "score")
+        .paging(0, k)
+        .dialect(2)
+    )
+    results = client.ft(INDEX_NAME).search(q, query_params={"vec": to_bytes(embeddings.embed_query(query)), "k": k})
+    return [(doc.text, float(doc.score)) for doc in results.docs]
+
+
+def main():
+    from langchain_huggingface import HuggingFaceEmbeddings
+
+    embeddings = HuggingFaceEmbeddings(model="sentence-transformers/all-mpnet-base-v2")
+    client = redis.Redis(host="localhost", port=6379, decode_responses=False)
+    setup(client)
+
+    add_documents(client, embeddings, [
+        Document(page_content="I worked at Kensho", metadata={"allowed": ["harrison"]}),
+        Document(page_content="I worked at Facebook", metadata={"allowed": ["ankush"]}),
+        Document(page_content="The team offsite is in Lisbon", metadata={"allowed": ["group:engineering"]}),
+    ])
+
+    for text, score in search_as(client, embeddings, "Where did I work?", ["ankush", "group:engineering"]):
+        print(f"* [DIST={score:.3f}] {text}")
+
+
+if __name__ == "__main__":
+    main()
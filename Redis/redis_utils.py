@@ -0,0 +1,84 @@
+# redis_utils.py
+# Helpers shared by the Redis scripts in this folder: vector encoding, tag escaping and hash fields.
+
+import re
+
+import numpy as np
+
+try:
+    from redis.commands.search.index_definition import IndexDefinition, IndexType
+except ImportError:  # redis-py < 6
+    from redis.commands.search.indexDefinition import IndexDefinition, IndexType
+
+# Characters that have a meaning inside a {tag} query
+TAG_SPECIAL = re.compile(r"([,.<>{}\[\]\"':;!@#$%^&*()\-+=~|/\\ ])")
+
+
+def to_bytes(vector):
+    """Encode a vector as little-endian float32 bytes, the format RediSearch stores."""
+    return np.asarray(vector, dtype="<f4").tobytes()
+
+
+def from_bytes(data):
+    """Decode float32 bytes back into a NumPy array (no copy)."""
+    return np.frombuffer(data, dtype="<f4")
+
+
+def escape_tag(value):
+    """Escape characters that have a meaning inside a {tag} query."""
+    return TAG_SPECIAL.sub(r"\\\1", str(value))
+
+
+def tag_clause(field, values):
+    """
+    Build a tag filter clause such as @source:{news|tweet}.
+
+    Args:
+        field (str): Tag field name.
+        values: One value or a list of values; any of them matches.
+
+    Returns:
+        str: The clause, or None when there are no values.
+    """
+    values = values if isinstance(values, (list, tuple, set)) else [values]
+    if not values:
+        return None
+    return f"@{field}:{{{'|'.join(escape_tag(v) for v in values)}}}"
+
+
+def scalar_metadata(metadata):
+    """
+    Validate metadata for storage in hash fields.
+
+    Redis hash values are flat strings or numbers, so nested metadata is rejected
+    instead of being written in a form no filter can match.
+
+    Args:
+        metadata (dict): Metadata values (str, int, float or bool).
+
+    Returns:
+        dict: The metadata, with booleans stored as 0/1.
+
+    Raises:
+        ValueError: If a value is not a scalar or a key is reserved ("text", "vector").
+    """
+    fields = {}
+    for key, value in metadata.items():
+        if key in ("text", "vector"):
+            raise ValueError(f"Metadata key {key!r} is reserved")
+        if isinstance(value, bool):
+            value = int(value)
+        if not isinstance(value, (str, int, float, bytes)):
+            raise ValueError(f"Metadata value for {key!r} must be a scalar, got {type(value).__name__}")
+        fields[key] = value
+    return fields
+
+
+def hash_fields(text, vector, metadata):
+    """
+    Build the HSET mapping of one document: text, float32 vector bytes and scalar metadata.
+
+    Raises:
+        ValueError: See scalar_metadata().
+    """
+    return {"text": text, "vector": to_bytes(vector), **scalar_metadata(metadata)}
@@ -0,0 +1,188 @@
+# Tests for the Redis vector search scripts.
+#
+# Query-building tests run without a server. The round-trip tests need a local
+# Redis Stack server and are skipped when none is reachable:
+#   docker run -d --name redis-stack -p 6379:6379 redis/redis-stack-server:latest
+#   REDIS_URL=redis://localhost:6379 python -m pytest Redis/tests
+
+import hashlib
+import importlib.util
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("numpy")
+redis = pytest.importorskip("redis")
+pytest.importorskip("langchain_core")
+
+from langchain_core.documents import Document  # noqa: E402
+
+REDIS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REDIS_DIR)
+
+import redis_utils  # noqa: E402
+
+DIM = 8
+
+
+def load_script(filename):
+    """Import a numbered script from the Redis folder as a module."""
+    spec = importlib.util.spec_from_file_location(filename[:-3], os.path.join(REDIS_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+crud = load_script("2_redis_db_crud_operations.py")
+search_types = load_script("3_redis_db_search_types.py")
+rbac = load_script("4_redis_db_role_based_access_control.py")
+
+
+class HashEmbeddings:
+    """Deterministic small vectors, so the tests do not download a model."""
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return [b / 255.0 + 0.01 for b in digest[:DIM]]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    url = os.environ.get("REDIS_URL", "redis://localhost:6379")
+    conn = redis.Redis.from_url(url, decode_responses=False)
+    try:
+        conn.ping()
+        conn.execute_command("FT._LIST")
+    except (redis.ConnectionError, redis.ResponseError):
+        pytest.skip(f"No Redis Stack server at {url}")
+    # Keep test data apart from the example indexes
+    monkeypatch.setattr(crud, "INDEX_NAME", "test_crud_docs")
+    monkeypatch.setattr(crud, "PREFIX", "test_crud:")
+    monkeypatch.setattr(search_types, "INDEX_NAME", "test_search_docs")
+    monkeypatch.setattr(search_types, "PREFIX", "test_search:")
+    yield conn
+    for module in (crud, search_types):
+        try:
+            conn.ft(module.INDEX_NAME).dropindex(delete_documents=True)
+        except redis.ResponseError:
+            pass
+    conn.close()
+
+
+# ---- Encoding and escaping ----
+
+def test_vector_bytes_round_trip():
+    vector = [0.5, -1.25, 3.0]
+    data = redis_utils.to_bytes(vector)
+    assert len(data) == 12
+    assert redis_utils.from_bytes(data).tolist() == vector
+
+
+def test_escape_tag():
+    assert redis_utils.escape_tag("tweet") == "tweet"
+    assert redis_utils.escape_tag("group:eng-1") == r"group\:eng\-1"
+    assert redis_utils.escape_tag("a b|c") == r"a\ b\|c"
+    assert redis_utils.escape_tag("x}{") == r"x\}\{"
+
+
+def test_tag_clause():
+    assert redis_utils.tag_clause("source", "news") == "@source:{news}"
+    assert redis_utils.tag_clause("source", ["news", "tweet"]) == "@source:{news|tweet}"
+    assert redis_utils.tag_clause("source", []) is None
+
+
+def test_hash_fields_rejects_nested_metadata():
+    with pytest.raises(ValueError):
+        redis_utils.hash_fields("text", [0.0], {"tags": ["a", "b"]})
+    with pytest.raises(ValueError):
+        redis_utils.hash_fields("text", [0.0], {"author": {"name": "x"}})
+    with pytest.raises(ValueError):
+        redis_utils.hash_fields("text", [0.0], {"vector": "oops"})
+    fields = redis_utils.hash_fields("text", [0.0], {"source": "news", "pinned": True, "rank": 2})
+    assert fields["pinned"] == 1 and fields["rank"] == 2
+
+
+# ---- Query strings ----
+
+def test_knn_query_string():
+    assert search_types.knn_query_string() == "*=>[KNN $k @vector $vec AS score]"
+    assert (
+        search_types.knn_query_string({"source": ["tweet", "news"]})
+        == "(@source:{tweet|news})=>[KNN $k @vector $vec AS score]"
+    )
+    assert search_types.knn_query_string({"source": "news"}, ef_runtime=50) == (
+        "(@source:{news})=>[KNN $k @vector $vec EF_RUNTIME $ef AS score]"
+    )
+    assert search_types.knn_query_string({"source": []}) is None
+
+
+def test_hybrid_query_string():
+    assert search_types.hybrid_query_string("LangChain, LLMs!") == (
+        "(@text:(LangChain | LLMs))=>[KNN $k @vector $vec AS score]"
+    )
+    assert search_types.hybrid_query_string("?!") == "*=>[KNN $k @vector $vec AS score]"
+
+
+def test_metadata_without_source():
+    class Hit:
+        pass
+
+    hit = Hit()
+    assert search_types._metadata(hit) == {}
+    hit.source = "news"
+    assert search_types._metadata(hit) == {"source": "news"}
+
+
+def test_acl_query_string():
+    assert (
+        rbac.acl_query_string(["ankush", "group:engineering"])
+        == r"(@allowed:{ankush|group\:engineering})=>[KNN $k @vector $vec AS score]"
+    )
+    assert rbac.acl_query_string([]) is None
+
+
+def test_search_as_without_principals_returns_nothing():
+    # Returns before touching the server or the model
+    assert rbac.search_as(None, None, "Where did I work?", []) == []
+
+
+# ---- Against a local server ----
+
+def test_crud_round_trip(client):
+    embeddings = HashEmbeddings()
+    crud.setup(client, dim=DIM)
+    ids = crud.add_documents(client, embeddings, [
+        Document(page_content="first", metadata={"source": "tweet"}),
+        Document(page_content="second", metadata={"source": "news"}),
+    ])
+
+    docs = crud.get_documents(client, ids)
+    assert [d.page_content for d in docs] == ["first", "second"]
+    assert docs[1].metadata == {"source": "news"}
+
+    crud.add_documents(client, embeddings, [Document(page_content="first, edited", metadata={"source": "tweet"})], ids=[ids[0]])
+    crud.update_metadata(client, ids[1], source="website")
+    docs = crud.get_documents(client, ids)
+    assert docs[0].page_content == "first, edited"
+    assert docs[1].metadata == {"source": "website"}
+
+    assert crud.delete_documents(client, [ids[0]]) == 1
+    assert crud.get_documents(client, ids)[0] is None
+
+
+def test_knn_search_applies_tag_filter(client):
+    embeddings = HashEmbeddings()
+    search_types.setup(client, embeddings, [
+        Document(page_content="a tweet", metadata={"source": "tweet"}),
+        Document(page_content="a news story", metadata={"source": "news"}),
+        Document(page_content="another tweet", metadata={"source": "tweet"}),
+    ], algorithm="FLAT", dim=DIM)
+
+    results = search_types.knn_search(client, embeddings.embed_query("a tweet"), k=3, filter={"source": "tweet"})
+    assert {doc.metadata["source"] for doc, _ in results} == {"tweet"}
+    assert results[0][0].page_content == "a tweet"
+    assert search_types.knn_search(client, embeddings.embed_query("a tweet"), k=3, filter={"source": []}) == []
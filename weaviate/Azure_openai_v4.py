@@ -1,10 +1,102 @@
+import asyncio
+import atexit
+import threading
+import time
+from functools import lru_cache
+
 import weaviate
 from weaviate.classes.config import Configure
+from weaviate.util import generate_uuid5
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
 from langchain_community.document_loaders import TextLoader, DirectoryLoader
+from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
-# Initialize Weaviate client
-client = weaviate.connect_to_local()
+class WeaviateClientManager:
+    """
+    Owns the Weaviate connections for this module.
+
+    The sync client connects lazily on first use, so importing the module does not
+    need a running server. Collection handles are cached per class name, and both
+    the sync and async clients are closed at interpreter exit.
+    """
+
+    def __init__(self, connect=weaviate.connect_to_local, connect_async=weaviate.use_async_with_local, **connect_kwargs):
+        """
+        Args:
+            connect: Factory for the sync client (e.g. weaviate.connect_to_custom).
+            connect_async: Factory for the async client (e.g. weaviate.use_async_with_custom).
+            **connect_kwargs: Arguments passed to both factories (host, port, grpc_port, ...).
+        """
+        self._connect = connect
+        self._connect_async = connect_async
+        self._connect_kwargs = connect_kwargs
+        self._client = None
+        self._async_client = None
+        self._collections = {}
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    @property
+    def client(self):
+        """The sync client, connected on first access."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._connect(**self._connect_kwargs)
+        return self._client
+
+    def collection(self, class_name):
+        """
+        Returns a cached handle for a collection.
+
+        Args:
+            class_name (str): The name of the class.
+        """
+        handle = self._collections.get(class_name)
+        if handle is None:
+            handle = self._collections[class_name] = self.client.collections.get(class_name)
+        return handle
+
+    def forget(self, class_name):
+        """
+        Drops the cached handle of a collection (call after deleting it).
+
+        Args:
+            class_name (str): The name of the class.
+        """
+        self._collections.pop(class_name, None)
+
+    async def async_client(self):
+        """Returns the async client, connecting it on first use."""
+        if self._async_client is None:
+            self._async_client = self._connect_async(**self._connect_kwargs)
+        if not self._async_client.is_connected():
+            await self._async_client.connect()
+        return self._async_client
+
+    async def aclose(self):
+        """Closes the async client."""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+
+    def close(self):
+        """Closes the sync client and clears cached collection handles."""
+        self._collections.clear()
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+        if self._async_client is not None:
+            try:
+                asyncio.run(self.aclose())
+            except RuntimeError:
+                # Already inside a running event loop; the caller should await aclose().
+                pass
+
+# Weaviate connections shared by the functions below
+client_manager = WeaviateClientManager()
 
 def create_schema(class_name, vectorizer_name, resource_name, deployment_id):
     """
@@ -26,7 +118,7 @@ def create_schema(class_name, vectorizer_name, resource_name, deployment_id):
             )
         ]
 
-        client.collections.create(
+        client_manager.client.collections.create(
             class_name,
             vectorizer_config=vectorizer_config
         )
@@ -34,23 +126,130 @@ def create_schema(class_name, vectorizer_name, resource_name, deployment_id):
     except Exception as e:
         print(f"Error creating schema '{class_name}': {e}")
 
-def save_to_db(data, class_name):
+@lru_cache(maxsize=None)
+def get_local_embeddings(model_name="sentence-transformers/all-mpnet-base-v2", cache_dir="./embedding_cache"):
+    """
+    Returns the local embedding model used by the other backends, wrapped in an on-disk cache.
+
+    The model is loaded once per process. Document and query embeddings are cached
+    on disk, so re-ingesting the same chunks or repeating a query skips the model.
+
+    Args:
+        model_name (str): The Hugging Face sentence-transformers model.
+        cache_dir (str): Directory for cached embeddings.
+
+    Returns:
+        CacheBackedEmbeddings: The cached embedding model.
+    """
+    return CacheBackedEmbeddings.from_bytes_store(
+        HuggingFaceEmbeddings(model_name=model_name),
+        LocalFileStore(cache_dir),
+        namespace=model_name,
+        query_embedding_cache=True,
+    )
+
+def create_self_provided_schema(class_name, vector_name="default"):
+    """
+    Creates a schema whose vectors are supplied by the client instead of a Weaviate vectorizer.
+
+    Inserts and queries then never call an external vectorizer, so the collection
+    works offline against a local Weaviate.
+
+    Args:
+        class_name (str): The name of the class to be created in Weaviate.
+        vector_name (str): The name of the self-provided named vector.
     """
-    Saves data to a Weaviate class.
+    try:
+        client_manager.client.collections.create(
+            class_name,
+            vectorizer_config=[Configure.NamedVectors.none(name=vector_name)]
+        )
+        print(f"Schema '{class_name}' created successfully.")
+    except Exception as e:
+        print(f"Error creating schema '{class_name}': {e}")
+
+def _open_batch(collection, batch_mode, batch_size, concurrent_requests, requests_per_minute):
+    """
+    Opens a batch context on a collection using the requested batching strategy.
+
+    Args:
+        collection: The Weaviate collection handle.
+        batch_mode (str): "dynamic", "fixed_size" or "rate_limit".
+        batch_size (int): Objects per request for "fixed_size".
+        concurrent_requests (int): Parallel requests for "fixed_size".
+        requests_per_minute (int): Request cap for "rate_limit".
+    """
+    if batch_mode == "fixed_size":
+        return collection.batch.fixed_size(batch_size=batch_size, concurrent_requests=concurrent_requests)
+    if batch_mode == "rate_limit":
+        return collection.batch.rate_limit(requests_per_minute=requests_per_minute)
+    if batch_mode == "dynamic":
+        return collection.batch.dynamic()
+    raise ValueError(f"Unknown batch mode: {batch_mode}")
+
+def save_to_db(data, class_name, batch_mode="fixed_size", batch_size=200, concurrent_requests=4,
+               requests_per_minute=600, max_retries=3, embeddings=None, vector_name="default"):
+    """
+    Saves data to a Weaviate class in bulk.
+
+    Objects get deterministic UUIDs derived from their properties, so objects
+    that fail can be re-sent without creating duplicates. Only the failed
+    objects are retried, up to `max_retries` times.
     
     Args:
         data (list): List of dictionaries containing data to be stored.
         class_name (str): The name of the class to which data will be saved.
+        batch_mode (str): "fixed_size", "rate_limit" or "dynamic".
+        batch_size (int): Objects per request for "fixed_size".
+        concurrent_requests (int): Parallel requests for "fixed_size".
+        requests_per_minute (int): Request cap for "rate_limit" (e.g. to respect vectorizer quotas).
+        max_retries (int): Number of extra attempts for objects that failed.
+        embeddings: Optional local embedding model (see `get_local_embeddings`). When given,
+            vectors are computed client-side for collections created with `create_self_provided_schema`.
+        vector_name (str): The named vector the client-side embeddings are stored under.
+
+    Returns:
+        dict: Ingestion stats, including the objects that still failed after all retries.
     """
-    try:
-        collection = client.collections.get(class_name)
-        with collection.batch.dynamic() as batch:
-            for i, d in enumerate(data):
-                batch.add_object(properties=d)
-                print(f"Added object {i}")
-        print("Data has been stored successfully.")
-    except Exception as e:
-        print(f"Error saving data to class '{class_name}': {e}")
+    collection = client_manager.collection(class_name)
+    pending = [(generate_uuid5(d), d) for d in data]
+    vectors = {}
+    if embeddings is not None:
+        texts = [d["text"] for d in data]
+        for offset in range(0, len(texts), batch_size):
+            batch_vectors = embeddings.embed_documents(texts[offset:offset + batch_size])
+            for (uuid, _), vector in zip(pending[offset:offset + batch_size], batch_vectors):
+                vectors[uuid] = {vector_name: vector}
+    stats = {"objects": len(data), "inserted": 0, "retried": 0, "attempts": 0, "failed_objects": []}
+    start = time.perf_counter()
+
+    for attempt in range(max_retries + 1):
+        stats["attempts"] = attempt + 1
+        with _open_batch(collection, batch_mode, batch_size, concurrent_requests, requests_per_minute) as batch:
+            for uuid, properties in pending:
+                batch.add_object(properties=properties, uuid=uuid, vector=vectors.get(uuid))
+        failed = collection.batch.failed_objects
+        stats["inserted"] += len(pending) - len(failed)
+        if not failed:
+            pending = []
+            break
+        pending = [(str(f.object_.uuid), f.object_.properties) for f in failed]
+        stats["failed_objects"] = failed
+        if attempt < max_retries:
+            stats["retried"] += len(pending)
+            print(f"{len(pending)} objects failed (first error: {failed[0].message}); retrying them.")
+
+    if not pending:
+        stats["failed_objects"] = []
+    elapsed = time.perf_counter() - start
+    stats["seconds"] = elapsed
+    stats["objects_per_second"] = stats["inserted"] / elapsed if elapsed else 0.0
+    print(
+        f"Stored {stats['inserted']}/{stats['objects']} objects in {elapsed:.2f}s "
+        f"({stats['objects_per_second']:.0f} obj/s, {stats['attempts']} attempt(s), "
+        f"{len(stats['failed_objects'])} failed)."
+    )
+    return stats
 
 def delete_weaviate_class(class_name):
     """
@@ -60,7 +259,8 @@ def delete_weaviate_class(class_name):
         class_name (str): The name of the class to be deleted.
     """
     try:
-        client.collections.delete(class_name)
+        client_manager.client.collections.delete(class_name)
+        client_manager.forget(class_name)
         print(f"Class '{class_name}' deleted successfully.")
     except Exception as e:
         print(f"Error deleting class '{class_name}': {e}")
@@ -83,7 +283,7 @@ def load_and_process_documents(directory_path, chunk_size=1000, chunk_overlap=20
     split_documents = text_splitter.split_documents(documents)
     return [{"source": doc.metadata["source"], "text": doc.page_content} for doc in split_documents]
 
-def query_collection(class_name, query, limit=7):
+def query_collection(class_name, query, limit=7, embeddings=None, vector_name="default"):
     """
     Queries a Weaviate collection.
     
@@ -91,26 +291,66 @@ def query_collection(class_name, query, limit=7):
         class_name (str): The name of the class to query.
         query (str): The query string to search for.
         limit (int): The maximum number of results to return.
+        embeddings: Optional local embedding model. When given, the query vector is computed
+            client-side and the vector half of the hybrid search uses it.
+        vector_name (str): The named vector to search against.
     
     Returns:
         dict: The query results.
     """
     try:
-        collection = client.collections.get(class_name)
-        result = collection.query.hybrid(
-            query=query,
-            limit=limit
-        )
+        collection = client_manager.collection(class_name)
+        if embeddings is None:
+            result = collection.query.hybrid(
+                query=query,
+                limit=limit
+            )
+        else:
+            result = collection.query.hybrid(
+                query=query,
+                vector=embeddings.embed_query(query),
+                target_vector=vector_name,
+                limit=limit
+            )
         return result
     except Exception as e:
         print(f"Error querying class '{class_name}': {e}")
         return {}
 
+async def query_collection_concurrently(class_name, queries, limit=7, embeddings=None, vector_name="default"):
+    """
+    Runs several hybrid queries concurrently over the async client.
+
+    Args:
+        class_name (str): The name of the class to query.
+        queries (list): The query strings to search for.
+        limit (int): The maximum number of results per query.
+        embeddings: Optional local embedding model for self-provided vectors.
+        vector_name (str): The named vector to search against.
+
+    Returns:
+        list: One query result per query string, in input order.
+    """
+    async_client = await client_manager.async_client()
+    collection = async_client.collections.get(class_name)
+
+    async def run(query):
+        if embeddings is None:
+            return await collection.query.hybrid(query=query, limit=limit)
+        # Queries use the query-side embedding; embed off the event loop so the other queries keep running
+        if hasattr(embeddings, "aembed_query"):
+            vector = await embeddings.aembed_query(query)
+        else:
+            vector = await asyncio.to_thread(embeddings.embed_query, query)
+        return await collection.query.hybrid(query=query, vector=vector, target_vector=vector_name, limit=limit)
+
+    return await asyncio.gather(*(run(q) for q in queries))
+
 def close_client():
     """
     Closes the Weaviate client connection.
     """
-    client.close()
+    client_manager.close()
     print("Client connection closed.")
 
 # Example Usage (not included in the function definitions)
@@ -139,5 +379,21 @@ if __name__ == "__main__":
     query_result = query_collection(class_name, query="Sample query")
     print(query_result)
 
+    # Bring-your-own-vectors: embed locally and skip the Azure OpenAI vectorizer
+    embeddings = get_local_embeddings()
+    create_self_provided_schema("LocalDemoClass")
+    save_to_db(data, "LocalDemoClass", embeddings=embeddings)
+    print(query_collection("LocalDemoClass", query="Sample query", embeddings=embeddings))
+
+    # Run several queries concurrently with the async client
+    async def run_concurrent_queries():
+        try:
+            return await query_collection_concurrently("LocalDemoClass", ["Sample query", "Another query"], embeddings=embeddings)
+        finally:
+            # The async client is bound to this event loop, so close it before the loop ends
+            await client_manager.aclose()
+
+    print(asyncio.run(run_concurrent_queries()))
+
     # Close the client connection
     close_client()